@@ -0,0 +1,69 @@
+"""
+Benchmark comparison, reports the change in wall time per stage between a
+baseline and a current results JSON, flagging regressions. Exits non-zero
+if any stage regressed, so it can gate upgrades in CI.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json --threshold 0.2
+"""
+# == Standard Library imports ==
+import argparse
+import json
+import sys
+from pathlib import Path
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2,
+            min_seconds: float = 0.05) -> list[dict]:
+    """
+    Method compares per-stage wall times for every size present in both
+    result sets.
+    :param baseline: Baseline results, as written by benchmarks.run.
+    :param current: Current results, as written by benchmarks.run.
+    :param threshold: Relative slowdown above which a stage regressed.
+    :param min_seconds: Stages faster than this in both runs are never
+    flagged, as their timings are dominated by noise.
+    :return: List of row dicts (size, stage, base_s, cur_s, ratio,
+    regressed).
+    """
+    rows = []
+    for size, base_stages in baseline["results"].items():
+        cur_stages = current["results"].get(size, {})
+        for stage, base in base_stages.items():
+            if stage not in cur_stages:
+                continue
+            base_s, cur_s = base["wall_s"], cur_stages[stage]["wall_s"]
+            ratio = cur_s / base_s if base_s else float("inf")
+            rows.append({
+                "size": size,
+                "stage": stage,
+                "base_s": base_s,
+                "cur_s": cur_s,
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold and
+                max(base_s, cur_s) >= min_seconds,
+            })
+    return rows
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    arg_parser.add_argument("baseline")
+    arg_parser.add_argument("current")
+    arg_parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Allowed relative slowdown (0.2 = 20%%).")
+    arg_parser.add_argument("--min-seconds", type=float, default=0.05)
+    args = arg_parser.parse_args(argv)
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows = compare(baseline, current, args.threshold, args.min_seconds)
+    print(f"{'size':>9}  {'stage':<30}{'base s':>10}{'cur s':>10}"
+          f"{'ratio':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['size']:>9}  {row['stage']:<30}{row['base_s']:>10.3f}"
+              f"{row['cur_s']:>10.3f}{row['ratio']:>8.2f}{flag}")
+    regressions = sum(row["regressed"] for row in rows)
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Encoding benchmark, measures sentence encoding throughput in-process and
+on worker pools of increasing size, and how close the speedup comes to
+linear in the number of workers. Model load time per pool is reported
+separately from encoding time. Offline torch stub models are used unless
+--real is given.
+
+Usage:
+    python -m benchmarks.encoding --size 20000 --workers 1 2 4 --out enc.json
+"""
+# == Standard Library imports ==
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+# == Local imports ==
+from benchmarks.stubs import TorchStubEncoder
+from benchmarks.synthetic import generate_feedback
+from utils.cluster import get_sentence_transformer
+from utils.encode_pool import ENCODE_CHUNK_SIZE, EncodePool
+
+# constant for default corpus size
+DEFAULT_SIZE = 20_000
+# constant for default worker counts compared
+DEFAULT_WORKERS = [1, 2, 4]
+
+def scaling(runs: dict[int, dict]) -> dict[int, dict]:
+    """
+    Helper method adds speedup and parallel efficiency to each run,
+    relative to the single-worker run.
+    :param runs: Dict of worker count to dict with encode_s and rows.
+    :return: Dict of worker count to metrics.
+    """
+    base = runs.get(1, {}).get("encode_s")
+    results = {}
+    for workers, run in runs.items():
+        metrics = dict(run)
+        metrics["rows_per_s"] = run["rows"] / run["encode_s"]
+        if base:
+            metrics["speedup"] = base / run["encode_s"]
+            metrics["efficiency"] = metrics["speedup"] / workers
+        results[workers] = metrics
+    return results
+
+def run(size: int, workers: list[int], seed: int = 0,
+        real: bool = False) -> dict:
+    """
+    Method encodes a synthetic corpus on pools of each size.
+    :param size: Corpus size (rows).
+    :param workers: Worker counts to compare.
+    :param seed: Random seed for the synthetic corpus.
+    :param real: If set, use the real (locally cached) model.
+    :return: Dict of run metadata and per-worker-count results.
+    """
+    sentences = generate_feedback(size, seed)
+    loader = get_sentence_transformer if real else TorchStubEncoder
+    cpus = os.cpu_count() or 1
+    runs = {}
+    for n_workers in workers:
+        print(f"Benchmarking {n_workers} workers...")
+        threads = max(1, cpus // n_workers)
+        start = time.perf_counter()
+        with EncodePool(loader, n_workers=n_workers, threads=threads) as pool:
+            # one single-sentence chunk per worker starts every worker and
+            # loads its model before timing
+            pool.chunk_size = 1
+            pool.encode(sentences[:n_workers])
+            pool.chunk_size = ENCODE_CHUNK_SIZE
+            load_s = time.perf_counter() - start
+            start = time.perf_counter()
+            pool.encode(sentences)
+            encode_s = time.perf_counter() - start
+        runs[n_workers] = {"rows": size, "threads": threads,
+                           "load_s": load_s, "encode_s": encode_s}
+        print(f"  {size / encode_s:.0f} rows/s")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": cpus,
+            "models": "real" if real else "stub",
+            "size": size,
+            "seed": seed,
+        },
+        "results": {str(k): v for k, v in scaling(runs).items()},
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    arg_parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                            help="Corpus size (rows).")
+    arg_parser.add_argument("--workers", type=int, nargs="+",
+                            default=DEFAULT_WORKERS,
+                            help="Worker counts to compare.")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--real", action="store_true",
+                            help="Use the real model (must be cached).")
+    arg_parser.add_argument("--out", default="encoding.json",
+                            help="Output JSON path.")
+    args = arg_parser.parse_args(argv)
+    report = run(args.size, args.workers, args.seed, args.real)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
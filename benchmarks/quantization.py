@@ -0,0 +1,74 @@
+"""
+Quantization benchmark, compares the dynamically quantized (int8) embedding
+and sentiment models with fp32 on one synthetic corpus: encode and
+classification time, model memory, embedding cosine drift and sentiment
+label agreement. Offline torch stub models are used unless --real is given.
+
+Usage:
+    python -m benchmarks.quantization --size 2000 --out quantization.json
+"""
+# == Standard Library imports ==
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+# == Local imports ==
+from benchmarks.stubs import TorchStubClassifier, TorchStubEncoder
+from benchmarks.synthetic import generate_feedback
+from utils.quantization import check_quantization
+
+# constant for default corpus size
+DEFAULT_SIZE = 2_000
+
+def run(size: int, seed: int = 0, real: bool = False) -> dict:
+    """
+    Method checks the quantized models against fp32 on a synthetic corpus.
+    :param size: Corpus size (rows).
+    :param seed: Random seed for the synthetic corpus.
+    :param real: If set, use the real (locally cached) models.
+    :return: Dict of run metadata and per-model results.
+    """
+    import torch
+    sentences = generate_feedback(size, seed)
+    loaders = {} if real else {"load_encoder": TorchStubEncoder,
+                               "load_classifier": TorchStubClassifier}
+    print(f"Benchmarking int8 vs fp32 on {size} rows...")
+    results = check_quantization(sentences, **loaders)
+    for name, metrics in results.items():
+        print(f"  {name}: {metrics['speedup']:.2f}x faster, "
+              f"{metrics['memory_saving']:.0%} smaller")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "models": "real" if real else "stub",
+            "size": size,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    arg_parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                            help="Corpus size (rows).")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--real", action="store_true",
+                            help="Use the real models (must be cached).")
+    arg_parser.add_argument("--out", default="quantization.json",
+                            help="Output JSON path.")
+    args = arg_parser.parse_args(argv)
+    report = run(args.size, args.seed, args.real)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
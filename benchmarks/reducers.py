@@ -0,0 +1,143 @@
+"""
+Reducer benchmark, compares the dimensionality reducers of utils.reducers
+on one synthetic corpus: wall time and peak memory of the reduction, time
+of the HDBSCAN step on its output, and agreement of the resulting clusters
+with those of seeded UMAP (adjusted Rand index). Each reducer runs in a
+fresh process so peak memory is measured per reducer. Offline stub
+embeddings are used unless --real is given.
+
+Usage:
+    python -m benchmarks.reducers --size 20000 --out reducers.json
+"""
+# == Standard Library imports ==
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# == Third party imports ==
+import numpy as np
+
+# == Local imports ==
+from benchmarks.stubs import StubEncoder
+from benchmarks.synthetic import generate_feedback
+from utils.cluster import MIN_CLUSTER_SIZE, get_sentence_transformer
+from utils.profiler import _peak_rss_mb
+from utils.reducers import REDUCERS, get_reducer
+
+# constant for default corpus size
+DEFAULT_SIZE = 20_000
+# constant for rows of the untimed warm-up fit, which compiles the numba
+# code; UMAP switches to approximate neighbours from 4096 rows
+WARMUP_ROWS = 4_200
+
+def _reduce_and_cluster(name: str, embeddings: np.ndarray) -> dict:
+    """
+    Helper method fits one reducer and clusters its output; run in a
+    fresh process.
+    :param name: Reducer name.
+    :param embeddings: 2D array of embeddings.
+    :return: Dict of timings, memory and cluster labels.
+    """
+    import hdbscan
+    get_reducer(name).fit_transform(embeddings[:WARMUP_ROWS])
+    reducer = get_reducer(name)
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    reduced = reducer.fit_transform(embeddings)
+    reduce_s = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    labels = hdbscan.HDBSCAN(min_cluster_size=MIN_CLUSTER_SIZE,
+                             metric="euclidean").fit_predict(reduced)
+    return {
+        "reduce_s": reduce_s,
+        "hdbscan_s": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss,
+        "reduce_rss_mb": peak_rss - rss_before,
+        "labels": labels.tolist(),
+    }
+
+def summarize(runs: dict[str, dict], reference: str = REDUCERS[0]
+              ) -> dict[str, dict]:
+    """
+    Helper method summarizes reducer runs, scoring each run's clusters
+    against the reference reducer's.
+    :param runs: Dict of reducer name to _reduce_and_cluster output.
+    :param reference: Reducer whose clusters count as ground truth.
+    :return: Dict of reducer name to metrics (labels dropped).
+    """
+    from sklearn.metrics import adjusted_rand_score
+    summary = {}
+    for name, run in runs.items():
+        labels = np.asarray(run["labels"])
+        metrics = {k: v for k, v in run.items() if k != "labels"}
+        metrics["n_clusters"] = int(len(set(labels.tolist()) - {-1}))
+        metrics["outlier_share"] = float((labels == -1).mean())
+        if reference in runs:
+            metrics["ari_vs_" + reference] = float(adjusted_rand_score(
+                runs[reference]["labels"], labels))
+        summary[name] = metrics
+    return summary
+
+def run(size: int, reducers: list[str], seed: int = 0,
+        real: bool = False) -> dict:
+    """
+    Method embeds a synthetic corpus and benchmarks each reducer on it.
+    :param size: Corpus size (rows).
+    :param reducers: Reducer names to compare.
+    :param seed: Random seed for the synthetic corpus.
+    :param real: If set, embed with the real (locally cached) model.
+    :return: Dict of run metadata and per-reducer results.
+    """
+    sentences = generate_feedback(size, seed)
+    encoder = get_sentence_transformer() if real else StubEncoder()
+    embeddings = np.asarray(encoder.encode(sentences), dtype=np.float32)
+    runs = {}
+    for name in reducers:
+        print(f"Benchmarking {name}...")
+        # spawn, so each reducer starts from a clean memory high-water mark
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=context) as pool:
+            runs[name] = pool.submit(_reduce_and_cluster, name,
+                                     embeddings).result()
+        print(f"  reduced in {runs[name]['reduce_s']:.1f}s")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "models": "real" if real else "stub",
+            "size": size,
+            "seed": seed,
+        },
+        "results": summarize(runs),
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    arg_parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                            help="Corpus size (rows).")
+    arg_parser.add_argument("--reducers", nargs="+", choices=REDUCERS,
+                            default=list(REDUCERS))
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--real", action="store_true",
+                            help="Use the real embedding model (must be "
+                                 "cached).")
+    arg_parser.add_argument("--out", default="reducers.json",
+                            help="Output JSON path.")
+    args = arg_parser.parse_args(argv)
+    report = run(args.size, args.reducers, args.seed, args.real)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
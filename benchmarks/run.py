@@ -0,0 +1,169 @@
+"""
+Benchmark runner, times every pipeline stage (load, encode, UMAP, HDBSCAN,
+BERTopic fit incl. c-TF-IDF, hierarchy, sentiment, prompt building, LLM
+summary, save) on synthetic corpora of increasing size and writes the
+results to JSON. Offline stub models are used unless --real is given.
+
+Usage:
+    python -m benchmarks.run --sizes 1000 10000 --out bench.json
+"""
+# == Standard Library imports ==
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+# == Local imports ==
+from benchmarks.stubs import stub_models
+from benchmarks.synthetic import generate_frame
+from processor import Parser
+from utils import CSVLoader
+from utils.cache_utils import CACHE_ENV
+from utils.cluster import ST_MODEL
+from utils.profiler import Profiler
+from utils.sentiment import SMT_MODEL
+from utils.summary import THEME_MODEL
+
+# constant for the feedback column of synthetic corpora
+COL = "feedback"
+# constant for default corpus sizes
+DEFAULT_SIZES = [1_000, 10_000]
+# constant for Hub repos of the real models, which must be cached locally
+REAL_MODELS = (f"sentence-transformers/{ST_MODEL}", SMT_MODEL, THEME_MODEL)
+# environment variables putting the Hugging Face libraries in offline mode
+OFFLINE_ENV = {"HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
+
+def missing_models() -> list[str]:
+    """
+    Helper method lists the real models not in the local Hub cache.
+    :return: List of Hub repo ids.
+    """
+    from huggingface_hub import snapshot_download
+    from huggingface_hub.errors import LocalEntryNotFoundError
+    missing = []
+    for repo_id in REAL_MODELS:
+        try:
+            snapshot_download(repo_id, local_files_only=True)
+        except LocalEntryNotFoundError:
+            missing.append(repo_id)
+    return missing
+
+@contextmanager
+def offline_models() -> Iterator[None]:
+    """
+    Helper method runs the real models offline for the duration of the
+    context, failing fast unless every one is in the local Hub cache, so a
+    missing model is never downloaded inside a timed stage.
+    :raises RuntimeError: If a model is not cached locally.
+    """
+    from huggingface_hub import constants
+    missing = missing_models()
+    if missing:
+        raise RuntimeError(f"Real models missing from the local Hub "
+                           f"cache: {', '.join(missing)}")
+    # the hub reads its offline flag once, at import, so set it directly
+    with patch.dict(os.environ, OFFLINE_ENV), \
+            patch.object(constants, "HF_HUB_OFFLINE", True):
+        yield
+
+def run_size(n_rows: int, workdir: Path, seed: int = 0,
+             real: bool = False) -> dict[str, dict]:
+    """
+    Method runs the full pipeline once on a synthetic corpus.
+    :param n_rows: Number of synthetic feedback rows.
+    :param workdir: Directory for the input and output files.
+    :param seed: Random seed for the synthetic corpus.
+    :param real: If set, use the real models rather than the stubs.
+    :return: Dict of str (k = stage name), dict (v = stage metrics).
+    """
+    csv_path = workdir / f"feedback_{n_rows}.csv"
+    generate_frame(n_rows, seed, col=COL).to_csv(csv_path, index=False)
+    profiler = Profiler(enabled=True)
+    with nullcontext() if real else stub_models():
+        with profiler.stage("csv_load", items=n_rows):
+            df = CSVLoader(str(csv_path)).load(columns=[COL])
+        parser = Parser(df, COL, profiler=profiler)
+        parser.pre_process_ml()
+        parser.build_data_structures()
+        with profiler.stage("prompt_build", items=len(parser.subtopics)):
+            for st in parser.subtopics.values():
+                st.name_prompt()
+                st.summary_prompt()
+            for t in parser.topics:
+                t.lookup_sub_topic(parser.subtopics)
+                t.name_prompt()
+        parser.process_llm()
+        parser.save(str(workdir / f"output_{n_rows}.csv"))
+    return profiler.report()
+
+def run(sizes: list[int], seed: int = 0, real: bool = False,
+        warm_cache: bool = False) -> dict:
+    """
+    Method benchmarks each corpus size in turn.
+    :param sizes: List of corpus sizes (rows).
+    :param seed: Random seed for the synthetic corpora.
+    :param real: If set, use the real models, which must be cached
+    locally; they run offline.
+    :param warm_cache: If set, keep the user's persistent caches; by
+    default every size runs against an empty cache directory.
+    :return: Dict of run metadata and per-size stage results.
+    """
+    results = {}
+    with offline_models() if real else nullcontext():
+        for n_rows in sizes:
+            print(f"Benchmarking {n_rows} rows...")
+            with tempfile.TemporaryDirectory() as tmp:
+                workdir = Path(tmp)
+                # restored afterwards, so callers keep their cache directory
+                env = {} if warm_cache else \
+                    {CACHE_ENV: str(workdir / "cache")}
+                with patch.dict(os.environ, env):
+                    start = time.perf_counter()
+                    results[str(n_rows)] = run_size(n_rows, workdir, seed,
+                                                    real)
+                print(f"  done in {time.perf_counter() - start:.1f}s")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "models": "real" if real else "stub",
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    arg_parser.add_argument("--sizes", type=int, nargs="+",
+                            default=DEFAULT_SIZES,
+                            help="Corpus sizes (rows), e.g. 1000 100000.")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--real", action="store_true",
+                            help="Use the real models, offline; fails "
+                                 "unless all are cached locally.")
+    arg_parser.add_argument("--warm-cache", action="store_true",
+                            help="Reuse persistent embedding, sentiment "
+                                 "and LLM caches.")
+    arg_parser.add_argument("--out", default="bench.json",
+                            help="Output JSON path.")
+    args = arg_parser.parse_args(argv)
+    missing = missing_models() if args.real else []
+    if missing:
+        arg_parser.error(f"--real needs these models in the local Hub "
+                         f"cache: {', '.join(missing)}")
+    report = run(args.sizes, args.seed, args.real, args.warm_cache)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
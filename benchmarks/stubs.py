@@ -0,0 +1,199 @@
+"""
+Module defines deterministic offline stand-ins for the sentence
+transformer, sentiment classifier and LLM text generator, so benchmarks
+(and pipeline runs) need no model downloads. Stubs are cheap but keep the
+input and output formats of the real models.
+"""
+# == Standard Library imports ==
+import hashlib
+from contextlib import contextmanager, ExitStack
+from unittest.mock import patch
+
+# == Third party imports ==
+import numpy as np
+import torch
+from bertopic.backend import BaseEmbedder
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# == Local imports ==
+from utils.model_registry import ModelRegistry, get_registry, set_registry
+
+# constant for stub embedding dimension (all-roberta-large-v1 uses 1024)
+STUB_DIM = 256
+# constant for hidden width of the torch stubs, which only exist to carry
+# linear layers for quantization benchmarks
+TORCH_STUB_HIDDEN = 1024
+POSITIVE = {"love", "great", "excellent", "good", "comfortable", "smooth",
+            "sleek", "beautiful", "worth", "recommend"}
+NEGATIVE = {"hate", "terrible", "awful", "expensive", "lag", "drains",
+            "disconnects", "cramp", "overpriced", "drops"}
+
+class StubEncoder(BaseEmbedder):
+    """
+    Class for StubEncoder object, embeds text as a fixed random projection
+    of hashed word counts, so texts sharing words embed close together.
+    Usable as a SentenceTransformer and as a BERTopic embedding backend.
+    """
+    def __init__(self, dim: int = STUB_DIM, seed: int = 0):
+        super().__init__()
+        self.vectorizer = HashingVectorizer(n_features=2 ** 12,
+                                            alternate_sign=False)
+        rng = np.random.default_rng(seed)
+        self.projection = rng.standard_normal(
+            (2 ** 12, dim)).astype(np.float32)
+
+    def encode(self, sentences: list[str], **kwargs) -> np.ndarray:
+        """
+        Method embeds sentences, mirroring SentenceTransformer.encode.
+        :param sentences: List of text strings.
+        :return: L2-normalized float32 array of shape (n, dim).
+        """
+        counts = self.vectorizer.transform(sentences)
+        vectors = np.asarray(counts @ self.projection, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def embed(self, documents: list[str], verbose: bool = False
+              ) -> np.ndarray:
+        """
+        Method embeds documents, mirroring BERTopic's BaseEmbedder.embed.
+        :param documents: List of text strings.
+        :param verbose: Unused; kept for interface compatibility.
+        :return: L2-normalized float32 array of shape (n, dim).
+        """
+        return self.encode(documents)
+
+class StubClassifier:
+    """
+    Class for StubClassifier object, labels text by counting lexicon words;
+    called like a transformers text-classification pipeline.
+    """
+    tokenizer = None
+
+    def _classify(self, text: str) -> dict:
+        words = text.lower().split()
+        score = sum(w in POSITIVE for w in words) - \
+            sum(w in NEGATIVE for w in words)
+        label = "POSITIVE" if score > 0 else \
+            "NEGATIVE" if score < 0 else "NEUTRAL"
+        return {"label": label, "score": min(1.0, 0.5 + abs(score) / 10)}
+
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return [self._classify(texts)]
+        return [self._classify(t) for t in texts]
+
+class TorchStubEncoder(torch.nn.Module):
+    """
+    Class for TorchStubEncoder object, embeds hashed word counts through a
+    small random MLP; a SentenceTransformer stand-in whose linear layers can
+    be quantized, for offline quantization benchmarks.
+    """
+    def __init__(self, dim: int = STUB_DIM, seed: int = 0):
+        super().__init__()
+        self.vectorizer = HashingVectorizer(n_features=2 ** 12,
+                                            alternate_sign=False)
+        torch.manual_seed(seed)
+        self.mlp = torch.nn.Sequential(
+            torch.nn.Linear(2 ** 12, TORCH_STUB_HIDDEN), torch.nn.GELU(),
+            torch.nn.Linear(TORCH_STUB_HIDDEN, TORCH_STUB_HIDDEN),
+            torch.nn.GELU(), torch.nn.Linear(TORCH_STUB_HIDDEN, dim))
+
+    def encode(self, sentences: list[str], **kwargs) -> np.ndarray:
+        """
+        Method embeds sentences, mirroring SentenceTransformer.encode.
+        :param sentences: List of text strings.
+        :return: L2-normalized float32 array of shape (n, dim).
+        """
+        counts = self.vectorizer.transform(sentences).toarray()
+        with torch.inference_mode():
+            vectors = self.mlp(torch.from_numpy(
+                counts.astype(np.float32))).numpy()
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+class TorchStubClassifier:
+    """
+    Class for TorchStubClassifier object, labels hashed word counts with a
+    small random MLP held as .model; a text-classification pipeline
+    stand-in whose linear layers can be quantized.
+    """
+    tokenizer = None
+    labels = ("NEGATIVE", "NEUTRAL", "POSITIVE")
+
+    def __init__(self, seed: int = 0):
+        self.vectorizer = HashingVectorizer(n_features=2 ** 12,
+                                            alternate_sign=False)
+        torch.manual_seed(seed)
+        self.model = torch.nn.Sequential(
+            torch.nn.Linear(2 ** 12, TORCH_STUB_HIDDEN), torch.nn.GELU(),
+            torch.nn.Linear(TORCH_STUB_HIDDEN, TORCH_STUB_HIDDEN),
+            torch.nn.GELU(), torch.nn.Linear(TORCH_STUB_HIDDEN,
+                                             len(self.labels)))
+
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        counts = self.vectorizer.transform(texts).toarray()
+        with torch.inference_mode():
+            probs = torch.softmax(self.model(torch.from_numpy(
+                counts.astype(np.float32))), dim=1)
+        scores, idx = probs.max(dim=1)
+        return [{"label": self.labels[i], "score": float(score)}
+                for i, score in zip(idx.tolist(), scores)]
+
+class StubTokenizer:
+    """
+    Class for StubTokenizer object, splits on whitespace; enough for token
+    counting in profiler reports.
+    """
+    def apply_chat_template(self, messages: list[dict], **kwargs
+                            ) -> list[int]:
+        text = " ".join(c["text"] for m in messages for c in m["content"])
+        return list(range(len(text.split())))
+
+    def __call__(self, text: str, **kwargs) -> dict:
+        return {"input_ids": list(range(len(text.split())))}
+
+class StubGenerator:
+    """
+    Class for StubGenerator object, returns a short deterministic reply per
+    prompt; called like a transformers chat text-generation pipeline.
+    """
+    tokenizer = StubTokenizer()
+
+    def _generate(self, messages: list[dict]) -> list[dict]:
+        prompt = messages[-1]["content"][0]["text"]
+        digest = hashlib.blake2b(prompt.encode(), digest_size=4).hexdigest()
+        if "JSON" in prompt:
+            reply = (f'{{"name": "Stub Subtopic {digest}", '
+                     f'"summary": "Stub summary {digest}."}}')
+        else:
+            reply = f"Stub Reply {digest}"
+        return [{"generated_text": messages + [
+            {"role": "assistant", "content": reply}]}]
+
+    def __call__(self, messages, **kwargs):
+        if messages and isinstance(messages[0], list):
+            return [self._generate(m) for m in messages]
+        return self._generate(messages)
+
+@contextmanager
+def stub_models():
+    """
+    Helper method patches model loading in utils with the offline stubs for
+    the duration of the context. A fresh model registry is installed, so no
+    real model loaded earlier is reused and no stub outlives the context.
+    """
+    encoder = StubEncoder()
+    registry = get_registry()
+    set_registry(ModelRegistry())
+    with ExitStack() as stack:
+        stack.callback(set_registry, registry)
+        stack.enter_context(patch("utils.cluster.get_sentence_transformer",
+                                  return_value=encoder))
+        stack.enter_context(patch("utils.sentiment.get_sentiment_pipeline",
+                                  return_value=StubClassifier()))
+        stack.enter_context(patch("utils.summary.get_topic_pipeline",
+                                  return_value=StubGenerator()))
+        yield
@@ -0,0 +1,84 @@
+"""
+Module defines a seeded synthetic-feedback generator, used to build
+benchmark corpora of any size with realistic response lengths, topical
+structure and duplicate rates.
+"""
+# == Third party imports ==
+import numpy as np
+import pandas as pd
+
+# topics with associated vocabulary; responses mix topic and filler words
+TOPICS = {
+    "battery": ["battery", "charge", "charging", "lasts", "hours", "drains",
+                "cable", "port", "lightning", "power"],
+    "comfort": ["comfortable", "ergonomic", "hand", "grip", "wrist", "shape",
+                "flat", "cramp", "size", "hold"],
+    "tracking": ["tracking", "cursor", "smooth", "precise", "lag", "scroll",
+                 "gesture", "swipe", "surface", "responsive"],
+    "price": ["price", "expensive", "cost", "value", "money", "cheap",
+              "overpriced", "worth", "deal", "discount"],
+    "connectivity": ["bluetooth", "pairing", "connection", "disconnects",
+                     "mac", "ipad", "setup", "wireless", "range", "drops"],
+    "design": ["design", "sleek", "white", "look", "style", "aluminum",
+               "minimal", "beautiful", "color", "finish"],
+}
+FILLER = ["the", "mouse", "is", "really", "very", "it", "and", "but", "my",
+          "this", "works", "great", "not", "so", "with", "for", "again",
+          "would", "recommend", "after", "using", "a", "few", "weeks"]
+SENTIMENT_WORDS = ["love", "great", "excellent", "hate", "terrible", "awful",
+                   "okay", "fine", "decent"]
+# short boilerplate replies that recur verbatim in real exports
+BOILERPLATE = ["Good", "Great product", "N/A", "No comment", "Works fine",
+               "Love it", "Too expensive", "Nothing to add"]
+
+def generate_feedback(n_rows: int, seed: int = 0, dup_rate: float = 0.15,
+                      boilerplate_rate: float = 0.05,
+                      mean_words: float = 25.0) -> list[str]:
+    """
+    Helper method generates a deterministic list of synthetic feedback
+    responses. Lengths follow a log-normal distribution, each response
+    draws mostly from one topic's vocabulary, and a share of rows are exact
+    duplicates of earlier rows or short boilerplate replies.
+    :param n_rows: Number of responses to generate.
+    :param seed: Random seed; equal seeds give equal corpora.
+    :param dup_rate: Share of rows copied from an earlier row.
+    :param boilerplate_rate: Share of rows that are boilerplate replies.
+    :param mean_words: Approximate mean words per generated response.
+    :return: List of feedback strings.
+    """
+    rng = np.random.default_rng(seed)
+    topic_words = list(TOPICS.values())
+    sigma = 0.8
+    mu = np.log(mean_words) - sigma ** 2 / 2
+    lengths = np.clip(rng.lognormal(mu, sigma, n_rows).astype(int), 1, 400)
+    kinds = rng.random(n_rows)
+    rows: list[str] = []
+    for i in range(n_rows):
+        if kinds[i] < dup_rate and rows:
+            rows.append(rows[rng.integers(len(rows))])
+            continue
+        if kinds[i] < dup_rate + boilerplate_rate:
+            rows.append(BOILERPLATE[rng.integers(len(BOILERPLATE))])
+            continue
+        vocab = topic_words[rng.integers(len(topic_words))]
+        n_words = lengths[i]
+        # roughly 40% topical words, 5% sentiment words, rest filler
+        source = rng.random(n_words)
+        words = np.where(
+            source < 0.4, rng.choice(vocab, n_words),
+            np.where(source < 0.45, rng.choice(SENTIMENT_WORDS, n_words),
+                     rng.choice(FILLER, n_words)))
+        text = " ".join(words)
+        rows.append(text[0].upper() + text[1:] + ".")
+    return rows
+
+def generate_frame(n_rows: int, seed: int = 0, col: str = "feedback",
+                   **kwargs) -> pd.DataFrame:
+    """
+    Helper method wraps generate_feedback in a single-column dataframe.
+    :param n_rows: Number of responses to generate.
+    :param seed: Random seed.
+    :param col: Name of the feedback column.
+    :return: Dataframe of synthetic feedback.
+    """
+    return pd.DataFrame({col: generate_feedback(n_rows, seed, **kwargs)})
@@ -0,0 +1,227 @@
+"""
+Headless command-line entry point, runs the feedback pipeline (clustering,
+sentiment, LLM summarization, save) without the Tkinter interface so it can
+be scheduled on servers.
+"""
+# == Standard Library imports ==
+import argparse
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+# == Local imports ==
+from processor import Parser
+from processor.parser import DEDUP_MODES
+from utils import Cluster, CSVLoader
+from utils.profiler import Profiler
+from utils.progress import console_listener, get_progress
+from utils.quantization import CHECK_SAMPLE_SIZE, check_quantization
+from utils.reducers import REDUCERS
+from utils.sentiment import SMT_BACKENDS
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Helper method parses command-line arguments.
+    :param argv: Argument list; defaults to sys.argv.
+    :return: Namespace of parsed arguments.
+    """
+    arg_parser = argparse.ArgumentParser(
+        description="Cluster, score and summarize a feedback file.")
+    arg_parser.add_argument("-i", "--input", required=True,
+                            help="Feedback file (CSV, Parquet or JSONL).")
+    arg_parser.add_argument("-c", "--column", required=True,
+                            help="Column containing feedback text.")
+    arg_parser.add_argument("-o", "--output", required=True,
+                            help="Path of the output CSV.")
+    arg_parser.add_argument("-s", "--seeds",
+                            help="Optional CSV of seed topics.")
+    arg_parser.add_argument("--seeds-column",
+                            help="Seed topic column (default: first column).")
+    arg_parser.add_argument("--single-pass", action="store_true",
+                            help="Generate subtopic name and summary in one "
+                                 "LLM call.")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="Write a per-stage performance report "
+                                 "(JSON) next to the output CSV.")
+    arg_parser.add_argument("--trace-stage",
+                            help="Stage to trace, e.g. cluster.encode; "
+                                 "implies --profile.")
+    arg_parser.add_argument("--torch-trace", action="store_true",
+                            help="Trace with torch profiler instead of "
+                                 "cProfile.")
+    arg_parser.add_argument("--progress", action="store_true",
+                            help="Print live progress (items done, "
+                                 "throughput, ETA) per stage to stderr.")
+    arg_parser.add_argument("--sample-size", type=int,
+                            help="Fit the cluster model on this many rows "
+                                 "and assign the rest (default: set by the "
+                                 "fit budget).")
+    arg_parser.add_argument("--reducer", choices=REDUCERS,
+                            default=REDUCERS[0],
+                            help="Dimensionality reducer: seeded UMAP "
+                                 "(default), parallel unseeded UMAP, or "
+                                 "streaming PCA for the largest inputs.")
+    arg_parser.add_argument("--dedup", choices=DEDUP_MODES,
+                            default=DEDUP_MODES[0],
+                            help="Collapse exact or also near-duplicate "
+                                 "feedback before embedding and sentiment "
+                                 "(default off); topics are then fitted "
+                                 "on unique texts only.")
+    arg_parser.add_argument("--quantize", action="store_true",
+                            help="Run the embedding and sentiment models "
+                                 "with dynamically quantized int8 linear "
+                                 "layers (faster on CPU, slight drift).")
+    arg_parser.add_argument("--check-quantization", action="store_true",
+                            help="Before the run, report int8 vs fp32 "
+                                 "embedding drift, sentiment agreement, "
+                                 "speedup and memory on a sample.")
+    arg_parser.add_argument("--sentiment-backend", choices=SMT_BACKENDS,
+                            default=SMT_BACKENDS[0],
+                            help="Run the sentiment model in PyTorch "
+                                 "(default) or ONNX Runtime; the ONNX "
+                                 "graph is exported once and cached.")
+    arg_parser.add_argument("--onnx-threads", type=int,
+                            help="Intra-op threads for the ONNX sentiment "
+                                 "backend (default: all physical cores).")
+    arg_parser.add_argument("--encode-workers", type=int, default=1,
+                            help="Processes encoding large inputs, each "
+                                 "with its own model (default 1; 0 fills "
+                                 "every core).")
+    arg_parser.add_argument("--llm-replicas", type=int, default=1,
+                            help="LLM replica processes generating names "
+                                 "and summaries in parallel, splitting the "
+                                 "cores (default 1; each holds a full "
+                                 "model).")
+    arg_parser.add_argument("--save-model",
+                            help="Directory to save the fitted model (and "
+                                 "LLM output) to, for reuse with "
+                                 "--load-model or --update-model.")
+    model_source = arg_parser.add_mutually_exclusive_group()
+    model_source.add_argument("--load-model",
+                              help="Directory of a saved model to reuse "
+                                   "instead of refitting; the input must "
+                                   "be the same feedback.")
+    model_source.add_argument("--update-model",
+                              help="Directory of a saved model to add the "
+                                   "input to as new feedback; the updated "
+                                   "model is saved back unless "
+                                   "--save-model is given.")
+    return arg_parser.parse_args(argv)
+
+def load_seeds(fpath: str, column: str | None = None) -> list[str]:
+    """
+    Helper method loads seed topics from a single column of a CSV.
+    :param fpath: Path to the seed topics CSV.
+    :param column: Column name; defaults to the first column.
+    :return: List of seed topic strings, NaN dropped.
+    """
+    topics = CSVLoader(fpath).load()
+    col_series = topics[column or topics.columns[0]]
+    return col_series.dropna().astype(str).tolist()
+
+def report_quantization(df, column: str) -> dict[str, dict[str, float]]:
+    """
+    Helper method checks the quantized models against fp32 on a sample of
+    the feedback and prints the result.
+    :param df: Dataframe of feedback.
+    :param column: Column containing feedback text.
+    :return: Dict of "embedding" and "sentiment" metric dicts.
+    """
+    texts = df[column].dropna().astype(str)
+    texts = texts[texts.str.strip() != ""]
+    sample = texts.sample(min(CHECK_SAMPLE_SIZE, len(texts)),
+                          random_state=0).tolist()
+    result = check_quantization(sample)
+    emb, smt = result["embedding"], result["sentiment"]
+    print(f"int8 check on {len(sample)} rows:\n"
+          f"  embedding: mean cosine drift {emb['mean_cosine_drift']:.4f}, "
+          f"max {emb['max_cosine_drift']:.4f}, {emb['speedup']:.2f}x "
+          f"faster, {emb['memory_saving']:.0%} smaller\n"
+          f"  sentiment: label agreement {smt['label_agreement']:.1%}, "
+          f"{smt['speedup']:.2f}x faster, {smt['memory_saving']:.0%} "
+          f"smaller")
+    return result
+
+def run(args: argparse.Namespace) -> dict[str, float]:
+    """
+    Method drives the Parser stages in order, timing each.
+    :param args: Namespace of parsed arguments.
+    :return: Dict of str (k = stage name), float (v = wall seconds).
+    """
+    df = CSVLoader(args.input).load(columns=[args.column])
+    seeds = load_seeds(args.seeds, args.seeds_column) if args.seeds else None
+    profiler = None
+    if args.profile or args.trace_stage:
+        profiler = Profiler(enabled=True, trace_stage=args.trace_stage,
+                            trace_dir=Path(args.output).parent,
+                            torch_trace=args.torch_trace)
+    options = dict(single_pass=args.single_pass, profiler=profiler,
+                   sample_size=args.sample_size, reducer=args.reducer,
+                   quantize=args.quantize,
+                   smt_backend=args.sentiment_backend,
+                   smt_threads=args.onnx_threads,
+                   encode_workers=args.encode_workers,
+                   llm_replicas=args.llm_replicas)
+    timings = {}
+    stages = []
+    if args.check_quantization:
+        stages.append(("check_quantization",
+                       lambda: report_quantization(df, args.column)))
+    if args.update_model:
+        # the saved model is restored as processed, then the input added
+        start = time.perf_counter()
+        parser = Parser.load_model(args.update_model, args.column, **options)
+        timings["load_model"] = time.perf_counter() - start
+        stages.append(("update", lambda: parser.update(df)))
+    else:
+        cluster = Cluster.load(args.load_model,
+                               encode_workers=args.encode_workers) \
+            if args.load_model else None
+        parser = Parser(df, args.column, seeds, cluster=cluster,
+                        dedup=args.dedup, **options)
+        stages += [
+            ("pre_process_ml", parser.pre_process_ml),
+            ("build_data_structures", parser.build_data_structures),
+        ]
+    stages += [
+        ("process_llm", parser.process_llm),
+        ("save", lambda: parser.save(args.output)),
+    ]
+    # saved last, so the model carries the LLM output for later updates
+    model_dir = args.save_model or args.update_model
+    if model_dir:
+        stages.append(("save_model", lambda: parser.save_model(model_dir)))
+    progress = get_progress().subscribed(console_listener()) \
+        if args.progress else nullcontext()
+    with progress:
+        for name, stage in stages:
+            print(f"Running {name}...")
+            start = time.perf_counter()
+            stage()
+            timings[name] = time.perf_counter() - start
+    report(timings, len(df), len(parser.subtopics))
+    return timings
+
+def report(timings: dict[str, float], n_rows: int, n_subtopics: int) -> None:
+    """
+    Helper method prints per-stage timings and throughput.
+    :param timings: Dict of stage name to wall seconds.
+    :param n_rows: Number of feedback rows processed.
+    :param n_subtopics: Number of subtopics produced.
+    """
+    total = sum(timings.values())
+    print(f"\n{'stage':<24}{'seconds':>10}{'rows/s':>12}")
+    for name, seconds in timings.items():
+        rate = n_rows / seconds if seconds else float("inf")
+        print(f"{name:<24}{seconds:>10.2f}{rate:>12.1f}")
+    rate = n_rows / total if total else float("inf")
+    print(f"{'total':<24}{total:>10.2f}{rate:>12.1f}")
+    print(f"{n_rows} rows, {n_subtopics} subtopics")
+
+def main(argv: list[str] | None = None) -> int:
+    run(parse_args(argv))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
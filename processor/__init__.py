@@ -1,2 +1,2 @@
 from .parser import Parser
-from .topic_base import Topic, Subtopic
\ No newline at end of file
+from .topic_base import Topic, Subtopic, parse_combined_output
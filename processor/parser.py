@@ -3,21 +3,40 @@ Class defines Parser, which handles feedback parsing, clustering, sentiment
 assignment, and summarization work.
 """
 # == Standard Library imports ==
+import json
 import re
 from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
 
 # == Third party imports ==
+import numpy as np
 import pandas as pd
 
 # == Local imports ==
-from .topic_base import Subtopic, Topic
-from utils import Cluster, Sentiment, Summary
+from .topic_base import Subtopic, Topic, parse_combined_output
+from utils import Cluster, Deduplicator, Sentiment, Summary
+from utils.cluster import sentences_hash
+from utils.profiler import Profiler, get_profiler, use_profiler
+from utils.progress import get_progress
 
 # constants for column headers
 SMT_LABEL = "smt_label"
 SMT_SCORE = "smt_score"
 T_ID = "topic_name"
 ST_ID = "subtopic_id"
+# constant for number of rows scored for sentiment per streamed chunk
+SMT_CHUNK_SIZE = 10_000
+# constant for suffix of the performance report written beside the output
+PERF_SUFFIX = ".perf.json"
+# constant for feedback deduplication modes, default first; collapsing is
+# opt-in, as the reducer and clusterer are fitted on each unique text once,
+# which finds fewer, broader topics than fitting on every row
+DEDUP_MODES = ("off", "exact", "near")
+# constants for file names the parser adds to a saved cluster run directory
+PARSER_FILE = "parser.json"
+DEDUP_FILE = "dedup.npz"
 
 # set maximum columnar output for df
 pd.set_option('display.max_columns', None)
@@ -31,46 +50,160 @@ class Parser:
     """
 
     def __init__(self, df: pd.DataFrame,
-                 col_name: str, seeds: list[str] | None = None):
+                 col_name: str, seeds: list[str] | None = None,
+                 single_pass: bool = False,
+                 profiler: Profiler | None = None,
+                 cluster: Cluster | None = None,
+                 sample_size: int | None = None,
+                 reducer: str = "umap",
+                 dedup: str = "off",
+                 quantize: bool = False,
+                 smt_backend: str = "torch",
+                 smt_threads: int | None = None,
+                 encode_workers: int = 1,
+                 llm_replicas: int = 1):
         self.df = df
         self.col = col_name
         self.seeds = seeds
+        # if set, request subtopic name and summary in one LLM call
+        self.single_pass = single_pass
+        # if given, profiler every stage and model call reports to; it is
+        # installed process-wide only while a stage of this parser runs
+        self.profiler = profiler if profiler is not None else get_profiler()
 
-        self.smt = Sentiment()
-        self.summary = Summary()
-        self.cluster = None
+        # if set, embedding and sentiment models run with int8 linear layers
+        self.quantize = quantize
+        # sentiment backend (torch or onnx), and onnx intra-op threads
+        self.smt = Sentiment(quantize=quantize, backend=smt_backend,
+                             threads=smt_threads)
+        # LLM replica processes generating prompts in parallel (1 = serial)
+        self.summary = Summary(replicas=llm_replicas)
+        # if given, a previously fitted (e.g. loaded) cluster is reused
+        self.cluster = cluster
+        # rows to fit the cluster model on; None = set by the fit budget
+        self.sample_size = sample_size
+        # dimensionality reducer for the cluster model, see utils.reducers
+        self.reducer = reducer
+        # processes encoding large inputs (1 = in-process, 0 = all cores)
+        self.encode_workers = encode_workers
+        # duplicate collapsing mode (see DEDUP_MODES), and the deduplicator
+        # mapping rows onto unique texts once built in pre_process_ml
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode: {dedup}")
+        self.dedup_mode = dedup
+        self.dedup: Deduplicator | None = None
+        # sentiment label and score per unique text, when deduplicated
+        self.unique_labels = np.empty(0, dtype=object)
+        self.unique_scores = np.zeros(0, dtype=np.float32)
 
         self.topics: list[Topic] = []
         self.subtopics: dict[int, Subtopic] = {}
 
         self.out = None
 
-    def _get_sentimental(self, feedback: list[str]) -> dict[str, int]:
+    @contextmanager
+    def _stage(self, name: str, items: int | None = None) -> Iterator[dict]:
+        """
+        Helper method times a stage with the parser's profiler, installing
+        it process-wide for the stage's duration so the model calls within
+        report to it too, without instrumenting later parsers.
+        :param name: Stage name, e.g. "parser.save".
+        :param items: Number of items processed, if known up front.
+        """
+        with use_profiler(self.profiler), \
+                self.profiler.stage(name, items=items) as record:
+            yield record
+
+    def _score_texts(self, feedback: pd.Series
+                     ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Helper method streams feedback through the sentiment pipeline in
+        fixed-size chunks, so memory stays bounded on large inputs.
+        :param feedback: Series of feedback.
+        :return: Tuple of label (object) and score (float32) arrays.
+        """
+        n_rows = len(feedback)
+        labels = np.empty(n_rows, dtype=object)
+        scores = np.zeros(n_rows, dtype=np.float32)
+        # one task for all chunks, so its rate and ETA cover the whole input
+        with get_progress().task("sentiment.classify", total=n_rows) as task:
+            # for each chunk of rows, score feedback and write results in place
+            for start in range(0, n_rows, SMT_CHUNK_SIZE):
+                chunk = feedback.iloc[start:start + SMT_CHUNK_SIZE]
+                texts = chunk.fillna("").astype(str).tolist()
+                results = self.smt.get_batch_sentiment(
+                    texts, advance=task.advance)
+                stop = start + len(results)
+                labels[start:stop] = [r["label"] for r in results]
+                scores[start:stop] = [r["score"] for r in results]
+        return labels, scores
+
+    def _score_sentiment(self, first_row: int = 0) -> None:
+        """
+        Method scores feedback rows for sentiment. Results are stored as
+        per-row label (categorical) and score (float32) columns on the df.
+        When deduplicated, each unique text is scored once and its result
+        expanded to every row it stands for.
+        :param first_row: Position of the first row to score; earlier rows
+        keep their existing results (used when feedback is appended).
+        """
+        if self.dedup is not None:
+            # score only unique texts added since the last call
+            labels, scores = self._score_texts(pd.Series(
+                self.dedup.unique[len(self.unique_labels):], dtype=object))
+            self.unique_labels = np.concatenate([self.unique_labels, labels])
+            self.unique_scores = np.concatenate([self.unique_scores, scores])
+            self.df[SMT_LABEL] = pd.Categorical(
+                self.dedup.expand(self.unique_labels))
+            self.df[SMT_SCORE] = self.dedup.expand(self.unique_scores)
+            return None
+        labels, scores = self._score_texts(
+            self.df[self.col].iloc[first_row:])
+        if first_row:
+            labels = np.concatenate([
+                self.df[SMT_LABEL].iloc[:first_row].astype(object), labels])
+            scores = np.concatenate([
+                self.df[SMT_SCORE].iloc[:first_row].to_numpy(np.float32),
+                scores])
+        self.df[SMT_LABEL] = pd.Categorical(labels)
+        self.df[SMT_SCORE] = scores
+
+    def _get_subtopic_sentiment(self) -> dict[int, dict[str, int]]:
         """
         Method counts the instance of sentiments (i.e., pos, neg,
-        neut) present in the given dataset.
-        :param feedback: Comprehensive list of feedback items.
-        :return: Dict of str (k = pos / neg / neut), int (v = count)
-        """
-        sentiment_counts = defaultdict(int)
-        # for each feedback str, get feedback label associated with it
-        # and update count within dict
-        for fb in feedback:
-            sentiment = self.smt.get_feedback_sentiment(fb)["label"]
-            sentiment_counts[sentiment] += 1
-        return dict(sentiment_counts)
+        neut) across every feedback row of each subtopic, using a single
+        groupby of per-row sentiment labels against subtopic assignments.
+        :return: Dict of int (k = subtopic id), dict (v = label counts).
+        """
+        if SMT_LABEL not in self.df.columns:
+            self._score_sentiment()
+        # assign each feedback row to its subtopic
+        if self.dedup is not None:
+            topics = self.cluster.get_subtopic_id(
+                range(len(self.dedup.unique)))
+            self.df[ST_ID] = self.dedup.expand(topics)
+        else:
+            self.df[ST_ID] = self.cluster.get_subtopic_id(self.df.index)
+        counts = self.df.groupby([ST_ID, SMT_LABEL], observed=True).size()
+        sentiment = defaultdict(dict)
+        for (st_id, label), count in counts.items():
+            sentiment[st_id][label] = int(count)
+        return dict(sentiment)
 
     def _build_subtopics(self) -> None:
         """
         Method builds subtopics for packaged model data (which will contain
         >= 1 subtopic). This is assigned to the parser object subtopics ds.
         """
-        if not self.cluster.package_model_data():
+        model_data = self.cluster.package_model_data()
+        if not model_data:
             return None
+        # count sentiment across all feedback rows for every subtopic
+        sentiment = self._get_subtopic_sentiment()
         # for each 'topic' id, data instance (subtopic) in the model data,
-        for tid, dt in self.cluster.package_model_data().items():
-            # get a sentiment count given available feedback
-            sentiment_count = self._get_sentimental(dt['feedback'])
+        for tid, dt in model_data.items():
+            # get a sentiment count given all feedback for the subtopic
+            sentiment_count = sentiment.get(tid, {})
             # clean up the name, which usually has a leading number, underscore
             cleaned = re.sub(r'^[-\d_]+', '', dt['name'])
             # build subtopic from data and assign to data structure.
@@ -91,10 +224,10 @@ class Parser:
         :return:
         """
         t_dict = defaultdict(list)
-        # for each subtopic present in the data
-        for st_id in self.subtopics.keys():
-            # get a generalized topic name by accessing the topic hierarchy
-            name = self.cluster.assign_topic(st_id)
+        # get a generalized topic name for every subtopic present in the
+        # data at once, using the topic hierarchy
+        parents = self.cluster.assign_topics(self.subtopics.keys())
+        for st_id, name in parents.items():
             # append the subtopic id as value to the topic name as key
             # multiple subtopics can be appended
             t_dict[name].append(st_id)
@@ -110,33 +243,67 @@ class Parser:
     def _build_topic_names(self) -> None:
         """
         Method 'builds' topic name from raw input using LLM text
-        summarization and decoration.
+        summarization and decoration. Prompts for all topics are submitted
+        to the LLM together, as batches.
         """
         print("Building topic names...")
-        for t in self.topics:
-            # if topic already has name, skip
-            if t.read_name:
-                continue
+        # if topic already has name, skip
+        pending = [t for t in self.topics if not t.read_name]
+        for t in pending:
             # lookup stores subtopic data as flat string within topic object
             t.lookup_sub_topic(self.subtopics)
-            # get the readable name from passing name, prompt, st info to LLM
-            t.read_name = self.summary.get_output(t.name, t.name_prompt())
-
+        # get the readable names from passing name, prompt, st info to LLM
+        names = self.summary.get_outputs(
+            [(t.name, t.name_prompt()) for t in pending])
+        for t, read_name in zip(pending, names):
+            t.read_name = read_name
 
     def _build_subtopic_info(self) -> None:
         """
         Method 'builds' subtopic info from raw input using LLM text
         summarization and decoration. Information is human-readable name and
-        summarizing text (i.e. what subtopic is about).
+        summarizing text (i.e. what subtopic is about). In single pass mode,
+        one combined prompt per subtopic requests both; subtopics whose
+        output cannot be parsed fall back to separate name and summary
+        prompts.
         """
         print("Building subtopic information...")
-        for st in self.subtopics.values():
-            # get readable name from passing name, prompt, st info to LLM
-            read_name = self.summary.get_output(st.name, st.name_prompt())
-            # get summary information from passing st info to LLM
-            summary_txt = self.summary.get_output(st.name, st.summary_prompt())
-            st.read_name = read_name
-            st.summary = summary_txt
+        # if subtopic already has name and summary, skip
+        subtopics = [st for st in self.subtopics.values()
+                     if not (st.read_name and st.summary)]
+        if self.single_pass:
+            outputs = self.summary.get_outputs(
+                [(st.name, st.combined_prompt()) for st in subtopics])
+            failed = []
+            for st, output in zip(subtopics, outputs):
+                parsed = parse_combined_output(output)
+                if parsed is None:
+                    failed.append(st)
+                    continue
+                st.read_name, st.summary = parsed
+            if failed:
+                print(f"Combined output unparsable for {len(failed)} "
+                      f"subtopics, falling back to separate prompts...")
+            subtopics = failed
+        self._build_subtopic_info_separately(subtopics)
+
+    def _build_subtopic_info_separately(self,
+                                        subtopics: list[Subtopic]) -> None:
+        """
+        Method 'builds' subtopic name and summary using two prompts per
+        subtopic. Prompts for all given subtopics are gathered up front and
+        submitted to the LLM together, as batches.
+        :param subtopics: List of subtopics to name and summarize.
+        """
+        if not subtopics:
+            return None
+        # gather name prompts, then summary prompts, for every subtopic
+        items = [(st.name, st.name_prompt()) for st in subtopics]
+        items += [(st.name, st.summary_prompt()) for st in subtopics]
+        outputs = self.summary.get_outputs(items)
+        for i, st in enumerate(subtopics):
+            st.read_name = outputs[i]
+            st.summary = outputs[len(subtopics) + i]
 
     def get_summary(self) -> pd.DataFrame:
         """
@@ -145,17 +312,15 @@ class Parser:
         :return: Dataframe of summarized topic, subtopic data.
         """
         records = []
-        # build a map where the topic readable name corresponds to subtopics
-        d_map = {t.read_name: t.related_sub_topics for t in self.topics}
+        # build a map where each subtopic id corresponds to the readable
+        # name of its parent topic
+        parent_map = {st_id: t.read_name for t in self.topics
+                      for st_id in t.related_sub_topics}
         for st in self.subtopics.values():
             # for every subtopic, get its packaged data in dict
             st_data = st.get_data_dict()
             # find the parent topic to the subtopic through mapping
-            parent_topic = next(
-                (t_name for t_name, sub_ids in d_map.items() if st.id in
-                 sub_ids),
-                "None"
-            )
+            parent_topic = parent_map.get(st.id, "None")
             # set the general topic field in subtopic data to its parent
             st_data["General Topic"] = parent_topic
             # ensure this is positioned first in the df for readability
@@ -163,25 +328,190 @@ class Parser:
             records.append(st_data)
         return pd.DataFrame(records)
 
+    def update(self, df_new: pd.DataFrame) -> set[int]:
+        """
+        Method incrementally adds new feedback to an already processed
+        parser. New rows are assigned to the existing topic model, only new
+        rows are scored for sentiment, and topics / subtopics are rebuilt.
+        LLM output is carried over for subtopics (and topics) whose
+        membership did not change meaningfully, so process_llm only
+        re-summarizes those that did.
+        :param df_new: Dataframe of new feedback, containing the same
+        feedback column.
+        :return: Set of changed (or new) subtopic ids.
+        """
+        n_old = len(self.df)
+        old_subtopics, old_topics = self.subtopics, self.topics
+        self.df = pd.concat([self.df, df_new[[self.col]]],
+                            ignore_index=True)
+        sentences = df_new[self.col].fillna("").astype(str).tolist()
+        with self._stage("parser.update", items=len(sentences)):
+            if self.dedup is not None:
+                # only texts unlike any earlier feedback reach the model
+                changed = self.cluster.update(self.dedup.append(sentences),
+                                              weights=self.dedup.weights)
+            else:
+                changed = self.cluster.update(sentences)
+            if SMT_LABEL in self.df.columns:
+                self._score_sentiment(first_row=n_old)
+            self.subtopics, self.topics = {}, []
+            self.build_data_structures()
+        # carry over LLM output where membership did not change
+        for st_id, st in self.subtopics.items():
+            old = old_subtopics.get(st_id)
+            if old is not None and st_id not in changed:
+                st.read_name, st.summary = old.read_name, old.summary
+        old_names = {(t.name, tuple(t.related_sub_topics)): t.read_name
+                     for t in old_topics}
+        for t in self.topics:
+            if not changed.intersection(t.related_sub_topics):
+                t.read_name = old_names.get(
+                    (t.name, tuple(t.related_sub_topics)), t.read_name)
+        return changed
+
+    def _deduplicate(self, sentences: list[str]) -> list[str]:
+        """
+        Method collapses duplicate feedback according to the dedup mode, so
+        the cluster and sentiment models see each unique text once.
+        :param sentences: List of feedback, one per row.
+        :return: List of unique feedback (all rows if dedup is off).
+        """
+        if self.dedup_mode == "off":
+            return sentences
+        with self._stage("parser.dedup", items=len(sentences)):
+            self.dedup = Deduplicator(sentences,
+                                      near=self.dedup_mode == "near")
+        print(f"Collapsed {len(sentences)} rows to "
+              f"{len(self.dedup.unique)} unique feedback "
+              f"({self.dedup.saved_share:.1%} saved)")
+        # a copy, as the deduplicator grows its list when feedback is added
+        return list(self.dedup.unique)
+
+    def save_model(self, run_dir: str | Path) -> Path:
+        """
+        Method saves the fitted cluster to a run directory, along with the
+        deduplication state and the LLM output of every topic and subtopic,
+        so load_model can resume in another process, e.g. to add the next
+        day's feedback with update.
+        :param run_dir: Directory to write into; created if missing.
+        :return: Path of the run directory.
+        """
+        run_dir = self.cluster.save(run_dir)
+        if self.dedup is not None:
+            self.dedup.save(run_dir / DEDUP_FILE)
+        else:
+            (run_dir / DEDUP_FILE).unlink(missing_ok=True)
+        state = {
+            "column": self.col,
+            "dedup": self.dedup_mode if self.dedup is not None else "off",
+            "subtopics": {str(st_id): [st.read_name, st.summary]
+                          for st_id, st in self.subtopics.items()},
+            "topics": [[t.name, [int(i) for i in t.related_sub_topics],
+                        t.read_name] for t in self.topics],
+        }
+        with open(run_dir / PARSER_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        return run_dir
+
+    @classmethod
+    def load_model(cls, run_dir: str | Path, col_name: str | None = None,
+                   **kwargs) -> "Parser":
+        """
+        Method restores a parser saved with save_model, without refitting:
+        the feedback rows are rebuilt from the saved cluster (expanded
+        through the saved deduplication state), topics and subtopics are
+        rebuilt, and their saved LLM output is restored.
+        :param run_dir: Directory written by save_model.
+        :param col_name: Feedback column name; defaults to the saved one.
+        :param kwargs: Further Parser arguments (dedup is taken from the
+        saved state).
+        :return: Parser object, as after process_llm.
+        """
+        run_dir = Path(run_dir)
+        cluster = Cluster.load(
+            run_dir, encode_workers=kwargs.get("encode_workers", 1))
+        state_path = run_dir / PARSER_FILE
+        state = {}
+        if state_path.is_file():
+            with open(state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        col = col_name or state.get("column", "feedback")
+        dedup = None
+        if (run_dir / DEDUP_FILE).is_file():
+            dedup = Deduplicator.load(run_dir / DEDUP_FILE,
+                                      cluster.sentences)
+        rows = cluster.sentences if dedup is None else \
+            dedup.expand(np.array(cluster.sentences, dtype=object)).tolist()
+        kwargs["dedup"] = state.get("dedup", "off")
+        parser = cls(pd.DataFrame({col: rows}), col, cluster=cluster,
+                     **kwargs)
+        parser.dedup = dedup
+        parser.build_data_structures()
+        for st_id, (read_name, summary) in state.get("subtopics",
+                                                     {}).items():
+            st = parser.subtopics.get(int(st_id))
+            if st is not None:
+                st.read_name, st.summary = read_name, summary
+        names = {(name, tuple(related)): read_name
+                 for name, related, read_name in state.get("topics", [])}
+        for t in parser.topics:
+            t.read_name = names.get((t.name, tuple(t.related_sub_topics)),
+                                    t.read_name)
+        return parser
+
     def pre_process_ml(self) -> None:
-        self.cluster = Cluster(self.df[self.col].tolist())
+        with self._stage("parser.pre_process_ml", items=len(self.df)):
+            rows = self.df[self.col].fillna("").astype(str).tolist()
+            sentences = self._deduplicate(rows)
+            if self.cluster is None:
+                weights = None if self.dedup is None else self.dedup.weights
+                self.cluster = Cluster(sentences,
+                                       sample_size=self.sample_size,
+                                       reducer=self.reducer,
+                                       weights=weights,
+                                       quantize=self.quantize,
+                                       encode_workers=self.encode_workers)
+            else:
+                # compare content, not counts: other feedback of the same
+                # length would silently get the loaded topics
+                fitted = sentences_hash(self.cluster.sentences)
+                if fitted == sentences_hash(sentences):
+                    return
+                if self.dedup is not None and fitted == sentences_hash(rows):
+                    # loaded cluster was fitted without deduplication
+                    self.dedup = None
+                    return
+                raise ValueError(
+                    f"Loaded cluster was fitted on other feedback "
+                    f"({len(self.cluster.sentences)} rows) than the input "
+                    f"({len(rows)} rows, {len(sentences)} unique)")
 
     def build_data_structures(self) -> None:
         # build subtopics and topics from data using topic modelling
-        self._build_subtopics()
-        self._build_topics()
+        with self._stage("parser.build_data_structures", items=len(self.df)):
+            self._build_subtopics()
+            self._build_topics()
 
     def process_llm(self) -> None:
-        self._build_topic_names()
-        self._build_subtopic_info()
+        with self._stage("parser.process_llm", items=len(self.subtopics)):
+            try:
+                self._build_topic_names()
+                self._build_subtopic_info()
+            finally:
+                # release the LLM replicas, if any were started
+                self.summary.close()
 
     def save(self, fpath_out: str):
         # instantiate a summary df and print to CSV
-        self.out = self.get_summary()
-        self.out.to_csv(
-            path_or_buf=fpath_out,
-            index=False,
-            encoding="utf-8",
-            sep=",",
-            quoting=1,
-        )
+        with self._stage("parser.save", items=len(self.subtopics)):
+            self.out = self.get_summary()
+            self.out.to_csv(
+                path_or_buf=fpath_out,
+                index=False,
+                encoding="utf-8",
+                sep=",",
+                quoting=1,
+            )
+        # write performance report next to the output CSV
+        if self.profiler.enabled:
+            self.profiler.save(Path(fpath_out).with_suffix(PERF_SUFFIX))
@@ -3,10 +3,44 @@ Class defines abstract base class TopicBase, and establishes Subtopic
 and Topic classes inheriting TopicBase.
 """
 # == Standard Library imports ==
+import json
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional
 
+def parse_combined_output(text: str) -> tuple[str, str] | None:
+    """
+    Helper method parses LLM output generated from a combined subtopic
+    prompt into name and summary. Accepts a JSON object (optionally inside
+    a code fence or surrounding text), or "Name:" / "Summary:" delimited
+    lines as a fallback.
+    :param text: Generated output string.
+    :return: Tuple of (name, summary) strings, or None if parsing fails.
+    """
+    # try the first JSON object present in the output
+    match = re.search(r"\{.*\}", text, flags=re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            name, summary = data.get("name"), data.get("summary")
+            if isinstance(name, str) and isinstance(summary, str) and \
+                    name.strip() and summary.strip():
+                return name.strip(), summary.strip()
+            return None
+    # fall back to delimited "Name: ... Summary: ..." output
+    match = re.search(r"name\W*:\s*(.+?)\s*summary\W*:\s*(.+)", text,
+                      flags=re.DOTALL | re.IGNORECASE)
+    if match:
+        name = match.group(1).strip(' \t\n*"')
+        summary = match.group(2).strip(' \t\n*"')
+        if name and summary:
+            return name, summary
+    return None
+
 @dataclass
 class TopicBase(ABC):
     """
@@ -135,6 +169,53 @@ class Subtopic(TopicBase):
         """
         return prompt_st.strip()
 
+    def combined_prompt(self) -> str:
+        """
+        Method returns generative AI prompt requesting both the subtopic
+        name and summary in a single structured (JSON) response, so
+        subtopic tags and feedback are only sent to the LLM once.
+        :return: Generative AI prompt, string.
+        """
+        # build sentiment list from dict
+        smt = [f"{label}: {count}" for label, count in self.sentiment.items()]
+        # generate prompt for subtopic name and summary development
+        prompt = f"""
+        You are an analyst helping to label and summarize clusters of user 
+        feedback. We are labelling subtopics, which are defined as a smaller, 
+        more specific topic that is part of a larger, broader subject.
+
+        The subtopic has the following short description:
+        "{self.name}"
+
+        The associated keywords for the subtopic are:
+        {", ".join(self.tags)}
+
+        The associated feedback for the subtopic is:
+        {", ".join(self.feedback) if self.feedback else ""}
+
+        Sentiment distribution for this subtopic:
+        {", ".join(smt) if self.sentiment else ""}
+
+        Provide two things:
+        1. A **brief, human-readable name** for this subtopic.
+            - Keep it 2–5 words.
+            - Make it clear and intuitive.
+            - Avoid generic terms.
+            - Use title case.
+        2. A short, cohesive paragraph summarizing the main topic or theme 
+        of these keywords, feedback statements, and sentiment.
+            - Be factual and objective
+            - Capture the key issue or focus of discussion across feedback 
+            statements
+            - Avoid repetition or quoting text directly
+            - Be roughly 3–5 sentences in length
+            - Use plain and neutral language
+
+        Return only a JSON object with exactly these keys, and nothing else:
+        {{"name": "<subtopic name>", "summary": "<summary paragraph>"}}
+        """
+        return prompt.strip()
+
 @dataclass
 class Topic(TopicBase):
     """
@@ -0,0 +1,39 @@
+import pytest
+
+from utils.cache_utils import CACHE_ENV
+from utils.model_registry import ModelRegistry, set_registry
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    # keep persistent caches out of the user's home directory during tests
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+
+@pytest.fixture(autouse=True)
+def isolated_model_registry():
+    # give every test a fresh registry, so patched model loaders apply
+    set_registry(ModelRegistry())
+    yield
+    set_registry(ModelRegistry())
+
+@pytest.fixture
+def bare_cluster():
+    # a Cluster holding what __init__ sets, with no model loaded or fitted;
+    # tests set the state they exercise
+    from utils import Cluster
+    cluster = Cluster.__new__(Cluster)
+    cluster.sentences = []
+    cluster.weights = None
+    cluster.seeds = None
+    cluster.sample_size = None
+    cluster.sample_strategy = "stratified"
+    cluster.reducer = "umap"
+    cluster.fit_index = None
+    cluster.quantize = False
+    cluster._st_model = None
+    cluster.encode_workers = 1
+    cluster.emb_cache = None
+    cluster.embeddings = None
+    cluster.pending_outliers = []
+    cluster.topic_model = None
+    cluster.hierarchy = None
+    return cluster
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.stubs import StubClassifier, StubEncoder, StubGenerator
+from benchmarks.synthetic import generate_feedback
+from utils.summary import _bundle_messages
+
+
+def test_synthetic_feedback_is_seeded():
+    first = generate_feedback(500, seed=3)
+    assert first == generate_feedback(500, seed=3)
+    assert first != generate_feedback(500, seed=4)
+    assert len(first) == 500
+
+
+def test_synthetic_feedback_has_duplicates():
+    rows = generate_feedback(2000, seed=0, dup_rate=0.3)
+    duplicate_share = 1 - len(set(rows)) / len(rows)
+    assert 0.25 < duplicate_share < 0.5
+
+
+def test_stub_encoder_is_deterministic_and_normalized():
+    encoder = StubEncoder()
+    vectors = encoder.encode(["battery drains fast", "battery drains"])
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1, rtol=1e-5)
+    np.testing.assert_array_equal(vectors, StubEncoder().embed(
+        ["battery drains fast", "battery drains"]))
+
+
+def test_stub_pipelines_match_model_output_format():
+    assert StubClassifier()(["I love it", "terrible lag"]) == [
+        {"label": "POSITIVE", "score": 0.6},
+        {"label": "NEGATIVE", "score": 0.7},
+    ]
+    output = StubGenerator()(_bundle_messages("Name this"))
+    assert output[0]["generated_text"][-1]["content"].startswith("Stub")
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"1000": {"cluster.umap": {"wall_s": 1.0},
+                                     "parser.save": {"wall_s": 0.001}}}}
+    current = {"results": {"1000": {"cluster.umap": {"wall_s": 1.5},
+                                    "parser.save": {"wall_s": 0.01}}}}
+
+    rows = {row["stage"]: row for row in compare(baseline, current)}
+
+    assert rows["cluster.umap"]["regressed"]
+    # tiny stages are below the noise floor and never flagged
+    assert not rows["parser.save"]["regressed"]
+
+
+def test_reducer_summary_scores_agreement_with_reference():
+    from benchmarks.reducers import summarize
+
+    runs = {
+        "umap": {"reduce_s": 2.0, "labels": [0, 0, 1, 1, -1]},
+        "pca": {"reduce_s": 0.1, "labels": [1, 1, 0, 0, -1]},
+    }
+
+    summary = summarize(runs)
+
+    # cluster ids differ but the partition is the same
+    assert summary["pca"]["ari_vs_umap"] == 1.0
+    assert summary["pca"]["n_clusters"] == 2
+    assert summary["pca"]["outlier_share"] == 0.2
+    assert "labels" not in summary["pca"]
+
+
+def test_encoding_scaling_relative_to_one_worker():
+    from benchmarks.encoding import scaling
+
+    runs = {1: {"rows": 100, "encode_s": 4.0},
+            4: {"rows": 100, "encode_s": 1.25}}
+
+    results = scaling(runs)
+
+    assert results[1]["rows_per_s"] == 25
+    assert results[4]["speedup"] == 3.2
+    assert results[4]["efficiency"] == 0.8
+
+
+
+def test_run_restores_cache_dir(monkeypatch):
+    from benchmarks import run as bench
+    from utils.cache_utils import CACHE_ENV
+
+    monkeypatch.setenv(CACHE_ENV, "/user/cache")
+    seen = []
+    monkeypatch.setattr(bench, "run_size", lambda *args: seen.append(
+        os.environ[CACHE_ENV]) or {})
+
+    bench.run([10])
+
+    # the size ran against its own empty cache, then the user's came back
+    assert seen[0] != "/user/cache"
+    assert os.environ[CACHE_ENV] == "/user/cache"
+
+
+def test_real_models_run_offline_or_fail_fast(monkeypatch):
+    from huggingface_hub import constants
+    from benchmarks import run as bench
+
+    monkeypatch.setattr(bench, "REAL_MODELS", ("org/not-cached-model",))
+    with pytest.raises(RuntimeError, match="org/not-cached-model"):
+        with bench.offline_models():
+            pass
+
+    monkeypatch.setattr(bench, "missing_models", lambda: [])
+    monkeypatch.delenv("HF_HUB_OFFLINE", raising=False)
+    was_offline = constants.HF_HUB_OFFLINE
+    with bench.offline_models():
+        assert constants.HF_HUB_OFFLINE
+        assert os.environ["HF_HUB_OFFLINE"] == "1"
+    assert constants.HF_HUB_OFFLINE == was_offline
+    assert "HF_HUB_OFFLINE" not in os.environ
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import cli
+
+
+def test_cli_runs_all_stages(tmp_path, capsys):
+    input_file = tmp_path / "feedback.csv"
+    input_file.write_text("id,comment\n1,Great\n2,Slow\n")
+    seeds_file = tmp_path / "seeds.csv"
+    seeds_file.write_text("seed\nbattery\n\nprice\n")
+    output_file = tmp_path / "out.csv"
+
+    with patch("cli.Parser") as MockParser:
+        parser = MockParser.return_value
+        parser.subtopics = {1: object()}
+        exit_code = cli.main(["-i", str(input_file), "-c", "comment",
+                            "-o", str(output_file), "-s", str(seeds_file)])
+
+    df, column, seeds = MockParser.call_args.args
+    assert list(df.columns) == ["comment"]
+    assert column == "comment"
+    assert seeds == ["battery", "price"]
+    parser.pre_process_ml.assert_called_once()
+    parser.build_data_structures.assert_called_once()
+    parser.process_llm.assert_called_once()
+    parser.save.assert_called_once_with(str(output_file))
+    assert exit_code == 0
+    out = capsys.readouterr().out
+    assert "process_llm" in out and "rows/s" in out
+
+
+def test_cli_saves_and_loads_cluster_model(tmp_path):
+    input_file = tmp_path / "feedback.csv"
+    input_file.write_text("comment\nGreat\n")
+    model_dir = tmp_path / "model"
+
+    with patch("cli.Parser") as MockParser, patch("cli.Cluster") as MockCluster:
+        parser = MockParser.return_value
+        parser.subtopics = {}
+        cli.main(["-i", str(input_file), "-c", "comment",
+                  "-o", str(tmp_path / "out.csv"),
+                  "--load-model", str(model_dir),
+                  "--save-model", str(model_dir)])
+
+    MockCluster.load.assert_called_once_with(str(model_dir),
+                                             encode_workers=1)
+    assert MockParser.call_args.kwargs["cluster"] is \
+        MockCluster.load.return_value
+    parser.save_model.assert_called_once_with(str(model_dir))
+
+
+def test_cli_quantize_check_runs_before_pipeline(tmp_path, capsys):
+    input_file = tmp_path / "feedback.csv"
+    input_file.write_text("comment\nGreat\n\nSlow\n")
+    metrics = {"speedup": 2.0, "memory_saving": 0.75}
+    result = {
+        "embedding": {**metrics, "mean_cosine_drift": 0.001,
+                      "max_cosine_drift": 0.01},
+        "sentiment": {**metrics, "label_agreement": 0.98},
+    }
+
+    with patch("cli.Parser") as MockParser, \
+            patch("cli.check_quantization", return_value=result) as check:
+        MockParser.return_value.subtopics = {}
+        cli.main(["-i", str(input_file), "-c", "comment",
+                  "-o", str(tmp_path / "out.csv"),
+                  "--quantize", "--check-quantization"])
+
+    assert MockParser.call_args.kwargs["quantize"] is True
+    # the sample skips empty feedback
+    assert sorted(check.call_args.args[0]) == ["Great", "Slow"]
+    assert "label agreement 98.0%" in capsys.readouterr().out
+
+
+def test_cli_updates_saved_model_with_new_feedback(tmp_path):
+    import json
+
+    from benchmarks.stubs import stub_models
+    from benchmarks.synthetic import generate_frame
+    from utils.dedup import dedup_key
+
+    df = generate_frame(200, 0, col="comment")
+    df.iloc[:150].to_csv(tmp_path / "day1.csv", index=False)
+    df.iloc[150:].to_csv(tmp_path / "day2.csv", index=False)
+    model_dir = tmp_path / "model"
+    common = ["-c", "comment", "--reducer", "pca"]
+
+    with stub_models():
+        cli.main(["-i", str(tmp_path / "day1.csv"),
+                  "-o", str(tmp_path / "out1.csv"), "--dedup", "exact",
+                  "--save-model", str(model_dir), *common])
+        exit_code = cli.main(["-i", str(tmp_path / "day2.csv"),
+                              "-o", str(tmp_path / "out2.csv"),
+                              "--update-model", str(model_dir), *common])
+
+    assert exit_code == 0
+    # the saved model now covers both days, collapsed to unique texts
+    sentences = json.loads((model_dir / "sentences.json").read_text())
+    assert len(sentences) == len({dedup_key(t) for t in df["comment"]})
+    assert (tmp_path / "out2.csv").stat().st_size > 0
+    state = json.loads((model_dir / "parser.json").read_text())
+    assert state["dedup"] == "exact"
+    assert all(name and summary
+               for name, summary in state["subtopics"].values())
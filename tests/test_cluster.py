@@ -1,31 +1,69 @@
+import json
+
+import numpy as np
 import pandas as pd
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from utils import Cluster
+from utils.cluster import (
+    MANIFEST_FILE,
+    MIN_SAMPLE_SIZE,
+    SENTENCES_FILE,
+    auto_sample_size,
+    sample_indices,
+)
+
+class FakeReducer:
+    # picklable stand-in for a fitted UMAP model holding its training data
+    def __init__(self, raw_data):
+        self._raw_data = raw_data
+
+class FakeTopicModel:
+    # picklable stand-in for a fitted BERTopic model
+    def __init__(self, raw_data):
+        self.embedding_model = None
+        self.umap_model = FakeReducer(raw_data)
+        self.topics_ = [0, 1, -1]
+
+def make_fitted_cluster(cluster):
+    cluster.sentences = ["a", "b", "c"]
+    cluster.seeds = None
+    cluster.embeddings = np.arange(6, dtype=np.float32).reshape(3, 2)
+    cluster.pending_outliers = [2]
+    cluster.topic_model = FakeTopicModel(cluster.embeddings)
+    cluster.hierarchy = pd.DataFrame({
+        "Parent_ID": [10], "Parent_Name": ["Parent"], "Topics": [[0, 1]]
+    })
+    return cluster
 
 def test_cluster_with_no_sentences():
     cluster = Cluster(sentences=[])
 
     assert cluster.topic_model is None
+    assert cluster.hierarchy is None
 
-def test_package_model_data(monkeypatch):
-    cluster = Cluster.__new__(Cluster)  # bypass __init__
+def test_package_model_data(monkeypatch, bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["doc0", "doc1", "doc2", "doc3", "doc4", "doc5"]
 
     mock_topic_model = MagicMock()
 
     # Fake topic info table
     topic_info = pd.DataFrame({
         "Topic": [0, 1, -1],
-        "Name": ["Topic A", "Topic B", "Outliers"]
+        "Name": ["Topic A", "Topic B", "Outliers"],
+        "Count": [5, 3, 10]
     })
 
     mock_topic_model.get_topic_info.return_value = topic_info
-    mock_topic_model.get_topic_freq.side_effect = lambda t: {0: 5, 1: 3}[t]
-    mock_topic_model.get_topic.return_value = [("word1", 0.2), ("word2", 0.1)]
-    mock_topic_model.get_representative_docs.return_value = [
-        "doc1", "doc2", "doc3", "doc4", "doc5"
-    ]
+    mock_topic_model.get_topics.return_value = {
+        t: [("word1", 0.2), ("word2", 0.1)] for t in (-1, 0, 1)
+    }
+    mock_topic_model.representative_docs_ = {
+        0: ["doc1", "doc2", "doc3", "doc4", "doc5"],
+        1: ["doc0"]
+    }
 
     cluster.topic_model = mock_topic_model
 
@@ -40,8 +78,30 @@ def test_package_model_data(monkeypatch):
     assert data[0]["tags"] == ["word1", "word2"]
     assert len(data[0]["feedback"]) == 4
 
-def test_get_subtopic_id():
-    cluster = Cluster.__new__(Cluster)
+    # topic data is extracted once and memoized
+    cluster.package_model_data()
+    assert mock_topic_model.get_topic_info.call_count == 1
+    assert cluster.topic_table.loc[0, "rep_doc_idx"] == [1, 2, 3, 4, 5]
+    assert cluster.topic_table.loc[1, "rep_doc_idx"] == [0]
+
+def test_topic_table_counts_deduplicated_rows(bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["doc0", "doc1", "doc2"]
+    # doc0 stands for 3 rows, doc2 (an outlier) for 2
+    cluster.weights = np.array([3, 1, 2])
+    model = MagicMock()
+    model.topics_ = [0, 1, -1]
+    model.get_topic_info.return_value = pd.DataFrame({
+        "Topic": [-1, 0, 1], "Name": ["-1", "0_a", "1_b"],
+        "Count": [1, 1, 1]})
+    model.get_topics.return_value = {}
+    model.representative_docs_ = {}
+    cluster.topic_model = model
+
+    assert cluster.topic_table["count"].to_dict() == {0: 3, 1: 1}
+
+def test_get_subtopic_id(bare_cluster):
+    cluster = bare_cluster
 
     cluster.topic_model = MagicMock()
     cluster.topic_model.topics_ = [0, 1, 1, 0]
@@ -53,8 +113,8 @@ def test_get_subtopic_id():
     assert result["a"] == 0
     assert result["b"] == 1
 
-def test_assign_topic_returns_parent_name():
-    cluster = Cluster.__new__(Cluster)
+def test_assign_topic_returns_parent_name(bare_cluster):
+    cluster = bare_cluster
 
     cluster.hierarchy = pd.DataFrame({
         "Topics": [[1, 2], [2], [1]],
@@ -66,8 +126,8 @@ def test_assign_topic_returns_parent_name():
 
     assert result == "Parent C"
 
-def test_assign_topic_returns_none_if_not_found():
-    cluster = Cluster.__new__(Cluster)
+def test_assign_topic_returns_none_if_not_found(bare_cluster):
+    cluster = bare_cluster
 
     cluster.hierarchy = pd.DataFrame({
         "Topics": [[2], [3]],
@@ -75,4 +135,241 @@ def test_assign_topic_returns_none_if_not_found():
         "Parent_Name": ["A", "B"]
     })
 
-    assert cluster.assign_topic(999) is None
\ No newline at end of file
+    assert cluster.assign_topic(999) is None
+
+
+def test_assign_topic_ties_break_on_parent_id(bare_cluster):
+    cluster = bare_cluster
+
+    cluster.hierarchy = pd.DataFrame({
+        "Topics": [[1, 2, 3], [1, 4], [1, 2], [2, 3]],
+        "Parent_ID": [30, 40, 20, 10],
+        "Parent_Name": ["Root", "Parent D", "Parent B", "Parent A"]
+    })
+
+    assert cluster.assign_topic(1) == "Parent B"
+    assert cluster.assign_topic(2) == "Parent A"
+    assert cluster.assign_topic(4) == "Parent D"
+
+def test_assign_topics_resolves_many_ids(bare_cluster):
+    cluster = bare_cluster
+
+    cluster.hierarchy = pd.DataFrame({
+        "Topics": [[1, 2], [2], [1]],
+        "Parent_ID": [10, 20, 5],
+        "Parent_Name": ["Parent A", "Parent B", "Parent C"]
+    })
+
+    assert cluster.assign_topics([1, 2, 999]) == {
+        1: "Parent C", 2: "Parent B", 999: None
+    }
+
+def test_update_assigns_new_sentences_and_reports_changes(bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["a", "b", "c"]
+    cluster.embeddings = np.zeros((3, 2), dtype=np.float32)
+    cluster.pending_outliers = []
+    cluster.emb_cache = None
+    cluster.st_model = MagicMock()
+    cluster.st_model.encode.return_value = np.ones((2, 2), dtype=np.float32)
+
+    model = MagicMock()
+    model.topics_ = [0, 0, 1]
+    model.transform.return_value = ([1, -1], None)
+    model.get_topic_info.side_effect = [
+        pd.DataFrame({"Topic": [0, 1], "Name": ["0_a", "1_c"],
+                      "Count": [20, 10]}),
+        pd.DataFrame({"Topic": [-1, 0, 1], "Name": ["-1", "0_a", "1_c"],
+                      "Count": [1, 20, 11]}),
+    ]
+    model.get_topics.return_value = {}
+    model.representative_docs_ = {}
+    cluster.topic_model = model
+
+    with patch("bertopic.backend._utils.select_backend"):
+        changed = cluster.update(["d", "e"])
+
+    # only topic 1 grew (by 10%), so only it is reported as changed
+    assert changed == {1}
+    assert cluster.sentences == ["a", "b", "c", "d", "e"]
+    assert cluster.embeddings.shape == (5, 2)
+    assert cluster.pending_outliers == [4]
+    assert model.update_topics.call_args.kwargs["topics"] == [0, 0, 1, 1, -1]
+    cluster.st_model.encode.assert_called_once()
+    # the embedder is only attached to the topic model during the update
+    assert model.embedding_model is None
+
+def test_save_and_load_round_trip(tmp_path, bare_cluster):
+    cluster = make_fitted_cluster(bare_cluster)
+
+    cluster.save(tmp_path)
+    loaded = Cluster.load(tmp_path, use_cache=False, encode_workers=2)
+
+    assert loaded.sentences == ["a", "b", "c"]
+    assert loaded.encode_workers == 2
+    assert loaded.pending_outliers == [2]
+    assert loaded.topic_model.topics_ == [0, 1, -1]
+    np.testing.assert_array_equal(loaded.embeddings, cluster.embeddings)
+    # reducer data is stored once, out-of-band, and reattached on load
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert manifest["detached"] == {"umap": 3}
+    np.testing.assert_array_equal(loaded.topic_model.umap_model._raw_data,
+                                  cluster.embeddings)
+    assert loaded.assign_topic(1) == "Parent"
+    # saving leaves the in-memory model intact
+    assert cluster.topic_model.umap_model._raw_data is cluster.embeddings
+
+def test_save_and_load_keeps_weights(tmp_path, bare_cluster):
+    cluster = make_fitted_cluster(bare_cluster)
+    cluster.weights = np.array([2, 1, 4])
+
+    cluster.save(tmp_path)
+    loaded = Cluster.load(tmp_path, use_cache=False)
+
+    np.testing.assert_array_equal(loaded.weights, [2, 1, 4])
+
+def test_load_restores_quantized_encoder(tmp_path, bare_cluster):
+    cluster = make_fitted_cluster(bare_cluster)
+    cluster.quantize = True
+
+    cluster.save(tmp_path)
+    loaded = Cluster.load(tmp_path)
+
+    # sentences added later are encoded by the same int8 model
+    assert loaded.quantize
+    assert loaded.emb_cache.model_name.endswith("-int8")
+
+def test_load_rejects_other_artifact_version(tmp_path, bare_cluster):
+    make_fitted_cluster(bare_cluster).save(tmp_path)
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    manifest["version"] = 0
+    (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError):
+        Cluster.load(tmp_path)
+
+def test_load_rejects_sentences_changed_since_save(tmp_path, bare_cluster):
+    make_fitted_cluster(bare_cluster).save(tmp_path)
+    sentences = json.loads((tmp_path / SENTENCES_FILE).read_text())
+    sentences[0] = "edited feedback"
+    (tmp_path / SENTENCES_FILE).write_text(json.dumps(sentences))
+
+    with pytest.raises(ValueError):
+        Cluster.load(tmp_path)
+
+def test_load_missing_run_dir_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Cluster.load(tmp_path / "missing")
+
+def test_auto_sample_size_fits_small_corpora_whole():
+    assert auto_sample_size(1_000) == 1_000
+    # a very large corpus is capped by the budget, but never below minimum
+    size = auto_sample_size(10_000_000)
+    assert MIN_SAMPLE_SIZE <= size < 10_000_000
+    assert auto_sample_size(10_000_000, dim=10 ** 6) == MIN_SAMPLE_SIZE
+
+def test_stratified_sample_covers_short_and_long_feedback():
+    sentences = ["short"] * 900 + ["a much longer piece of feedback"] * 100
+
+    idx = sample_indices(sentences, 100)
+
+    assert len(idx) == 100
+    assert len(set(idx)) == 100 and list(idx) == sorted(idx)
+    # long feedback is 10% of rows, so roughly 10% of the sample
+    assert sum(1 for i in idx if i >= 900) == 10
+
+def test_sample_indices_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        sample_indices(["a", "b", "c"], 2, strategy="other")
+
+def test_assign_remaining_covers_full_corpus(bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["a", "b", "c", "d", "e"]
+    cluster.fit_index = np.array([0, 2, 4])
+    cluster.embeddings = np.zeros((3, 2), dtype=np.float32)
+    cluster.emb_cache = None
+    cluster.st_model = MagicMock()
+    cluster.st_model.encode.return_value = np.ones((2, 2), dtype=np.float32)
+    model = MagicMock()
+    model.topics_ = [0, 1, 1]
+    model.transform.return_value = ([1, -1], None)
+    cluster.topic_model = model
+
+    with patch("bertopic.backend._utils.select_backend"):
+        cluster._assign_remaining()
+
+    # only the rows left out of the sample are encoded and assigned
+    cluster.st_model.encode.assert_called_once()
+    assert model.transform.call_args.args[0] == ["b", "d"]
+    assert model.update_topics.call_args.kwargs["topics"] == [0, 1, 1, -1, 1]
+    assert cluster.embeddings.shape == (5, 2)
+    np.testing.assert_array_equal(cluster.embeddings[1], [1, 1])
+
+def test_large_inputs_encode_on_worker_pool(bare_cluster):
+    cluster = bare_cluster
+    cluster.emb_cache = None
+    cluster.encode_workers = 3
+    cluster.st_model = MagicMock()
+
+    with patch("utils.cluster.POOL_MIN_ROWS", 2), \
+            patch("utils.cluster.EncodePool") as MockPool:
+        pool = MockPool.return_value.__enter__.return_value
+        pool.encode.return_value = np.ones((2, 4), dtype=np.float32)
+        embeddings = cluster._encode(["a", "b"])
+        # below the threshold, encoding stays in-process
+        cluster._encode(["c"])
+
+    assert embeddings.shape == (2, 4)
+    assert MockPool.call_args.kwargs["n_workers"] == 3
+    pool.encode.assert_called_once_with(["a", "b"])
+    cluster.st_model.encode.assert_called_once()
+
+
+def test_fit_steps_are_profiled_as_their_own_stages():
+    from utils.profiler import Profiler, use_profiler
+
+    class FakeBERTopic:
+        def _reduce_dimensionality(self, embeddings):
+            return embeddings
+
+        def _cluster_embeddings(self, embeddings):
+            return embeddings
+
+    model = FakeBERTopic()
+    with use_profiler(Profiler(enabled=True)) as profiler:
+        # timed even with no progress listener
+        with Cluster._fit_stages(model, n_rows=10):
+            model._reduce_dimensionality(None)
+            model._cluster_embeddings(None)
+    report = profiler.report()
+
+    assert report["cluster.reduce"]["items"] == 10
+    assert report["cluster.hdbscan"]["calls"] == 1
+    assert "_cluster_embeddings" not in vars(model)
+
+def test_assign_remaining_reuses_one_worker_pool(bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["a", "b", "c", "d", "e", "f", "g"]
+    cluster.fit_index = np.array([0, 2])
+    cluster.embeddings = np.zeros((2, 2), dtype=np.float32)
+    cluster.emb_cache = None
+    cluster.encode_workers = 3
+    cluster.st_model = MagicMock()
+    model = MagicMock()
+    model.topics_ = [0, 1]
+    model.transform.side_effect = lambda s, e: ([0] * len(s), None)
+    cluster.topic_model = model
+
+    with patch("utils.cluster.POOL_MIN_ROWS", 2), \
+            patch("utils.cluster.ASSIGN_CHUNK_SIZE", 2), \
+            patch("utils.cluster.EncodePool") as MockPool, \
+            patch("bertopic.backend._utils.select_backend"):
+        pool = MockPool.return_value.__enter__.return_value
+        pool.encode.side_effect = lambda s: np.ones((len(s), 2),
+                                                    dtype=np.float32)
+        cluster._assign_remaining()
+
+    # every chunk, even the last one below the threshold, uses one pool
+    MockPool.assert_called_once()
+    assert pool.encode.call_count == 3
+    cluster.st_model.encode.assert_not_called()
@@ -34,4 +34,45 @@ def test_load_invalid_extension_raises_value_error(tmp_path):
     loader = CSVLoader(str(txt_file))
 
     with pytest.raises(ValueError, match="Invalid file type"):
-        loader.load()
\ No newline at end of file
+        loader.load()
+def test_load_selected_columns_as_strings(tmp_path):
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("id,text,score\n1,hello,3\n2,bye,4")
+
+    loader = CSVLoader(str(csv_file))
+    df = loader.load(columns=["text"])
+
+    assert loader.get_columns() == ["id", "text", "score"]
+    assert list(df.columns) == ["text"]
+    assert pd.api.types.is_string_dtype(df["text"])
+    assert df["text"].tolist() == ["hello", "bye"]
+
+def test_iter_chunks_streams_rows(tmp_path):
+    csv_file = tmp_path / "data.csv"
+    rows = "\n".join(f"{i},text {i}" for i in range(5))
+    csv_file.write_text("id,text\n" + rows)
+
+    chunks = list(CSVLoader(str(csv_file)).iter_chunks(["text"], chunksize=2))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert chunks[-1]["text"].tolist() == ["text 4"]
+
+def test_load_jsonl_and_parquet(tmp_path):
+    df = pd.DataFrame({"text": ["hello", "bye", "ok"], "n": [1, 2, 3]})
+    jsonl_file = tmp_path / "data.jsonl"
+    df.to_json(jsonl_file, orient="records", lines=True)
+
+    jsonl = CSVLoader(str(jsonl_file))
+    assert jsonl.get_columns() == ["text", "n"]
+    assert jsonl.load(columns=["text"])["text"].tolist() == ["hello", "bye",
+                                                             "ok"]
+    assert [len(c) for c in jsonl.iter_chunks(chunksize=2)] == [2, 1]
+
+    pytest.importorskip("pyarrow")
+    parquet_file = tmp_path / "data.parquet"
+    df.to_parquet(parquet_file)
+
+    parquet = CSVLoader(str(parquet_file))
+    assert parquet.get_columns() == ["text", "n"]
+    assert list(parquet.load(columns=["text"]).columns) == ["text"]
+    assert [len(c) for c in parquet.iter_chunks(chunksize=2)] == [2, 1]
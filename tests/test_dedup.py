@@ -0,0 +1,63 @@
+import numpy as np
+
+from utils.dedup import Deduplicator, dedup_key, minhash_signatures
+
+
+def test_dedup_key_ignores_case_space_and_punctuation():
+    assert dedup_key("  Great   product! ") == dedup_key("great product")
+    assert dedup_key("great product") != dedup_key("good product")
+
+
+def test_exact_duplicates_collapse_with_weights():
+    texts = ["Great product", "Bad battery", "great product!", "Great product"]
+    dedup = Deduplicator(texts)
+
+    assert dedup.unique == ["Great product", "Bad battery"]
+    np.testing.assert_array_equal(dedup.weights, [3, 1])
+    np.testing.assert_array_equal(dedup.inverse, [0, 1, 0, 0])
+    assert dedup.saved_share == 0.5
+    # per-unique results expand back to every row
+    assert dedup.expand(["POS", "NEG"]).tolist() == ["POS", "NEG", "POS",
+                                                     "POS"]
+
+
+def test_append_returns_only_new_unique_texts():
+    dedup = Deduplicator(["a b", "c d"])
+
+    new = dedup.append(["C D", "e f"])
+
+    assert new == ["e f"]
+    np.testing.assert_array_equal(dedup.weights, [1, 2, 1])
+    assert dedup.n_rows == 4
+
+
+def test_near_duplicates_merge_into_earliest_text():
+    base = "the battery drains far too quickly when the screen is on"
+    texts = ["shipping was slow", base, base + " today",
+             "love the colour of the case"]
+    dedup = Deduplicator(texts, near=True)
+
+    assert dedup.unique == ["shipping was slow", base,
+                            "love the colour of the case"]
+    np.testing.assert_array_equal(dedup.weights, [1, 2, 1])
+    np.testing.assert_array_equal(dedup.inverse, [0, 1, 1, 2])
+
+
+def test_minhash_signatures_match_for_identical_texts():
+    signatures = minhash_signatures(["same words here", "Same words here",
+                                     ""])
+
+    np.testing.assert_array_equal(signatures[0], signatures[1])
+    # texts without shingles never collide with anything
+    assert (signatures[2] == np.iinfo(np.uint64).max).all()
+
+
+def test_saved_state_appends_like_the_original(tmp_path):
+    dedup = Deduplicator(["a b", "c d", "A B!"])
+    dedup.save(tmp_path / "dedup.npz")
+
+    restored = Deduplicator.load(tmp_path / "dedup.npz", dedup.unique)
+
+    assert restored.append(["a b", "e f"]) == ["e f"]
+    np.testing.assert_array_equal(restored.weights, [3, 1, 1])
+    assert restored.n_rows == 5
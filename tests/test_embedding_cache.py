@@ -0,0 +1,91 @@
+import numpy as np
+
+from utils import EmbeddingCache
+from utils.embedding_cache import VECTORS_FILE
+
+
+def fake_encoder(calls):
+    # encode each text as a vector derived from its length, recording input
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+    return encode
+
+
+def test_only_unseen_texts_are_encoded(tmp_path):
+    calls = []
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path)
+
+    first = cache.get_or_encode(["hello", "world!", "hello"],
+                                fake_encoder(calls))
+    assert first.shape == (3, 3)
+    assert calls == [["hello", "world!"]]  # duplicate encoded once
+
+    # a new cache object reads the persisted store from disk
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path)
+    second = cache.get_or_encode(["world!", "  hello ", "new text"],
+                                 fake_encoder(calls))
+    assert calls[-1] == ["new text"]  # normalized "hello" is a hit
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[1], first[0])
+    assert len(cache) == 3
+
+
+def test_model_change_invalidates_store(tmp_path):
+    calls = []
+    EmbeddingCache("model-a", cache_dir=tmp_path).get_or_encode(
+        ["hello"], fake_encoder(calls))
+
+    cache = EmbeddingCache("model-b", cache_dir=tmp_path)
+    cache.get_or_encode(["hello"], fake_encoder(calls))
+
+    assert calls == [["hello"], ["hello"]]
+    assert len(cache) == 1
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    calls = []
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path, max_rows=2)
+    cache.get_or_encode(["a"], fake_encoder(calls))
+    cache.get_or_encode(["bb"], fake_encoder(calls))
+    cache.get_or_encode(["a"], fake_encoder(calls))
+    out = cache.get_or_encode(["ccc"], fake_encoder(calls))
+
+    assert len(cache) == 2
+    assert out[0, 0] == 3
+    # "bb" was least recently used, so it must be encoded again
+    cache.get_or_encode(["a", "bb"], fake_encoder(calls))
+    assert calls[-1] == ["bb"]
+
+
+def test_uncommitted_rows_are_dropped_on_load(tmp_path):
+    calls = []
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path)
+    first = cache.get_or_encode(["a", "bb"], fake_encoder(calls))
+    # a crash mid-append leaves vectors past the committed rows
+    with open(tmp_path / VECTORS_FILE, "ab") as f:
+        f.write(np.full((4, 3), 9, dtype=np.float32).tobytes())
+
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path)
+    cache.get_or_encode(["ccc"], fake_encoder(calls))
+    out = EmbeddingCache("model-a", cache_dir=tmp_path).get_or_encode(
+        ["a", "bb", "ccc"], fake_encoder(calls))
+
+    np.testing.assert_array_equal(out[:2], first)
+    assert out[2, 0] == 3
+    assert calls[-1] == ["ccc"]
+
+
+def test_recency_persists_across_instances(tmp_path):
+    calls = []
+    EmbeddingCache("model-a", cache_dir=tmp_path, max_rows=2).get_or_encode(
+        ["a", "bb"], fake_encoder(calls))
+    EmbeddingCache("model-a", cache_dir=tmp_path, max_rows=2).get_or_encode(
+        ["a"], fake_encoder(calls))
+    EmbeddingCache("model-a", cache_dir=tmp_path, max_rows=2).get_or_encode(
+        ["ccc"], fake_encoder(calls))
+
+    # "a" was touched by the second instance, so "bb" was evicted
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path, max_rows=2)
+    cache.get_or_encode(["a", "bb"], fake_encoder(calls))
+    assert calls[-1] == ["bb"]
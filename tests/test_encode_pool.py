@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.encode_pool import EncodePool
+
+
+class FakeEncoder:
+    # picklable stand-in for a sentence transformer, loaded in each worker
+    def encode(self, sentences, **kwargs):
+        if "boom" in sentences:
+            raise RuntimeError("encoding failed")
+        threads = int(os.environ["OMP_NUM_THREADS"])
+        return np.array([[len(s), threads] for s in sentences],
+                        dtype=np.float32)
+
+
+def test_pool_encodes_chunks_in_order():
+    sentences = [f"sentence {'x' * i}" for i in range(25)]
+
+    done = []
+    with EncodePool(FakeEncoder, n_workers=2, threads=3,
+                    chunk_size=4, on_chunk=done.append) as pool:
+        embeddings = pool.encode(sentences)
+
+    assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings[:, 0],
+                                  [len(s) for s in sentences])
+    # every worker ran with its pinned thread count
+    assert (embeddings[:, 1] == 3).all()
+    # every chunk was reported as it completed
+    assert sorted(done) == [1] + [4] * 6
+    assert pool.pool is None
+
+
+def test_pool_shuts_down_on_error():
+    pool = EncodePool(FakeEncoder, n_workers=2, threads=1, chunk_size=2)
+    with pytest.raises(RuntimeError, match="encoding failed"):
+        with pool:
+            pool.encode(["a", "b", "boom", "c"])
+
+    assert pool.pool is None
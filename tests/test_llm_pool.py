@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+
+from utils.llm_pool import LLMPool
+from utils.summary import SUMMARY_ERROR, Summary, _bundle_messages
+
+
+class FakeGenerator:
+    # picklable stand-in for the chat pipeline, loaded in each replica
+    def __call__(self, batch, **kwargs):
+        outputs = []
+        for messages in batch:
+            prompt = messages[-1]["content"][0]["text"]
+            if prompt == "fail":
+                raise RuntimeError("generation failed")
+            reply = f"{prompt.upper()} by {os.getpid()} " \
+                f"on {os.environ['OMP_NUM_THREADS']}"
+            outputs.append([{"generated_text": messages + [
+                {"role": "assistant", "content": reply}]}])
+        return outputs
+
+
+def test_replicas_drain_queue_and_reply_by_id():
+    jobs = {f"job{i}": _bundle_messages(f"p{i}") for i in range(12)}
+    jobs["bad"] = _bundle_messages("fail")
+
+    with LLMPool(FakeGenerator, n_replicas=2, threads=3,
+                 batch_size=4) as pool:
+        received = []
+        replies = pool.generate(jobs, lambda job_id, tokens:
+                                received.append(job_id))
+
+    assert set(replies) == set(jobs)
+    assert replies["job7"].startswith("P7 by ")
+    assert replies["job7"].endswith("on 3")
+    # a failing prompt only fails its own job, not its batch
+    assert replies["bad"] is None
+    # each reply was reported as it arrived
+    assert sorted(received) == sorted(jobs)
+    assert pool.workers == []
+
+
+def test_summary_generates_on_replicas_in_item_order():
+    summary = Summary(use_cache=False, replicas=2)
+    summary._pool = LLMPool(FakeGenerator, n_replicas=2, threads=1)
+    try:
+        outputs = summary.get_outputs([("a", "first"), ("b", "fail"),
+                                       ("c", "third")])
+    finally:
+        summary.close()
+
+    assert outputs[0].startswith("FIRST")
+    assert outputs[1] == SUMMARY_ERROR
+    assert outputs[2].startswith("THIRD")
+    assert summary._pool is None
+
+
+def test_pool_raises_if_replica_dies():
+    # the replica exits while loading its model
+    pool = LLMPool(sys.exit, n_replicas=1)
+    with pytest.raises(RuntimeError, match="exited unexpectedly"), \
+            pytest.MonkeyPatch.context() as mp:
+        mp.setattr("utils.llm_pool.POLL_S", 0.5)
+        pool.generate({"job": _bundle_messages("p")})
+
+    assert pool.workers == []
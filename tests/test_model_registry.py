@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock
+
+from utils.model_registry import ModelRegistry, model_size_mb
+
+class FakeTensor:
+    def __init__(self, mb):
+        self.mb = mb
+
+    def numel(self):
+        return self.mb * 1024 ** 2
+
+    def element_size(self):
+        return 1
+
+class FakeModel:
+    # stand-in for a torch module holding mb megabytes of weights
+    def __init__(self, mb):
+        self.weights = [FakeTensor(mb)]
+
+    def parameters(self):
+        return iter(self.weights)
+
+def test_model_loaded_once_and_reused():
+    registry = ModelRegistry(budget_mb=100)
+    loader = MagicMock(side_effect=lambda: FakeModel(10))
+
+    first = registry.get("a", loader)
+    second = registry.get("a", loader)
+
+    assert first is second
+    loader.assert_called_once()
+    assert registry.loaded_mb() == 10
+
+def test_least_recently_used_model_evicted_over_budget():
+    registry = ModelRegistry(budget_mb=50)
+    registry.get("a", lambda: FakeModel(20))
+    registry.get("b", lambda: FakeModel(20))
+    registry.get("a", lambda: FakeModel(20))  # a is now most recently used
+
+    registry.get("c", lambda: FakeModel(20))
+
+    assert "b" not in registry
+    assert "a" in registry and "c" in registry
+
+def test_expected_size_evicts_before_loading():
+    registry = ModelRegistry(budget_mb=50)
+    registry.get("a", lambda: FakeModel(20))
+
+    def loader():
+        # the old model must already be gone when the large one loads
+        assert "a" not in registry
+        return FakeModel(40)
+
+    registry.get("b", loader, size_mb=40)
+
+    assert "b" in registry
+
+def test_model_over_budget_is_still_kept():
+    registry = ModelRegistry(budget_mb=10)
+
+    model = registry.get("a", lambda: FakeModel(20))
+
+    assert registry.get("a", MagicMock()) is model
+
+def test_model_size_of_pipeline_and_plain_object():
+    pipe = MagicMock(spec=["model"])
+    pipe.model = FakeModel(3)
+
+    assert model_size_mb(pipe) == 3
+    assert model_size_mb(object()) == 0
+
+def test_onnx_session_counts_toward_budget():
+    from utils.onnx_backend import OnnxSentimentPipeline
+    registry = ModelRegistry(budget_mb=50)
+    registry.get("onnx", lambda: OnnxSentimentPipeline(
+        None, None, [], [], size_mb=30))
+
+    assert registry.loaded_mb() == 30
+    # the session holds no torch tensors, yet makes room like any model
+    registry.get("b", lambda: FakeModel(30))
+    assert "onnx" not in registry
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from utils import Sentiment
+from utils.model_registry import get_registry
+from utils.onnx_backend import (
+    ONNX_META_FILE,
+    OnnxSentimentPipeline,
+    OnnxTokenizer,
+    get_onnx_sentiment_pipeline,
+    onnx_model_dir,
+)
+
+VOCAB = {"[PAD]": 0, "[UNK]": 1, "great": 2, "bad": 3, "product": 4}
+LABELS = ["NEGATIVE", "NEUTRAL", "POSITIVE"]
+
+
+def make_tokenizer(max_length=512):
+    tokenizer = Tokenizer(WordLevel(VOCAB, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    return OnnxTokenizer(tokenizer, pad_id=0, max_length=max_length)
+
+
+class FakeSession:
+    # scores "great" as positive and "bad" as negative, like a classifier
+    def __init__(self):
+        self.feeds = []
+
+    def run(self, outputs, feed):
+        self.feeds.append(feed)
+        ids = feed["input_ids"]
+        logits = np.zeros((len(ids), 3), dtype=np.float32)
+        logits[:, 0] = (ids == 3).sum(axis=1) * 2
+        logits[:, 2] = (ids == 2).sum(axis=1) * 2
+        return [logits]
+
+
+def test_tokenizer_pads_batches_and_counts_tokens():
+    tokenizer = make_tokenizer(max_length=3)
+
+    batch = tokenizer.pad_batch(["great product", "bad"])
+
+    np.testing.assert_array_equal(batch["input_ids"], [[2, 4], [3, 0]])
+    np.testing.assert_array_equal(batch["attention_mask"], [[1, 1], [1, 0]])
+    assert batch["input_ids"].dtype == np.int64
+    # truncated like the torch pipeline
+    assert tokenizer(["great great great great"])["input_ids"] == [[2, 2, 2]]
+
+
+def test_pipeline_matches_transformers_output_format():
+    session = FakeSession()
+    pipe = OnnxSentimentPipeline(session, make_tokenizer(), LABELS,
+                                 ["input_ids", "attention_mask"])
+
+    results = pipe(["great product", "bad", "product"], batch_size=2)
+
+    assert [r["label"] for r in results] == ["POSITIVE", "NEGATIVE",
+                                             "NEGATIVE"]
+    assert results[0]["score"] == pytest.approx(
+        np.exp(2) / (np.exp(2) + 2))
+    # ties keep the first label, as argmax does in transformers
+    assert results[2]["score"] == pytest.approx(1 / 3)
+    assert len(session.feeds) == 2
+    assert set(session.feeds[0]) == {"input_ids", "attention_mask"}
+    assert pipe("great") == [results[0]]
+
+
+def test_cached_export_is_reused(tmp_path):
+    model_dir = onnx_model_dir("org/model", quantize=True)
+    assert model_dir.name == "org--model-int8"
+    model_dir.mkdir(parents=True)
+    (model_dir / ONNX_META_FILE).write_text("{}")
+
+    with patch("utils.onnx_backend.export_onnx") as export, \
+            patch.object(OnnxSentimentPipeline, "from_dir") as from_dir:
+        get_onnx_sentiment_pipeline("org/model", quantize=True, threads=2)
+
+    export.assert_not_called()
+    from_dir.assert_called_once_with(model_dir, 2)
+
+
+@patch("utils.sentiment.get_onnx_sentiment_pipeline")
+def test_sentiment_selects_onnx_backend(mock_loader):
+    mock_loader.return_value = OnnxSentimentPipeline(
+        FakeSession(), make_tokenizer(), LABELS,
+        ["input_ids", "attention_mask"])
+
+    smt = Sentiment(use_cache=False, backend="onnx", threads=4)
+    results = smt.get_batch_sentiment(["bad product", "", "great"])
+
+    assert [r["label"] for r in results] == ["NEGATIVE", "NEUTRAL",
+                                             "POSITIVE"]
+    mock_loader.assert_called_once_with(
+        "tabularisai/multilingual-sentiment-analysis", False, 4)
+    assert "tabularisai/multilingual-sentiment-analysis-onnx" in \
+        get_registry()
+
+
+def test_sentiment_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        Sentiment(backend="tensorrt")
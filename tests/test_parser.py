@@ -29,10 +29,17 @@ def parser_fixture():
             "Needs improvement": {"label": "NEGATIVE", "score": 0.8},
             "Average experience": {"label": "NEUTRAL", "score": 0.5}
         }[fb]
+        # Mock Sentiment.get_batch_sentiment via the single-item mock
+        mock_smt.get_batch_sentiment.side_effect = lambda fbs, **kwargs: [
+            mock_smt.get_feedback_sentiment(fb) for fb in fbs
+        ]
 
         # Mock Summary.get_output
         mock_summary = MockSummary.return_value
         mock_summary.get_output.side_effect = lambda name, prompt: f"Summary for {name}"
+        mock_summary.get_outputs.side_effect = lambda items: [
+            f"Summary for {name}" for name, _ in items
+        ]
 
         # Mock Cluster methods
         mock_cluster = MockCluster.return_value
@@ -40,9 +47,14 @@ def parser_fixture():
             1: {"id": 1, "name": "1_clusterA", "count": 1, "feedback": ["Great product"], "tags": ["tag1"]},
             2: {"id": 2, "name": "2_clusterB", "count": 1, "feedback": ["Needs improvement"], "tags": ["tag2"]}
         }
+        mock_cluster.get_subtopic_id.side_effect = lambda ind: pd.Series(
+            [1, 2, -1], index=ind)
         mock_cluster.assign_topic.side_effect = lambda st_id: "Topic1" if st_id in [1, 2] else "Topic2"
+        mock_cluster.assign_topics.side_effect = lambda st_ids: {
+            st_id: mock_cluster.assign_topic(st_id) for st_id in st_ids
+        }
 
-        parser = Parser(SAMPLE_DF, col_name="feedback")
+        parser = Parser(SAMPLE_DF.copy(), col_name="feedback")
         parser.cluster = mock_cluster  # <<< important: assign mocked cluster
         yield parser
 
@@ -102,3 +114,161 @@ def test_get_summary(parser_fixture):
     assert "Number of Responses" in df_summary.columns
     assert "Summary" in df_summary.columns
     assert df_summary.shape[0] == 2
+
+
+def test_build_subtopics_scores_every_row(parser_fixture):
+    # subtopic 1 now holds two rows, only one of which is a representative doc
+    parser_fixture.cluster.get_subtopic_id.side_effect = lambda ind: pd.Series(
+        [1, 2, 1], index=ind)
+    parser_fixture._build_subtopics()
+
+    df = parser_fixture.df
+    assert list(df["smt_label"]) == ["POSITIVE", "NEGATIVE", "NEUTRAL"]
+    assert list(df["subtopic_id"]) == [1, 2, 1]
+    assert parser_fixture.subtopics[1].sentiment == {"POSITIVE": 1,
+                                                      "NEUTRAL": 1}
+
+
+def test_build_subtopic_info_single_pass(parser_fixture):
+    parser_fixture.single_pass = True
+    parser_fixture._build_subtopics()
+    # first subtopic returns parsable JSON, second falls back to two prompts
+    combined = iter([
+        '{"name": "Great Products", "summary": "Users like it."}',
+        "unstructured reply",
+    ])
+    parser_fixture.summary.get_outputs.side_effect = lambda items: [
+        next(combined) if "JSON" in prompt else f"Summary for {name}"
+        for name, prompt in items
+    ]
+    parser_fixture._build_subtopic_info()
+
+    assert parser_fixture.subtopics[1].read_name == "Great Products"
+    assert parser_fixture.subtopics[1].summary == "Users like it."
+    assert parser_fixture.subtopics[2].read_name == "Summary for clusterB"
+    assert parser_fixture.summary.get_outputs.call_count == 2
+    # the fallback only covers the subtopic whose output failed to parse
+    assert len(parser_fixture.summary.get_outputs.call_args.args[0]) == 2
+
+
+def test_save_writes_perf_report(parser_fixture, tmp_path):
+    from utils.profiler import Profiler, get_profiler
+    profiler = Profiler(enabled=True)
+    parser_fixture.profiler = profiler
+    installed = []
+    parser_fixture.summary.close.side_effect = lambda: installed.append(
+        get_profiler())
+
+    parser_fixture.build_data_structures()
+    parser_fixture.process_llm()
+    parser_fixture.save(str(tmp_path / "out.csv"))
+
+    report = (tmp_path / "out.perf.json").read_text()
+    assert "parser.build_data_structures" in report
+    assert "parser.save" in report
+    # installed for model calls during a stage only, not for later parsers
+    assert installed == [profiler]
+    assert get_profiler() is not profiler
+
+
+def test_update_only_resummarizes_changed_subtopics(parser_fixture):
+    parser_fixture.build_data_structures()
+    parser_fixture.process_llm()
+    parser_fixture.subtopics[1].summary = "Kept summary"
+
+    cluster = parser_fixture.cluster
+    cluster.update.return_value = {2}
+    cluster.get_subtopic_id.side_effect = lambda ind: pd.Series(
+        [1, 2, -1, 2], index=ind)
+    changed = parser_fixture.update(
+        pd.DataFrame({"feedback": ["Needs improvement"]}))
+
+    assert changed == {2}
+    cluster.update.assert_called_once_with(["Needs improvement"])
+    assert len(parser_fixture.df) == 4
+    assert parser_fixture.subtopics[2].sentiment == {"NEGATIVE": 2}
+    # unchanged subtopic keeps its LLM output, changed one is cleared
+    assert parser_fixture.subtopics[1].summary == "Kept summary"
+    assert parser_fixture.subtopics[2].summary is None
+
+    parser_fixture.summary.get_outputs.reset_mock()
+    parser_fixture.process_llm()
+    items = parser_fixture.summary.get_outputs.call_args.args[0]
+    assert [name for name, _ in items] == ["clusterB", "clusterB"]
+
+def test_pre_process_ml_reuses_loaded_cluster(parser_fixture):
+    with patch("processor.parser.Cluster") as MockCluster:
+        parser_fixture.cluster.sentences = SAMPLE_DF["feedback"].tolist()
+        parser_fixture.pre_process_ml()
+
+        MockCluster.assert_not_called()
+
+        parser_fixture.cluster.sentences = ["a"]
+        with pytest.raises(ValueError):
+            parser_fixture.pre_process_ml()
+
+        # same number of rows, but other feedback
+        parser_fixture.cluster.sentences = ["a", "b", "c"]
+        with pytest.raises(ValueError):
+            parser_fixture.pre_process_ml()
+
+def test_pre_process_ml_accepts_cluster_fitted_without_dedup(parser_fixture):
+    parser_fixture.df = pd.DataFrame({"feedback": [
+        "Great product", "great product!", "Needs improvement"]})
+    parser_fixture.dedup_mode = "exact"
+    parser_fixture.cluster.sentences = parser_fixture.df["feedback"].tolist()
+
+    parser_fixture.pre_process_ml()
+
+    assert parser_fixture.dedup is None
+
+def test_duplicates_reach_models_once_and_expand_to_rows(parser_fixture):
+    parser_fixture.df = pd.DataFrame({"feedback": [
+        "Great product", "great product!", "Needs improvement"]})
+    parser_fixture.cluster = None
+    parser_fixture.dedup_mode = "exact"
+    with patch("processor.parser.Cluster") as MockCluster:
+        cluster = MockCluster.return_value
+        cluster.get_subtopic_id.side_effect = lambda ind: pd.Series(
+            [1, 2, -1][:len(ind)], index=ind)
+        parser_fixture.pre_process_ml()
+
+        assert MockCluster.call_args.args[0] == ["Great product",
+                                                 "Needs improvement"]
+        assert MockCluster.call_args.kwargs["weights"].tolist() == [2, 1]
+        assert parser_fixture._get_subtopic_sentiment() == {
+            1: {"POSITIVE": 2}, 2: {"NEGATIVE": 1}}
+        assert list(parser_fixture.df["subtopic_id"]) == [1, 1, 2]
+
+        smt = parser_fixture.smt
+        smt.get_batch_sentiment.reset_mock()
+        cluster.update.return_value = set()
+        cluster.package_model_data.return_value = {}
+        parser_fixture.update(pd.DataFrame({"feedback": [
+            "Needs improvement", "Average experience"]}))
+
+    # only the new unique text is clustered and scored
+    assert cluster.update.call_args.args[0] == ["Average experience"]
+    assert cluster.update.call_args.kwargs["weights"].tolist() == [2, 2, 1]
+    smt.get_batch_sentiment.assert_called_once()
+    assert smt.get_batch_sentiment.call_args.args[0] == ["Average experience"]
+    assert list(parser_fixture.df["smt_label"]) == [
+        "POSITIVE", "POSITIVE", "NEGATIVE", "NEGATIVE", "NEUTRAL"]
+
+def test_update_with_dedup_on_real_cluster():
+    from benchmarks.stubs import stub_models
+    from benchmarks.synthetic import generate_frame
+
+    df = generate_frame(200, 0, col="feedback")
+    with stub_models():
+        parser = Parser(df.iloc[:150].reset_index(drop=True), "feedback",
+                        dedup="exact", reducer="pca")
+        parser.pre_process_ml()
+        parser.build_data_structures()
+        parser.update(df.iloc[150:])
+
+    # each new unique text is clustered once, in step with the deduplicator
+    assert parser.cluster.sentences == parser.dedup.unique
+    assert parser.cluster.sentences is not parser.dedup.unique
+    assert len(parser.cluster.topic_model.topics_) == \
+        len(parser.dedup.unique)
@@ -0,0 +1,52 @@
+import json
+
+from utils.profiler import Profiler, get_profiler, use_profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.stage("cluster.encode", items=10) as record:
+        record["items"] = 20
+
+    assert profiler.report() == {}
+
+
+def test_stages_are_aggregated_and_saved(tmp_path):
+    profiler = Profiler(enabled=True)
+    for _ in range(2):
+        with profiler.stage("summary.generate", items=1) as record:
+            record["prompt_tokens"] += 100
+            record["generated_tokens"] += 10
+
+    report = profiler.report()["summary.generate"]
+    assert report["calls"] == 2
+    assert report["items"] == 2
+    assert report["prompt_tokens"] == 200
+    assert report["generated_tokens"] == 20
+    assert report["process_peak_rss_mb"] > 0
+
+    profiler.save(tmp_path / "out.perf.json")
+    saved = json.loads((tmp_path / "out.perf.json").read_text())
+    assert saved["summary.generate"]["calls"] == 2
+
+
+def test_trace_stage_dumps_cprofile(tmp_path):
+    profiler = Profiler(enabled=True, trace_stage="cluster.umap",
+                        trace_dir=tmp_path)
+    with profiler.stage("cluster.umap"):
+        sum(range(1000))
+    with profiler.stage("cluster.hdbscan"):
+        pass
+
+    assert (tmp_path / "cluster.umap.prof").exists()
+    assert not (tmp_path / "cluster.hdbscan.prof").exists()
+
+
+def test_use_profiler_restores_previous():
+    previous = get_profiler()
+    profiler = Profiler(enabled=True)
+
+    with use_profiler(profiler):
+        assert get_profiler() is profiler
+
+    assert get_profiler() is previous
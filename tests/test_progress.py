@@ -0,0 +1,193 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from utils import Cluster, Sentiment, Summary
+from utils.progress import (
+    ProgressEvent,
+    ProgressReporter,
+    console_listener,
+    get_progress,
+    set_progress,
+)
+
+
+@pytest.fixture
+def events():
+    # install a reporter sending every update, collecting its events
+    previous = get_progress()
+    reporter = ProgressReporter(interval_s=0)
+    received = []
+    reporter.subscribe(received.append)
+    set_progress(reporter)
+    yield received
+    set_progress(previous)
+
+
+class FakeTokenizer:
+    # counts one token per word
+    def __call__(self, text, **kwargs):
+        return {"input_ids": text.split()}
+
+
+def test_event_rate_eta_and_format():
+    event = ProgressEvent(stage="cluster.encode", done=250, total=1000,
+                          elapsed_s=5.0)
+
+    assert event.fraction == 0.25
+    assert event.rate == 50.0
+    assert event.eta_s == 15.0
+    assert event.format() == ("cluster.encode: 250/1,000 rows (25%), "
+                              "50.0 rows/s, ETA 15s")
+    # nothing done yet, so no rate to estimate from
+    assert ProgressEvent("s", 0, 10, 1.0).eta_s is None
+
+
+def test_finished_event_without_total():
+    event = ProgressEvent(stage="cluster.reduce", done=600, total=None,
+                          elapsed_s=125.0, finished=True)
+
+    assert event.fraction == 1.0
+    assert event.format() == ("cluster.reduce: 600 rows, 4.8 rows/s, "
+                              "done in 2m05s")
+
+
+def test_task_sends_start_updates_and_final_event(events):
+    with get_progress().task("stage", total=4, unit="prompts") as task:
+        task.advance(3, tokens=30)
+        task.advance()
+
+    assert [(e.done, e.finished) for e in events] == [
+        (0, False), (3, False), (4, False), (4, True)]
+    assert events[-1].tokens == 30
+    assert events[-1].unit == "prompts"
+
+
+def test_updates_are_throttled():
+    reporter = ProgressReporter(interval_s=60)
+    received = []
+    with reporter.subscribed(received.append):
+        with reporter.task("stage", total=100) as task:
+            for _ in range(100):
+                task.advance()
+
+    # only the start and final events fall outside the interval
+    assert [e.done for e in received] == [0, 100]
+    assert not reporter.active
+
+
+def test_console_listener_prints_one_line_per_event():
+    stream = io.StringIO()
+
+    console_listener(stream)(ProgressEvent("sentiment.classify", 5, 10, 1.0))
+
+    assert stream.getvalue().startswith("sentiment.classify: 5/10 rows")
+
+
+def test_sentiment_reports_rows_scored(events):
+    smt = Sentiment(use_cache=False)
+    # a plain function, so lengths fall back to word counts
+    smt.smt_pipe = lambda texts, batch_size: [
+        {"label": "POSITIVE", "score": 0.9} for _ in texts]
+
+    smt.get_batch_sentiment(["a", "b", "", "c"], batch_size=2)
+
+    assert {e.stage for e in events} == {"sentiment.classify"}
+    # the empty string never reaches the model
+    assert [e.done for e in events] == [0, 2, 3, 3]
+    assert events[-1].total == 3 and events[-1].finished
+
+
+def test_summary_reports_prompts_and_tokens(events):
+    pipe = MagicMock(side_effect=lambda batch, batch_size: [
+        [{"generated_text": [{"content": "two words"}]}] for _ in batch])
+    pipe.tokenizer = FakeTokenizer()
+    summary = Summary(use_cache=False)
+    summary.t_pipe = pipe
+
+    summary.get_outputs([("A", "p1"), ("B", "p2"), ("C", "p3")],
+                        batch_size=2)
+
+    assert events[-1].stage == "summary.generate"
+    assert (events[-1].done, events[-1].total) == (3, 3)
+    assert events[-1].tokens == 6
+
+
+def test_cluster_encodes_in_chunks_while_reporting(events, bare_cluster):
+    cluster = bare_cluster
+    cluster.emb_cache = None
+    cluster.st_model = MagicMock()
+    cluster.st_model.encode.side_effect = lambda s, **kwargs: np.ones(
+        (len(s), 2), dtype=np.float32)
+
+    with patch("utils.cluster.PROGRESS_CHUNK_SIZE", 2):
+        embeddings = cluster._encode(["a", "b", "c", "d", "e"])
+
+    assert embeddings.shape == (5, 2)
+    assert cluster.st_model.encode.call_count == 3
+    assert [e.done for e in events] == [0, 2, 4, 5, 5]
+
+
+def test_fit_steps_report_and_unwrap(events):
+    class FakeBERTopic:
+        def _reduce_dimensionality(self, embeddings):
+            return embeddings
+
+        def _cluster_embeddings(self, embeddings):
+            return embeddings
+
+    model = FakeBERTopic()
+    with Cluster._fit_stages(model, n_rows=10):
+        model._reduce_dimensionality(None)
+        model._cluster_embeddings(None)
+
+    assert [(e.stage, e.done) for e in events if e.finished] == [
+        ("cluster.reduce", 10), ("cluster.hdbscan", 10)]
+    # the wrappers are gone, so the model pickles as before
+    assert "_reduce_dimensionality" not in vars(model)
+
+
+def test_sentiment_chunks_advance_one_stage_task(events):
+    from processor import parser as parser_module
+    parser = parser_module.Parser.__new__(parser_module.Parser)
+    parser.smt = Sentiment(use_cache=False)
+    parser.smt.smt_pipe = lambda texts, batch_size: [
+        {"label": "POSITIVE", "score": 0.9} for _ in texts]
+
+    with patch.object(parser_module, "SMT_CHUNK_SIZE", 2):
+        labels, _ = parser._score_texts(
+            pd.Series(["a", "b", "", "c", "d"]))
+
+    assert len(labels) == 5
+    # the chunks share one task, so its rate and ETA span every row
+    finished = [e for e in events if e.finished]
+    assert [(e.stage, e.done, e.total) for e in finished] == [
+        ("sentiment.classify", 5, 5)]
+
+
+def test_assign_chunks_advance_one_stage_task(events, bare_cluster):
+    cluster = bare_cluster
+    cluster.sentences = ["a", "b", "c", "d", "e", "f", "g"]
+    cluster.fit_index = np.array([0, 2])
+    cluster.embeddings = np.zeros((2, 2), dtype=np.float32)
+    cluster.emb_cache = None
+    cluster.encode_workers = 1
+    cluster.st_model = MagicMock()
+    cluster.st_model.encode.side_effect = lambda s, **kwargs: np.ones(
+        (len(s), 2), dtype=np.float32)
+    model = MagicMock()
+    model.topics_ = [0, 1]
+    model.transform.side_effect = lambda s, e: ([0] * len(s), None)
+    cluster.topic_model = model
+
+    with patch("utils.cluster.ASSIGN_CHUNK_SIZE", 2), \
+            patch("bertopic.backend._utils.select_backend"):
+        cluster._assign_remaining()
+
+    assert model.transform.call_count == 3
+    finished = [e for e in events if e.finished]
+    assert [(e.stage, e.done, e.total) for e in finished] == [
+        ("cluster.encode", 5, 5)]
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import numpy as np
+import torch
+
+from benchmarks.stubs import StubClassifier, TorchStubClassifier
+from utils import Sentiment
+from utils.model_registry import get_registry, model_size_mb
+from utils.quantization import (
+    check_quantization,
+    embedding_drift,
+    label_agreement,
+    quantize_model,
+)
+
+
+def test_quantize_model_shrinks_linear_layers():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.ReLU(),
+                                torch.nn.Linear(256, 8))
+    inputs = torch.randn(4, 256)
+    reference = model(inputs).detach()
+    fp32_mb = model_size_mb(model)
+
+    assert quantize_model(model) is model
+
+    # int8 weights take a quarter of the fp32 memory; biases stay fp32
+    assert model_size_mb(model) < 0.3 * fp32_mb
+    torch.testing.assert_close(model(inputs), reference, atol=0.05,
+                               rtol=0.05)
+
+
+def test_quantize_model_leaves_non_torch_models_unchanged():
+    classifier = StubClassifier()
+    assert quantize_model(classifier) is classifier
+
+
+def test_embedding_drift_and_label_agreement():
+    reference = np.array([[1.0, 0.0], [0.0, 1.0]])
+    candidate = np.array([[1.0, 0.0], [1.0, 1.0]])
+
+    drift = embedding_drift(reference, candidate)
+
+    assert drift["mean_cosine_drift"] == np.float32(
+        (1 - np.sqrt(0.5)) / 2)
+    assert drift["max_cosine_drift"] == np.float32(1 - np.sqrt(0.5))
+    assert label_agreement(["POS", "NEG"], ["POS", "POS"]) == 0.5
+    assert label_agreement([], []) == 1.0
+
+
+def test_check_quantization_reports_drift_speed_and_memory():
+    from benchmarks.stubs import TorchStubEncoder
+    texts = ["battery drains fast", "love the screen", "too expensive"] * 4
+
+    result = check_quantization(texts, TorchStubEncoder,
+                                TorchStubClassifier)
+
+    assert result["embedding"]["mean_cosine_drift"] < 0.01
+    assert result["embedding"]["memory_saving"] > 0.7
+    assert 0 <= result["sentiment"]["label_agreement"] <= 1
+    assert result["sentiment"]["int8_s"] > 0
+
+
+@patch("utils.sentiment.get_sentiment_pipeline")
+def test_quantized_sentiment_is_registered_separately(mock_pipeline_fn):
+    mock_pipeline_fn.return_value = TorchStubClassifier()
+
+    result = Sentiment(quantize=True).get_feedback_sentiment("great")
+
+    assert result["label"] in TorchStubClassifier.labels
+    # quantized in place, and kept apart from any fp32 copy
+    registry = get_registry()
+    assert "tabularisai/multilingual-sentiment-analysis-int8" in registry
+    assert "tabularisai/multilingual-sentiment-analysis" not in registry
+    layer = mock_pipeline_fn.return_value.model[0]
+    assert isinstance(layer, torch.ao.nn.quantized.dynamic.Linear)
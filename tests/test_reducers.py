@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from utils.reducers import N_COMPONENTS, StreamingPCA, get_reducer
+
+
+def test_streaming_pca_fits_in_batches():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((250, 16)).astype(np.float32)
+    reducer = StreamingPCA(batch_size=100)
+
+    reduced = reducer.fit_transform(embeddings)
+
+    # 250 rows in batches of at least 100: the remainder joins the last
+    assert reducer.pca.n_samples_seen_ == 250
+    assert reduced.shape == (250, N_COMPONENTS)
+    assert reduced.dtype == np.float32
+    np.testing.assert_allclose(reducer.transform(embeddings[:3]),
+                               reduced[:3], rtol=1e-5, atol=1e-6)
+
+
+def test_streaming_pca_ignores_vector_length():
+    rng = np.random.default_rng(1)
+    embeddings = rng.standard_normal((50, 16)).astype(np.float32)
+    reducer = StreamingPCA().fit(embeddings)
+
+    # rows are normalized, matching the cosine metric of the UMAP reducers
+    np.testing.assert_allclose(reducer.transform(embeddings * 3),
+                               reducer.transform(embeddings), atol=1e-5)
+
+
+def test_get_reducer_by_name():
+    assert get_reducer("umap").random_state == 42
+    assert get_reducer("umap_parallel").random_state is None
+    assert isinstance(get_reducer("pca"), StreamingPCA)
+    with pytest.raises(ValueError):
+        get_reducer("tsne")
@@ -0,0 +1,62 @@
+from utils import ResponseCache
+from utils.summary import _bundle_messages
+
+
+def test_settings_are_part_of_the_key(tmp_path):
+    messages = _bundle_messages("Name this topic")
+    ResponseCache("model-a", {"max_new_tokens": 64},
+                  cache_dir=tmp_path).put(messages, "Short Name")
+
+    same = ResponseCache("model-a", {"max_new_tokens": 64},
+                         cache_dir=tmp_path)
+    other = ResponseCache("model-a", {"max_new_tokens": 128},
+                          cache_dir=tmp_path)
+
+    assert same.get(messages) == "Short Name"
+    assert other.get(messages) is None
+    assert same.stats() == {"hits": 1, "misses": 0}
+    assert other.stats() == {"hits": 0, "misses": 1}
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    cache = ResponseCache("model-a", cache_dir=tmp_path, max_entries=2)
+    first, second, third = (_bundle_messages(p) for p in ("a", "b", "c"))
+    cache.put(first, "A")
+    cache.put(second, "B")
+    cache.get(first)  # first is now more recent than second
+    cache.put(third, "C")
+
+    assert cache.get(first) == "A"
+    assert cache.get(second) is None
+    assert cache.get(third) == "C"
+
+
+def test_eviction_frees_slack_in_one_batch(tmp_path):
+    cache = ResponseCache("model-a", cache_dir=tmp_path, max_entries=10)
+    for i in range(11):
+        cache.put(_bundle_messages(str(i)), str(i))
+
+    # 10% of the cap is freed beyond it, oldest first
+    conn = cache._connect()
+    assert conn.execute("SELECT COUNT(*) FROM responses").fetchone() == (9,)
+    assert cache.get(_bundle_messages("1")) is None
+    assert cache.get(_bundle_messages("2")) == "2"
+    # recency lookups use the index rather than scanning the table
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT key FROM responses "
+                        "ORDER BY last_used LIMIT 1").fetchall()
+    assert "responses_last_used" in str(plan)
+
+
+def test_clock_resumes_from_stored_stamps(tmp_path):
+    first, second = _bundle_messages("a"), _bundle_messages("b")
+    cache = ResponseCache("model-a", cache_dir=tmp_path, max_entries=2)
+    cache.put(first, "A")
+    cache.put(second, "B")
+    cache.close()
+
+    cache = ResponseCache("model-a", cache_dir=tmp_path, max_entries=2)
+    cache.get(first)  # newer than second, despite the fresh clock
+    cache.put(_bundle_messages("c"), "C")
+
+    assert cache.get(first) == "A"
+    assert cache.get(second) is None
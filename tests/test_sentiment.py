@@ -60,4 +60,97 @@ def test_whitespace_only_does_not_call_pipeline(mock_pipeline_fn):
     result = sentiment.get_feedback_sentiment("   ")
     # Pipeline should never be called
     fake_pipeline.assert_not_called()
-    assert result == {"label": "NEUTRAL", "score": 0.0}
\ No newline at end of file
+    assert result == {"label": "NEUTRAL", "score": 0.0}
+
+# Test batch scoring keeps original order and skips empty strings
+@patch("utils.sentiment.get_sentiment_pipeline")
+def test_batch_sentiment_preserves_order(mock_pipeline_fn):
+    fake_pipeline = MagicMock()
+    fake_pipeline.tokenizer = None
+    # echo a label derived from each text so order can be verified
+    fake_pipeline.side_effect = lambda texts, batch_size: [
+        {"label": t.upper(), "score": len(t) / 10} for t in texts
+    ]
+    mock_pipeline_fn.return_value = fake_pipeline
+
+    sentiment = Sentiment()
+    feedback = ["a much longer piece of feedback", "", "short", "mid length"]
+    results = sentiment.get_batch_sentiment(iter(feedback), batch_size=2)
+
+    assert [r["label"] for r in results] == [
+        "A MUCH LONGER PIECE OF FEEDBACK", "NEUTRAL", "SHORT", "MID LENGTH"
+    ]
+    assert results[1] == {"label": "NEUTRAL", "score": 0.0}
+    # three non-empty strings in batches of two, shortest first
+    assert fake_pipeline.call_count == 2
+    first_batch = fake_pipeline.call_args_list[0].args[0]
+    assert first_batch == ["short", "mid length"]
+
+
+# Test batch scoring of only empty strings never calls the pipeline
+@patch("utils.sentiment.get_sentiment_pipeline")
+def test_batch_sentiment_all_empty(mock_pipeline_fn):
+    fake_pipeline = MagicMock()
+    mock_pipeline_fn.return_value = fake_pipeline
+
+    sentiment = Sentiment()
+    results = sentiment.get_batch_sentiment(["", "  "])
+
+    fake_pipeline.assert_not_called()
+    assert results == [{"label": "NEUTRAL", "score": 0.0}] * 2
+
+
+# Test batch scoring reuses cached results across Sentiment instances
+@patch("utils.sentiment.get_sentiment_pipeline")
+def test_batch_sentiment_uses_cache(mock_pipeline_fn):
+    fake_pipeline = MagicMock()
+    fake_pipeline.tokenizer = None
+    fake_pipeline.side_effect = lambda texts, batch_size: [
+        {"label": "POSITIVE", "score": 0.9} for _ in texts
+    ]
+    mock_pipeline_fn.return_value = fake_pipeline
+
+    Sentiment().get_batch_sentiment(["Great service!", "Fast delivery"])
+    assert fake_pipeline.call_count == 1
+
+    results = Sentiment().get_batch_sentiment(
+        ["Fast delivery", "Great service!", "New feedback"])
+    # only the unseen string reaches the pipeline on the second run
+    assert fake_pipeline.call_count == 2
+    assert fake_pipeline.call_args.args[0] == ["New feedback"]
+    assert results[0] == {"label": "POSITIVE", "score": 0.9}
+
+
+# Test that the pipeline loads on first use and is shared across instances
+@patch("utils.sentiment.get_sentiment_pipeline")
+def test_pipeline_loaded_lazily_and_shared(mock_pipeline_fn):
+    fake_pipeline = MagicMock()
+    fake_pipeline.return_value = [{"label": "POSITIVE", "score": 0.9}]
+    mock_pipeline_fn.return_value = fake_pipeline
+
+    first, second = Sentiment(use_cache=False), Sentiment(use_cache=False)
+    mock_pipeline_fn.assert_not_called()
+
+    first.get_feedback_sentiment("Nice")
+    second.get_feedback_sentiment("Nice")
+    mock_pipeline_fn.assert_called_once()
+
+
+# Test that results cached by one backend are not served to another
+def test_cache_is_separate_per_backend():
+    def scorer(label):
+        return lambda texts, batch_size: [
+            {"label": label, "score": 0.9} for _ in texts]
+
+    torch_smt = Sentiment()
+    torch_smt.smt_pipe = scorer("POSITIVE")
+    torch_smt.get_batch_sentiment(["Great service!"])
+
+    onnx_smt = Sentiment(backend="onnx")
+    onnx_smt.smt_pipe = scorer("NEGATIVE")
+    results = onnx_smt.get_batch_sentiment(["Great service!"])
+
+    assert results[0]["label"] == "NEGATIVE"
+    assert torch_smt.model_key != onnx_smt.model_key
+    assert Sentiment(backend="onnx", quantize=True).model_key not in (
+        torch_smt.model_key, onnx_smt.model_key)
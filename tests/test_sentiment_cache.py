@@ -0,0 +1,34 @@
+from utils import SentimentCache
+
+
+def test_put_and_get_many(tmp_path):
+    cache = SentimentCache("model-a", cache_dir=tmp_path)
+    cache.put_many(["good", "bad"], [{"label": "POSITIVE", "score": 0.9},
+                                     {"label": "NEGATIVE", "score": 0.7}])
+
+    result = cache.get_many(["bad", "unknown", "good"])
+
+    assert result[0] == {"label": "NEGATIVE", "score": 0.7}
+    assert result[1] is None
+    assert result[2]["label"] == "POSITIVE"
+
+
+def test_results_persist_and_are_model_scoped(tmp_path):
+    cache = SentimentCache("model-a", cache_dir=tmp_path)
+    cache.put_many(["good"], [{"label": "POSITIVE", "score": 0.9}])
+    cache.close()
+
+    # a fresh object has an empty LRU, so this reads from SQLite
+    assert SentimentCache("model-a", cache_dir=tmp_path).get_many(
+        ["good"]) == [{"label": "POSITIVE", "score": 0.9}]
+    assert SentimentCache("model-b", cache_dir=tmp_path).get_many(
+        ["good"]) == [None]
+
+
+def test_lru_front_is_bounded(tmp_path):
+    cache = SentimentCache("model-a", cache_dir=tmp_path, lru_size=2)
+    cache.put_many(["a", "b", "c"], [{"label": "NEUTRAL", "score": 0.5}] * 3)
+
+    assert len(cache._lru) == 2
+    # evicted LRU entries are still served from SQLite
+    assert cache.get_many(["a"]) == [{"label": "NEUTRAL", "score": 0.5}]
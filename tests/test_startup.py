@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# generous bound for slow CI machines; typically well under a second
+IMPORT_BUDGET_S = 3.0
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers",
+                 "bertopic", "umap", "hdbscan", "dotenv")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_in_subprocess(module):
+    # import in a fresh interpreter, report wall time and loaded modules
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    seconds, modules = out.splitlines()[-2:]
+    return float(seconds), set(modules.split())
+
+
+@pytest.mark.parametrize("module", ["app", "user_interface"])
+def test_gui_import_is_fast_and_defers_ml_libraries(module):
+    pytest.importorskip("tkinter")
+    seconds, modules = import_in_subprocess(module)
+
+    assert not modules.intersection(HEAVY_MODULES)
+    assert seconds < IMPORT_BUDGET_S
+
+
+def test_cli_import_does_not_load_tkinter_or_ml_libraries():
+    _, modules = import_in_subprocess("cli")
+
+    assert "tkinter" not in modules
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_prewarm_imports_in_background_and_ignores_failures():
+    from utils.prewarm import prewarm
+
+    thread = prewarm(("json", "no_such_module_for_prewarm"))
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert thread.daemon
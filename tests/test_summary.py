@@ -41,3 +41,67 @@ class TestSummary:
         result = summary_obj.get_output("Topic1", "Generate summary")
 
         assert result == "Error generating summary"
+
+    # Test repeated prompts are served from the response cache
+    @patch("utils.summary.get_topic_pipeline")
+    def test_get_output_uses_cache(self, mock_pipeline_fn):
+        fake_pipeline = MagicMock()
+        fake_pipeline.return_value = [
+            {"generated_text": [{"content": "Cached summary"}]}
+        ]
+        mock_pipeline_fn.return_value = fake_pipeline
+
+        Summary().get_output("Topic1", "Generate summary")
+        summary_obj = Summary()
+        result = summary_obj.get_output("Topic1", "Generate summary")
+
+        assert result == "Cached summary"
+        assert fake_pipeline.call_count == 1
+        assert summary_obj.cache.stats() == {"hits": 1, "misses": 0}
+
+    # Test failed generations are never cached
+    @patch("utils.summary.get_topic_pipeline")
+    def test_get_output_does_not_cache_errors(self, mock_pipeline_fn):
+        fake_pipeline = MagicMock(side_effect=[
+            Exception("Pipeline error"),
+            [{"generated_text": [{"content": "Recovered summary"}]}],
+        ])
+        mock_pipeline_fn.return_value = fake_pipeline
+
+        summary_obj = Summary()
+        assert summary_obj.get_output("Topic1", "Prompt") == \
+            "Error generating summary"
+        assert summary_obj.get_output("Topic1", "Prompt") == \
+            "Recovered summary"
+
+    # Test get_outputs batches prompts and keeps the original order
+    @patch("utils.summary.get_topic_pipeline")
+    def test_get_outputs_batches_prompts(self, mock_pipeline_fn):
+        fake_pipeline = MagicMock()
+        fake_pipeline.side_effect = lambda batch, batch_size: [
+            [{"generated_text": [{"content": m[1]["content"][0]["text"]}]}]
+            for m in batch
+        ]
+        mock_pipeline_fn.return_value = fake_pipeline
+
+        summary_obj = Summary()
+        items = [("A", "short"), ("B", "a longer prompt"), ("C", "mid one")]
+        result = summary_obj.get_outputs(items, batch_size=2)
+
+        assert result == ["short", "a longer prompt", "mid one"]
+        assert fake_pipeline.call_count == 2
+
+    # Test a failing batch is retried per prompt, isolating the error
+    @patch("utils.summary.get_topic_pipeline")
+    def test_get_outputs_isolates_errors(self, mock_pipeline_fn):
+        def fake_generate(messages, **kwargs):
+            if isinstance(messages[0], list):
+                raise Exception("Batch error")
+            if messages[1]["content"][0]["text"] == "bad":
+                raise Exception("Pipeline error")
+            return [{"generated_text": [{"content": "ok"}]}]
+        mock_pipeline_fn.return_value = MagicMock(side_effect=fake_generate)
+
+        result = Summary().get_outputs([("A", "good"), ("B", "bad")])
+
+        assert result == ["ok", "Error generating summary"]
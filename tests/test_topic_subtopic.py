@@ -1,5 +1,5 @@
 import pytest
-from processor.topic_base import Subtopic, Topic
+from processor.topic_base import Subtopic, Topic, parse_combined_output
 
 def normalize_whitespace(s: str) -> str:
     """Normalize whitespace for consistent comparison in tests."""
@@ -87,3 +87,30 @@ def test_topic_lookup_and_name_prompt(topic_name, subtopic_instances, related_id
     assert normalize_whitespace(topic_name.replace("_", " ")) in prompt_norm
     for sub_data in topic.subtopic_data:
         assert normalize_whitespace(sub_data) in prompt_norm
+
+
+@pytest.mark.parametrize(
+    "output,expected",
+    [
+        ('{"name": "Battery Life", "summary": "Users praise it."}',
+         ("Battery Life", "Users praise it.")),
+        ('```json\n{"name": "Price", "summary": "Too costly."}\n```',
+         ("Price", "Too costly.")),
+        ("**Name:** Charging Port\n**Summary:** Port placement annoys users.",
+         ("Charging Port", "Port placement annoys users.")),
+        ('{"name": "", "summary": "Missing name."}', None),
+        ("Just a plain sentence with no structure.", None),
+    ]
+)
+def test_parse_combined_output(output, expected):
+    assert parse_combined_output(output) == expected
+
+
+def test_subtopic_combined_prompt_contains_data():
+    sub = Subtopic(name="Cluster X", id=1, count=2, tags=["ui", "speed"],
+                   feedback=["Fast"], sentiment={"POSITIVE": 2})
+    prompt = normalize_whitespace(sub.combined_prompt())
+    assert "Cluster X" in prompt
+    assert "ui, speed" in prompt
+    assert "POSITIVE: 2" in prompt
+    assert '"name"' in prompt and '"summary"' in prompt
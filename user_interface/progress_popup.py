@@ -21,10 +21,15 @@ class ProgressPopup:
         self.label = ttk.Label(self.top, text=message, font=self.status_font)
         self.label.pack(pady=(10, 5), padx=10)
 
-        # Indeterminate progress bar
+        # Progress bar, indeterminate until a stage reports its total
         self.progress = ttk.Progressbar(self.top, mode="indeterminate")
         self.progress.pack(fill="x", padx=10, pady=5)
         self.progress.start(10)
+        self.animating = True
+
+        # Stage throughput and ETA
+        self.stats = ttk.Label(self.top, text="")
+        self.stats.pack(padx=10)
 
         # Scrollable log area
         self.log_text = scrolledtext.ScrolledText(
@@ -53,6 +58,26 @@ class ProgressPopup:
     def update_message(self, message):
         self.label.config(text=message)
 
+    def handle_event(self, event):
+        """
+        Show a progress event: a determinate bar for stages with a known
+        total, an animated one otherwise, plus throughput and ETA. Must be
+        called on the Tk thread. Finished stages are logged.
+        """
+        if event.total:
+            if self.animating:
+                self.progress.stop()
+                self.progress.config(mode="determinate")
+                self.animating = False
+            self.progress.config(maximum=event.total, value=event.done)
+        elif not self.animating:
+            self.progress.config(mode="indeterminate", value=0)
+            self.progress.start(10)
+            self.animating = True
+        self.stats.config(text=event.format())
+        if event.finished:
+            self.log(event.format())
+
     def log(self, message):
         """Append a message to the log window and auto-scroll."""
         self.log_text.config(state="normal")
@@ -64,6 +89,7 @@ class ProgressPopup:
         """Stop the progress bar, grey out the log, enable the close button."""
         self.progress.stop()
         self.progress.destroy()
+        self.stats.config(text="")
         self.label.config(text="Done")
         # Grey out log to indicate finished
         self.log_text.config(state="normal", fg="grey")
@@ -5,11 +5,16 @@ import pandas as pd
 
 from user_interface import ProgressPopup
 from utils import CSVLoader
+from utils.prewarm import prewarm
+from utils.progress import get_progress
 from processor import Parser
 
+# constant for delay (ms) after the window shows before pre-warm starts
+PREWARM_DELAY_MS = 500
+
 
 class UserInterface:
-    def __init__(self):
+    def __init__(self, background_prewarm: bool = True):
         self.root = tk.Tk()
         self.root.title("CSV Topic Processor")
 
@@ -21,9 +26,12 @@ class UserInterface:
         self.topics_column_selected = tk.StringVar()
 
         # tools
+        self.loader = None
         self.df_in = None
         self.seeds = None
         self.parser = None
+        # import the ML libraries in the background once the window shows
+        self.background_prewarm = background_prewarm
 
         self._build_ui()
 
@@ -123,12 +131,16 @@ class UserInterface:
 
 
     def _load_csv(self):
-        path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        path = filedialog.askopenfilename(filetypes=[
+            ("Feedback files", "*.csv *.parquet *.jsonl"),
+            ("CSV files", "*.csv")])
         if path:
             self.csv_path.set(path)
-            self.df_in = CSVLoader(self.csv_path.get()).load()
-            self.column_combobox['values'] = list(self.df_in.columns)
-            if self.df_in.columns.any():
+            # read only the header; rows are loaded for the chosen column
+            self.loader = CSVLoader(self.csv_path.get())
+            columns = self.loader.get_columns()
+            self.column_combobox['values'] = columns
+            if columns:
                 self.column_combobox.current(0)
 
     def _browse_save_location(self):
@@ -163,12 +175,19 @@ class UserInterface:
             messagebox.showerror("Error", "Please select a save location")
             return
 
+        # load only the selected feedback column
+        self.df_in = self.loader.load(columns=[self.column_selected.get()])
         self.parser = Parser(self.df_in, self.column_selected.get(), self.seeds)
         progress = ProgressPopup(self.root, message="Initializing tasks...")
 
+        # Stage events arrive on the worker thread; hand them to Tk
+        def on_progress(event):
+            self.root.after(0, lambda: progress.handle_event(event))
+
         # Run long task in background thread
         import threading
         def background_task():
+            get_progress().subscribe(on_progress)
             try:
                 # Step 1: Text clusters
                 self.root.after(0, lambda: progress.update_message(
@@ -207,10 +226,13 @@ class UserInterface:
                     "Results saved successfully."))
 
             finally:
+                get_progress().unsubscribe(on_progress)
                 self.root.after(0, lambda: progress.close())
         threading.Thread(target=background_task, daemon=True).start()
 
     def run(self):
+        if self.background_prewarm:
+            self.root.after(PREWARM_DELAY_MS, prewarm)
         self.root.mainloop()
 
     def _on_topics_column_selected(self, topics: pd.DataFrame, event=None):
@@ -236,6 +258,7 @@ class UserInterface:
             var.set("")
 
         # tools
+        self.loader = None
         self.df_in = None
         self.seeds = None
         self.parser = None
@@ -2,3 +2,7 @@ from .csv_loader import CSVLoader
 from .cluster import Cluster
 from .sentiment import Sentiment
 from .summary import Summary
+from .embedding_cache import EmbeddingCache
+from .sentiment_cache import SentimentCache
+from .response_cache import ResponseCache
+from .dedup import Deduplicator
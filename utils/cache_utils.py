@@ -0,0 +1,48 @@
+"""
+Module defines helpers shared by the on-disk caches, including cache
+directory resolution, text normalization and content hashing.
+"""
+# == Standard Library imports ==
+import hashlib
+import os
+import unicodedata
+from pathlib import Path
+
+# environment variable that overrides the default cache location
+CACHE_ENV = "FSA_CACHE_DIR"
+# default cache location, used when no override is given
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "feedback_sentiment"
+
+def get_cache_dir(name: str) -> Path:
+    """
+    Helper method resolves (and creates) the directory for a named cache,
+    honouring the FSA_CACHE_DIR environment variable when set.
+    :param name: Name of the cache sub-directory.
+    :return: Path to the cache directory.
+    """
+    root = Path(os.getenv(CACHE_ENV) or DEFAULT_CACHE_DIR)
+    path = root / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def normalize_text(text: str) -> str:
+    """
+    Helper method normalizes a text string so trivially different copies
+    (i.e., unicode form, repeated or trailing whitespace) share a cache key.
+    :param text: Text string to normalize.
+    :return: Normalized text string.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def content_hash(*parts: str) -> str:
+    """
+    Helper method builds a stable content hash from one or more strings.
+    :param parts: Strings to hash, e.g. model name and normalized text.
+    :return: Hex digest string (32 characters).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        # separator ensures ("ab", "c") and ("a", "bc") hash differently
+        digest.update(b"\x1f")
+    return digest.hexdigest()
@@ -3,62 +3,345 @@ Class defines Cluster, which handles topic modelling via sentence
 transformation and text clustering.
 """
 
+# == Standard Library imports ==
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from contextlib import contextmanager, nullcontext
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
 # == Third party imports ==
-from bertopic import BERTopic
-from bertopic.representation import KeyBERTInspired
-from bertopic.vectorizers import ClassTfidfTransformer
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import CountVectorizer
-from umap import UMAP
-import hdbscan
+# heavy ML libraries are imported where used, to keep startup fast
+import numpy as np
 import pandas as pd
 
+# == Local imports ==
+from .cache_utils import content_hash, get_cache_dir
+from .embedding_cache import EmbeddingCache
+from .encode_pool import EncodePool, default_workers
+from .model_registry import get_registry
+from .profiler import get_profiler
+from .progress import advancing, get_progress
+from .quantization import INT8_SUFFIX, model_key, quantize_model
+from .reducers import get_reducer
+
+if TYPE_CHECKING:
+    from bertopic import BERTopic
+    from sentence_transformers import SentenceTransformer
+
 # constant for specified sentence transformer model
 ST_MODEL = "all-roberta-large-v1"
+# constant for expected sentence transformer size (MB), before measured
+ST_MODEL_MB = 1_400
+# constant for sentence transformer embedding dimension
+ST_DIM = 1024
+# constant for number of representative feedback items kept per topic
+N_FEEDBACK = 4
+# constant for minimum number of feedback items forming a cluster
+MIN_CLUSTER_SIZE = 4
+# constant for number of pending outliers needed before new clusters form
+OUTLIER_REFIT = 50
+# constant for relative change in topic size that marks a topic as changed
+CHANGE_RATIO = 0.1
+# constants for the memory (MB) and time (s) budgets for fitting the
+# reducer and clusterer; larger corpora are fitted on a sample
+FIT_BUDGET_MB = 2_048
+FIT_BUDGET_S = 900
+# constants for estimated fit cost per row: memory beyond the embedding
+# copies (kNN and fuzzy graphs, cluster tree) in bytes, and throughput
+FIT_ROW_OVERHEAD = 2_048
+FIT_ROWS_PER_S = 500
+# constant for the smallest sample fitted, however tight the budget
+MIN_SAMPLE_SIZE = 5_000
+# constant for number of length strata used by stratified sampling
+SAMPLE_STRATA = 10
+# constant for seed used when drawing the fit sample
+SAMPLE_SEED = 42
+# constant for number of remaining rows assigned per streamed chunk
+ASSIGN_CHUNK_SIZE = 50_000
+# constant for fewest sentences encoded on a worker pool; below it, pool
+# start-up (a model load per worker) outweighs the parallel speedup
+POOL_MIN_ROWS = 20_000
+# constant for sentences encoded per call while progress is reported; large
+# enough that the model's length sorting still keeps padding small
+PROGRESS_CHUNK_SIZE = 4_096
+# constant for BERTopic fit steps (k) timed and reported as stages (v)
+FIT_STAGES = {"_reduce_dimensionality": "cluster.reduce",
+              "_cluster_embeddings": "cluster.hdbscan"}
+# constant for version of the saved cluster artifact layout
+ARTIFACT_VERSION = 1
+# constants for file names within a saved cluster run directory
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "topic_model.pkl"
+EMBEDDINGS_FILE = "embeddings.npy"
+SENTENCES_FILE = "sentences.json"
+HIERARCHY_FILE = "hierarchy.pkl"
+FIT_INDEX_FILE = "fit_index.npy"
+WEIGHTS_FILE = "weights.npy"
 
 def get_sentence_transformer() -> SentenceTransformer:
     """
     Helper method creates a sentence transformer model given constant.
     :return: Sentence transformer object.
     """
+    from sentence_transformers import SentenceTransformer
     model = SentenceTransformer(ST_MODEL)
     return model
 
+def get_quantized_sentence_transformer() -> SentenceTransformer:
+    """
+    Helper method creates the sentence transformer with its linear layers
+    dynamically quantized to int8, for faster CPU encoding.
+    :return: Sentence transformer object.
+    """
+    return quantize_model(get_sentence_transformer())
+
+def sentences_hash(sentences: list[str]) -> str:
+    """
+    Helper method fingerprints the sentences a cluster is fitted on, so a
+    saved cluster is only reused for the same feedback in the same order.
+    :param sentences: List of sentences.
+    :return: Hex digest string.
+    """
+    return content_hash(*sentences)
+
+def _embedding_cache(quantize: bool) -> EmbeddingCache:
+    """
+    Helper method opens the embedding cache for the fp32 or int8 encoder;
+    each has its own store, so switching modes does not invalidate either.
+    :param quantize: Whether the encoder is quantized.
+    :return: EmbeddingCache object.
+    """
+    if not quantize:
+        return EmbeddingCache(ST_MODEL)
+    return EmbeddingCache(model_key(ST_MODEL, True),
+                          cache_dir=get_cache_dir("embeddings" + INT8_SUFFIX))
+
+def auto_sample_size(n_rows: int, dim: int = ST_DIM) -> int:
+    """
+    Helper method picks how many rows to fit the reducer and clusterer on,
+    the most that fit both the memory and the time budget. The fit holds
+    about three copies of each sampled embedding (sample, reducer, search
+    index) plus per-row graph overhead.
+    :param n_rows: Number of rows in the corpus.
+    :param dim: Embedding dimension.
+    :return: Sample size; n_rows when the whole corpus fits the budget.
+    """
+    row_bytes = 3 * 4 * dim + FIT_ROW_OVERHEAD
+    by_memory = int(FIT_BUDGET_MB * 1024 ** 2 // row_bytes)
+    by_time = int(FIT_BUDGET_S * FIT_ROWS_PER_S)
+    return min(n_rows, max(MIN_SAMPLE_SIZE, min(by_memory, by_time)))
+
+def sample_indices(sentences: list[str], size: int,
+                   strategy: str = "stratified",
+                   seed: int = SAMPLE_SEED) -> np.ndarray:
+    """
+    Helper method draws the rows to fit on. Stratified sampling splits the
+    rows into SAMPLE_STRATA buckets by text length and samples each in
+    proportion, so short and long feedback are both represented.
+    :param sentences: List of sentences.
+    :param size: Number of rows to draw.
+    :param strategy: "stratified" (by length) or "random".
+    :param seed: Random seed.
+    :return: Sorted array of row indices.
+    """
+    n_rows = len(sentences)
+    rng = np.random.default_rng(seed)
+    if size >= n_rows:
+        return np.arange(n_rows)
+    if strategy == "random":
+        return np.sort(rng.choice(n_rows, size=size, replace=False))
+    if strategy != "stratified":
+        raise ValueError(f"Unknown sample strategy: {strategy}")
+    lengths = np.fromiter((len(s) for s in sentences), dtype=np.int64,
+                          count=n_rows)
+    # rank by length (ties broken randomly), then cut into equal strata
+    order = np.lexsort((rng.random(n_rows), lengths))
+    picked = []
+    for stratum in np.array_split(order, SAMPLE_STRATA):
+        # round proportional share, so stratum sizes sum close to size
+        share = round(size * len(stratum) / n_rows)
+        picked.append(rng.choice(stratum, size=min(share, len(stratum)),
+                                 replace=False))
+    return np.sort(np.concatenate(picked))
+
+def _raw_data_view(holder, embeddings: np.ndarray, rows: int) -> np.ndarray:
+    """
+    Helper method rebuilds the copy of the training embeddings a fitted
+    object keeps, from the first rows of the stored embeddings. A search
+    index keeps its rows permuted into vertex order.
+    :param holder: Fitted UMAP reducer or nearest-neighbour search index.
+    :param embeddings: Stored sentence embeddings.
+    :param rows: Number of training rows the holder was fitted on.
+    :return: Array matching the holder's raw data.
+    """
+    order = getattr(holder, "_vertex_order", None)
+    data = embeddings[:rows]
+    return data if order is None else data[order]
+
 class Cluster:
     """
     Class for Cluster object, handles transformation of natural language
     feedback into transformed sentence objects for clustering and topic
     extraction.
     """
-    def __init__(self, sentences: list[str], seeds: list[str] | None = None):
-        # natural language feedback, strs
-        self.sentences = sentences
+    def __init__(self, sentences: list[str], seeds: list[str] | None = None,
+                 use_cache: bool = True, sample_size: int | None = None,
+                 sample_strategy: str = "stratified", reducer: str = "umap",
+                 weights: np.ndarray | None = None, quantize: bool = False,
+                 encode_workers: int = 1):
+        # natural language feedback, strs; copied, so the caller's list can
+        # change without desynchronizing the fitted model
+        self.sentences = list(sentences)
+        # rows each sentence stands for if deduplicated (None = one each)
+        self.weights = None if weights is None else np.asarray(weights)
         self.seeds = seeds
-        self.st_model = SentenceTransformer(ST_MODEL)
-        # cluster model and related topic hierarchy
+        # rows to fit on (None = set by the fit budget), and how to draw them
+        self.sample_size = sample_size
+        self.sample_strategy = sample_strategy
+        # dimensionality reducer name, see utils.reducers
+        self.reducer = reducer
+        # indices of the rows the reducer was fitted on, if a sample
+        self.fit_index: np.ndarray | None = None
+        # sentence transformer, loaded from the registry on first use, with
+        # int8 linear layers if quantized
+        self.quantize = quantize
+        self._st_model = None
+        # worker processes for encoding large inputs (1 = in-process,
+        # 0 = enough to fill every core)
+        self.encode_workers = encode_workers
+        # persistent embedding store, so unchanged feedback is not re-encoded
+        self.emb_cache = _embedding_cache(quantize) if use_cache else None
+        # sentence embeddings, and indices of outliers not yet re-clustered
+        self.embeddings: np.ndarray | None = None
+        self.pending_outliers: list[int] = []
+        # cluster model and related topic hierarchy (None until fitted)
+        self.hierarchy: pd.DataFrame | None = None
         self.topic_model = self._build_clusters()
         if self.sentences:
-            self.hierarchy = self.topic_model.hierarchical_topics(self.sentences)
+            self._build_hierarchy()
+
+    @property
+    def st_model(self) -> SentenceTransformer:
+        """
+        Property returns the sentence transformer, shared process-wide via
+        the model registry and loaded on first use, unless one was set.
+        :return: Sentence transformer object.
+        """
+        if self._st_model is not None:
+            return self._st_model
+        if self.quantize:
+            return get_registry().get(model_key(ST_MODEL, True),
+                                      get_quantized_sentence_transformer,
+                                      ST_MODEL_MB)
+        return get_registry().get(ST_MODEL, get_sentence_transformer,
+                                  ST_MODEL_MB)
+
+    @st_model.setter
+    def st_model(self, st_model: SentenceTransformer) -> None:
+        self._st_model = st_model
+
+    def _build_hierarchy(self) -> None:
+        """
+        Method builds the topic hierarchy from the fitted topic model.
+        """
+        with get_profiler().stage("cluster.hierarchy",
+                                  items=len(self.sentences)), \
+                get_progress().task("cluster.hierarchy") as task, \
+                self._embedder_attached():
+            self.hierarchy = self.topic_model.hierarchical_topics(
+                self.sentences)
+            task.advance(len(self.sentences))
+
+    @staticmethod
+    @contextmanager
+    def _fit_stages(topic_model: BERTopic, n_rows: int):
+        """
+        Helper method times and reports the reducer and clusterer fits,
+        which run inside BERTopic's fit_transform, as profiler and progress
+        stages of their own for the duration of the context. The fit steps
+        are wrapped on the instance only, and unwrapped afterwards so the
+        model still pickles.
+        :param topic_model: BERTopic object about to be fitted.
+        :param n_rows: Number of rows fitted.
+        """
+        profiler, progress = get_profiler(), get_progress()
+        if not (profiler.enabled or progress.active):
+            yield
+            return None
+
+        def instrumented(step, stage):
+            def run(*args, **kwargs):
+                with profiler.stage(stage, items=n_rows), \
+                        progress.task(stage) as task:
+                    output = step(*args, **kwargs)
+                    task.advance(n_rows)
+                return output
+            return run
+        for name, stage in FIT_STAGES.items():
+            setattr(topic_model, name,
+                    instrumented(getattr(topic_model, name), stage))
+        try:
+            yield
+        finally:
+            for name in FIT_STAGES:
+                topic_model.__dict__.pop(name, None)
+
+    @contextmanager
+    def _embedder_attached(self):
+        """
+        Helper method attaches the embedder to the fitted topic model for
+        the duration of the context. The model holds no reference to it
+        otherwise, so the registry can unload it between stages.
+        """
+        from bertopic.backend._utils import select_backend
+        self.topic_model.embedding_model = select_backend(self.st_model)
+        try:
+            yield
+        finally:
+            self.topic_model.embedding_model = None
 
     def _build_clusters(self) -> BERTopic | None:
         """
         Method builds text clusters using BERTopic workflow, returning a
         BERTopic object that contains relevant data (i.e., tags, documents)
-        for additional parsing.
+        for additional parsing. Corpora larger than the fit budget (or the
+        given sample_size) are fitted on a sample, and the remaining rows
+        are assigned afterwards (see _assign_remaining).
         :return: BERTTopic object.
         """
         if not self.sentences:
             return None
+        from bertopic import BERTopic
+        from bertopic.representation import KeyBERTInspired
+        from bertopic.vectorizers import ClassTfidfTransformer
+        from sklearn.feature_extraction.text import CountVectorizer
+        import hdbscan
         print("Building clusters...")
+        n_rows = len(self.sentences)
+        size = self.sample_size if self.sample_size is not None else \
+            auto_sample_size(n_rows)
+        if size < n_rows:
+            self.fit_index = sample_indices(self.sentences, size,
+                                            self.sample_strategy)
+            fit_sentences = [self.sentences[i] for i in self.fit_index]
+        else:
+            fit_sentences = self.sentences
         # transform text into vector repr that capture semantic meaning
-        embeddings = self.st_model.encode(self.sentences, show_progress_bar=True)
-        # reduce dimensionality of embeddings using UMAP model and cosine dist
-        umap_model = UMAP(n_components=5, min_dist=0.0, metric='cosine',
-                          random_state=42)
-        reduced_embeddings = umap_model.fit_transform(embeddings)
+        embeddings = self._encode(fit_sentences)
+        self.embeddings = embeddings
+        # reduce dimensionality of embeddings (UMAP with cosine dist unless
+        # another reducer is chosen); BERTopic fits it once, in fit_transform
+        umap_model = get_reducer(self.reducer)
         # group similar feedback instances based on lower-dimensional embedding
-        hdbscan_model = hdbscan.HDBSCAN(min_cluster_size=4, metric="euclidean")
-        hdbscan_model.fit_predict(reduced_embeddings)
+        # keep prediction data so new feedback can be assigned incrementally
+        hdbscan_model = hdbscan.HDBSCAN(min_cluster_size=MIN_CLUSTER_SIZE,
+                                        metric="euclidean",
+                                        prediction_data=True)
         # convert text into numerical features for count vectorization
         vectorizer_model = CountVectorizer(
             # set low to reduce likelihood that keywords are removed
@@ -82,32 +365,478 @@ class Cluster:
                                vectorizer_model=vectorizer_model,
                                ctfidf_model=c_tf_idf_model,
                                representation_model=representation_model)
-        topic_model.fit_transform(self.sentences, embeddings)
+        with get_profiler().stage("cluster.fit", items=len(fit_sentences)), \
+                self._fit_stages(topic_model, len(fit_sentences)):
+            topic_model.fit_transform(fit_sentences, embeddings)
+        # drop the model's reference to the embedder, see _embedder_attached
+        topic_model.embedding_model = None
+        if self.fit_index is not None:
+            self.topic_model = topic_model
+            self._assign_remaining()
         return topic_model
 
+    def _assign_remaining(self) -> None:
+        """
+        Method assigns the rows left out of the fit sample to the fitted
+        topics, streaming them in chunks of ASSIGN_CHUNK_SIZE through the
+        fitted reducer and approximate HDBSCAN prediction. Topic sizes,
+        keywords and representative docs are then refreshed over the full
+        corpus. Unassigned rows stay outliers.
+        """
+        n_rows = len(self.sentences)
+        sample_embeddings = self.embeddings
+        topics = np.full(n_rows, -1, dtype=np.int64)
+        topics[self.fit_index] = self.topic_model.topics_
+        embeddings = np.empty((n_rows, sample_embeddings.shape[1]),
+                              dtype=np.float32)
+        embeddings[self.fit_index] = sample_embeddings
+        rest = np.setdiff1d(np.arange(n_rows), self.fit_index)
+        workers = self.encode_workers or default_workers()
+        encoder_pool = nullcontext()
+        if workers > 1 and len(rest) >= POOL_MIN_ROWS:
+            print(f"Encoding {len(rest)} sentences on {workers} "
+                  f"worker processes...")
+            encoder_pool = self._encoder_pool(workers)
+        # one task for all chunks, so its rate and ETA cover every row left,
+        # and one pool, so its workers load their models only once
+        with get_progress().task("cluster.encode", total=len(rest)) as task, \
+                encoder_pool as pool:
+            for start in range(0, len(rest), ASSIGN_CHUNK_SIZE):
+                idx = rest[start:start + ASSIGN_CHUNK_SIZE]
+                chunk = [self.sentences[i] for i in idx]
+                chunk_embeddings = self._encode(chunk, advance=task.advance,
+                                                pool=pool)
+                with get_profiler().stage("cluster.transform",
+                                          items=len(idx)):
+                    chunk_topics, _ = self.topic_model.transform(
+                        chunk, chunk_embeddings)
+                embeddings[idx] = chunk_embeddings
+                topics[idx] = chunk_topics
+        self.embeddings = embeddings
+        self._refresh_topics(topics.tolist())
+
+    def _refresh_topics(self, topics: list[int]) -> None:
+        """
+        Method refreshes sizes, keywords and representative docs of all
+        topics for the current sentences, keeping the fitted vectorizer and
+        representation models.
+        :param topics: Topic assignment per sentence.
+        """
+        with get_profiler().stage("cluster.update_topics",
+                                  items=len(self.sentences)):
+            model = self.topic_model
+            # keyword representations need the embedder during the update
+            with self._embedder_attached():
+                model.update_topics(self.sentences, topics=topics,
+                                    vectorizer_model=model.vectorizer_model,
+                                    ctfidf_model=model.ctfidf_model,
+                                    representation_model=
+                                    model.representation_model)
+            model._save_representative_docs(pd.DataFrame({
+                "Document": self.sentences,
+                "Topic": topics,
+                "ID": range(len(self.sentences)),
+                "Image": None
+            }))
+
+    def _encode(self, sentences: list[str],
+                advance: Callable[..., None] | None = None,
+                pool: EncodePool | None = None) -> np.ndarray:
+        """
+        Method encodes sentences into embeddings, consulting the embedding
+        cache (if enabled) so that only previously unseen sentences are
+        passed to the sentence transformer. While progress is reported,
+        sentences are encoded in chunks of PROGRESS_CHUNK_SIZE.
+        :param sentences: List of sentences to encode.
+        :param advance: Advance method of the caller's progress task, which
+        then counts every sentence, cached or not; by default a task is
+        opened for the sentences encoded.
+        :param pool: Started EncodePool to encode on, e.g. one reused across
+        the chunks of a large input; by default a pool is started for
+        inputs of at least POOL_MIN_ROWS if encode_workers allows.
+        :return: 2D array of sentence embeddings.
+        """
+        n_encoded = 0
+
+        def encode(sentences: list[str]) -> np.ndarray:
+            nonlocal n_encoded
+            n_encoded += len(sentences)
+            progress = get_progress()
+            with get_profiler().stage("cluster.encode",
+                                      items=len(sentences)), \
+                    advancing("cluster.encode", len(sentences),
+                              advance) as advance_by:
+                if pool is not None:
+                    pool.on_chunk = advance_by
+                    return pool.encode(sentences)
+                workers = self.encode_workers or default_workers()
+                if workers > 1 and len(sentences) >= POOL_MIN_ROWS:
+                    return self._encode_on_pool(sentences, workers,
+                                                advance_by)
+                if not progress.active or \
+                        len(sentences) <= PROGRESS_CHUNK_SIZE:
+                    embeddings = self.st_model.encode(
+                        sentences, show_progress_bar=not progress.active)
+                    advance_by(len(sentences))
+                    return embeddings
+                chunks = []
+                for start in range(0, len(sentences), PROGRESS_CHUNK_SIZE):
+                    chunk = sentences[start:start + PROGRESS_CHUNK_SIZE]
+                    chunks.append(self.st_model.encode(
+                        chunk, show_progress_bar=False))
+                    advance_by(len(chunk))
+                return np.vstack(chunks)
+        if self.emb_cache is None:
+            return encode(sentences)
+        embeddings = self.emb_cache.get_or_encode(sentences, encode)
+        if advance is not None:
+            # cached (or repeated) sentences are done once looked up
+            advance(len(sentences) - n_encoded)
+        return embeddings
+
+    def _encode_on_pool(self, sentences: list[str], workers: int,
+                        on_chunk: Callable[[int], None] | None = None
+                        ) -> np.ndarray:
+        """
+        Helper method encodes sentences on a pool of worker processes
+        started for this call only.
+        :param sentences: List of sentences to encode.
+        :param workers: Number of worker processes.
+        :param on_chunk: Callable taking the size of each encoded chunk.
+        :return: 2D array of sentence embeddings.
+        """
+        print(f"Encoding {len(sentences)} sentences on {workers} "
+              f"worker processes...")
+        with self._encoder_pool(workers) as pool:
+            pool.on_chunk = on_chunk
+            return pool.encode(sentences)
+
+    def _encoder_pool(self, workers: int) -> EncodePool:
+        """
+        Helper method builds a pool of worker processes, each loading its
+        own copy of the sentence transformer and using an equal share of
+        the cores. The workers start once the pool is entered.
+        :param workers: Number of worker processes.
+        :return: EncodePool object.
+        """
+        loader = get_quantized_sentence_transformer if self.quantize \
+            else get_sentence_transformer
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        return EncodePool(loader, n_workers=workers, threads=threads)
+
+    def _reset_topic_cache(self) -> None:
+        """
+        Helper method discards memoized topic data after the model changes.
+        """
+        self.__dict__.pop("topic_table", None)
+        self.__dict__.pop("parent_index", None)
+
+    def _cluster_outliers(self, topics: list[int]) -> bool:
+        """
+        Method groups pending outliers into new topics, once enough have
+        built up, by clustering their embeddings in the fitted reduced
+        space. Outliers that still fit no cluster remain pending.
+        :param topics: Topic assignment per sentence; updated in place.
+        :return: True if any new topic was created.
+        """
+        if len(self.pending_outliers) < OUTLIER_REFIT:
+            return False
+        import hdbscan
+        idx = np.array(self.pending_outliers)
+        with get_profiler().stage("cluster.outliers", items=len(idx)):
+            reduced = self.topic_model.umap_model.transform(
+                self.embeddings[idx])
+            labels = hdbscan.HDBSCAN(min_cluster_size=MIN_CLUSTER_SIZE,
+                                     metric="euclidean").fit_predict(reduced)
+        next_id = max(topics) + 1
+        for i, label in zip(idx, labels):
+            if label >= 0:
+                topics[i] = next_id + int(label)
+        self.pending_outliers = [int(i) for i, label in zip(idx, labels)
+                                 if label < 0]
+        return bool((labels >= 0).any())
+
+    def update(self, sentences: list[str],
+               weights: np.ndarray | None = None) -> set[int]:
+        """
+        Method incrementally adds new feedback to the fitted topic model.
+        Only the new sentences are embedded, and they are assigned to
+        existing topics via the fitted reducer and approximate HDBSCAN
+        prediction. Outliers accumulate until OUTLIER_REFIT are pending,
+        when they are clustered into new topics. Topic representations are
+        then refreshed for the grown corpus.
+        :param sentences: List of new feedback sentences.
+        :param weights: Rows each sentence stands for, covering all
+        sentences after the update (see Deduplicator); None counts each new
+        sentence once.
+        :return: Set of topic ids that are new, or whose size changed by at
+        least CHANGE_RATIO.
+        """
+        if not sentences and (weights is None or self.topic_model is None):
+            return set()
+        if self.topic_model is None:
+            # nothing fitted yet, so fit from scratch on the new feedback
+            self.sentences = list(sentences)
+            self.weights = None if weights is None else np.asarray(weights)
+            self.topic_model = self._build_clusters()
+            self._build_hierarchy()
+            self._reset_topic_cache()
+            return set(self.topic_table.index)
+        before = self.topic_table["count"].to_dict()
+        old_weights = self.weights
+        if weights is not None:
+            self.weights = np.asarray(weights)
+        elif old_weights is not None:
+            self.weights = np.concatenate(
+                [old_weights, np.ones(len(sentences), dtype=np.int64)])
+        created = False
+        if sentences:
+            embeddings = self._encode(sentences)
+            with get_profiler().stage("cluster.transform",
+                                      items=len(sentences)):
+                new_topics, _ = self.topic_model.transform(sentences,
+                                                           embeddings)
+            n_old = len(self.sentences)
+            self.sentences = self.sentences + list(sentences)
+            self.embeddings = np.vstack([self.embeddings, embeddings])
+            topics = list(self.topic_model.topics_) + \
+                [int(t) for t in new_topics]
+            self.pending_outliers += [n_old + i for i, t in
+                                      enumerate(new_topics) if t == -1]
+            created = self._cluster_outliers(topics)
+            self._refresh_topics(topics)
+        if created:
+            self._build_hierarchy()
+        self._reset_topic_cache()
+        after = self.topic_table["count"].to_dict()
+        return {t_id for t_id, count in after.items()
+                if t_id not in before or
+                abs(count - before[t_id]) >= CHANGE_RATIO * before[t_id]}
+
+    def predict(self, sentences: list[str]) -> list[int]:
+        """
+        Method assigns feedback to the fitted topics without changing the
+        model, e.g. to score a holdout set against a loaded run.
+        :param sentences: List of feedback sentences.
+        :return: Topic id per sentence (-1 for outliers).
+        """
+        if not sentences or self.topic_model is None:
+            return [-1] * len(sentences)
+        embeddings = self._encode(sentences)
+        with get_profiler().stage("cluster.transform", items=len(sentences)):
+            topics, _ = self.topic_model.transform(sentences, embeddings)
+        return [int(t) for t in topics]
+
+    def _raw_data_holders(self) -> dict[str, object]:
+        """
+        Helper method finds the fitted objects that keep their own copy of
+        the training embeddings (the UMAP reducer and its search index).
+        :return: Dict of str (k = holder name), object (v = holder).
+        """
+        umap_model = getattr(self.topic_model, "umap_model", None)
+        holders = {"umap": umap_model,
+                   "umap_index": getattr(umap_model, "_knn_search_index",
+                                         None)}
+        return {name: holder for name, holder in holders.items()
+                if getattr(holder, "_raw_data", None) is not None}
+
+    def save(self, run_dir: str | Path) -> Path:
+        """
+        Method saves the fitted cluster to a run directory, so it can be
+        reloaded without refitting. Embeddings are stored out-of-band as a
+        .npy file; copies of them held by the reducer are detached before
+        the topic model is pickled and reattached on load.
+        :param run_dir: Directory to write into; created if missing.
+        :return: Path of the run directory.
+        """
+        run_dir = Path(run_dir)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        embeddings = np.asarray(self.embeddings if self.embeddings is not
+                                None else np.empty((0, 0)), dtype=np.float32)
+        np.save(run_dir / EMBEDDINGS_FILE, embeddings)
+        if self.weights is not None:
+            np.save(run_dir / WEIGHTS_FILE, self.weights)
+        with open(run_dir / SENTENCES_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.sentences, f)
+        # the reducer was fitted on the sample rows only, if sampled
+        fit_embeddings = embeddings
+        if self.fit_index is not None:
+            np.save(run_dir / FIT_INDEX_FILE, self.fit_index)
+            fit_embeddings = embeddings[self.fit_index]
+        detached = {}
+        if self.topic_model is not None:
+            model = self.topic_model
+            holders = self._raw_data_holders()
+            for name, holder in holders.items():
+                # pickling the search index needs its raw data, so prepare
+                # the pickled state before the data is detached
+                if hasattr(holder, "__getstate__"):
+                    holder.__getstate__()
+                raw = holder._raw_data
+                if raw.shape[0] <= len(fit_embeddings) and np.array_equal(
+                        raw, _raw_data_view(holder, fit_embeddings,
+                                            raw.shape[0])):
+                    detached[name] = raw
+            # keep one row, which the search index needs when unpickled
+            for name, raw in detached.items():
+                holders[name]._raw_data = raw[:1].copy()
+            try:
+                with open(run_dir / MODEL_FILE, "wb") as f:
+                    pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            finally:
+                # restore the in-memory model so this cluster stays usable
+                for name, raw in detached.items():
+                    holders[name]._raw_data = raw
+        if self.hierarchy is not None:
+            self.hierarchy.to_pickle(run_dir / HIERARCHY_FILE)
+        manifest = {
+            "version": ARTIFACT_VERSION,
+            "st_model": ST_MODEL,
+            "n_sentences": len(self.sentences),
+            "sentences_hash": sentences_hash(self.sentences),
+            "seeds": self.seeds,
+            "sample_size": self.sample_size,
+            "sample_strategy": self.sample_strategy,
+            "reducer": self.reducer,
+            "quantize": self.quantize,
+            "pending_outliers": self.pending_outliers,
+            # rows of the embeddings to reattach to each detached holder
+            "detached": {name: int(raw.shape[0])
+                         for name, raw in detached.items()},
+        }
+        with open(run_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return run_dir
+
+    @classmethod
+    def load(cls, run_dir: str | Path, use_cache: bool = True,
+             encode_workers: int = 1) -> "Cluster":
+        """
+        Method loads a cluster saved with save, without refitting. The
+        embeddings are memory-mapped rather than read into memory.
+        :param run_dir: Directory written by save.
+        :param use_cache: Whether new sentences use the embedding cache.
+        :param encode_workers: Worker processes for encoding large inputs
+        of new sentences, as for __init__.
+        :return: Cluster object.
+        """
+        run_dir = Path(run_dir)
+        if not (run_dir / MANIFEST_FILE).is_file():
+            raise FileNotFoundError(f"No saved cluster found in {run_dir}")
+        with open(run_dir / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported cluster artifact version "
+                             f"{manifest.get('version')}")
+        if manifest.get("st_model") != ST_MODEL:
+            raise ValueError(f"Saved cluster was fitted with "
+                             f"{manifest.get('st_model')}, not {ST_MODEL}")
+        cluster = cls.__new__(cls)
+        with open(run_dir / SENTENCES_FILE, encoding="utf-8") as f:
+            cluster.sentences = json.load(f)
+        saved_hash = manifest.get("sentences_hash")
+        if saved_hash is not None and \
+                saved_hash != sentences_hash(cluster.sentences):
+            raise ValueError(f"Saved sentences in {run_dir} do not match "
+                             f"the manifest")
+        cluster.seeds = manifest["seeds"]
+        cluster.sample_size = manifest.get("sample_size")
+        cluster.sample_strategy = manifest.get("sample_strategy",
+                                               "stratified")
+        cluster.reducer = manifest.get("reducer", "umap")
+        # new sentences are encoded like the saved ones
+        cluster.quantize = manifest.get("quantize", False)
+        cluster._st_model = None
+        cluster.encode_workers = encode_workers
+        cluster.emb_cache = _embedding_cache(cluster.quantize) \
+            if use_cache else None
+        cluster.embeddings = np.load(run_dir / EMBEDDINGS_FILE,
+                                     mmap_mode="r")
+        cluster.pending_outliers = manifest["pending_outliers"]
+        cluster.weights = np.load(run_dir / WEIGHTS_FILE) \
+            if (run_dir / WEIGHTS_FILE).is_file() else None
+        cluster.fit_index = None
+        fit_embeddings = cluster.embeddings
+        if (run_dir / FIT_INDEX_FILE).is_file():
+            cluster.fit_index = np.load(run_dir / FIT_INDEX_FILE)
+            fit_embeddings = cluster.embeddings[cluster.fit_index]
+        cluster.topic_model = None
+        if (run_dir / MODEL_FILE).is_file():
+            with open(run_dir / MODEL_FILE, "rb") as f:
+                cluster.topic_model = pickle.load(f)
+            umap_model = cluster.topic_model.umap_model
+            holders = {"umap": umap_model,
+                       "umap_index": getattr(umap_model, "_knn_search_index",
+                                             None)}
+            for name, rows in manifest["detached"].items():
+                holder = holders[name]
+                holder._raw_data = _raw_data_view(holder, fit_embeddings,
+                                                  rows)
+                # the index search function binds its data when built
+                if hasattr(holder, "_init_search_function"):
+                    holder._init_search_function()
+        cluster.hierarchy = pd.read_pickle(run_dir / HIERARCHY_FILE) \
+            if (run_dir / HIERARCHY_FILE).is_file() else None
+        return cluster
+
+    @cached_property
+    def topic_table(self) -> pd.DataFrame:
+        """
+        Property extracts all per-topic data from the model in one pass into
+        a columnar table, memoized for the lifetime of the fitted model.
+        Outliers (topic -1) are excluded.
+        :return: Dataframe indexed by topic id, with columns name, count,
+        tags, rep_doc_idx (indices into sentences), feedback (sampled
+        representative docs) and parent_name.
+        """
+        info = self.topic_model.get_topic_info()
+        info = info[info["Topic"] != -1]
+        topic_ids = info["Topic"].astype(int).tolist()
+        topics = self.topic_model.get_topics()
+        rep_docs = self.topic_model.representative_docs_ or {}
+        # locate each representative doc in sentences with a single scan
+        wanted = {doc for t_id in topic_ids for doc in rep_docs.get(t_id, [])}
+        doc_idx = {}
+        for i, sentence in enumerate(self.sentences):
+            if sentence in wanted and sentence not in doc_idx:
+                doc_idx[sentence] = i
+        parents = self.parent_index if self.hierarchy is not None else {}
+        counts = info["Count"].astype(int)
+        if self.weights is not None:
+            # count the original rows each deduplicated sentence stands for
+            counts = pd.Series(self.weights).groupby(
+                np.asarray(self.topic_model.topics_)).sum().reindex(
+                topic_ids, fill_value=0)
+        table = pd.DataFrame({
+            "name": info["Name"].tolist(),
+            "count": counts.astype(int).tolist(),
+            "tags": [[w for w, _ in topics.get(t_id, [])]
+                     for t_id in topic_ids],
+            "rep_doc_idx": [[doc_idx[d] for d in rep_docs.get(t_id, [])
+                             if d in doc_idx] for t_id in topic_ids],
+            # sample only N_FEEDBACK feedback items
+            "feedback": [list(rep_docs.get(t_id, []))[:N_FEEDBACK]
+                         for t_id in topic_ids],
+            "parent_name": [parents.get(t_id) for t_id in topic_ids],
+        }, index=pd.Index(topic_ids, name="id"))
+        return table
+
     def package_model_data(self) -> dict[int, dict]:
         """
         Helper method packages data from the model into a simple data
         structure for use outside the Cluster object; used as input into
-        subtopic class objects.
+        subtopic class objects. Built from the memoized topic table.
         :return: Dict of int (k: topic id), dict (v: topic vals).
         """
-        topic_info = self.topic_model.get_topic_info()
-        # build a lookup so we can query topic name by id.
-        topic_name_lookup = dict(zip(topic_info["Topic"], topic_info["Name"]))
         data = {}
-        for topic_id in self.topic_model.get_topic_info()['Topic']:
-            # skip 'uncategorized' items
-            if topic_id == -1:
-                continue
-            feedback = self.topic_model.get_representative_docs(topic_id)
+        for topic_id, row in self.topic_table.to_dict("index").items():
             # build a data record for each topic id
             data[topic_id] = {
                 "id": topic_id,
-                "name": topic_name_lookup.get(topic_id),
-                "count": self.topic_model.get_topic_freq(topic_id),
-                "tags": [w for w, _ in self.topic_model.get_topic(topic_id)],
-                "feedback": feedback[:4] # sample only 4 feedback items
+                "name": row["name"],
+                "count": row["count"],
+                "tags": row["tags"],
+                "feedback": row["feedback"]
             }
         return data
 
@@ -123,32 +852,43 @@ class Cluster:
         # return pd.Series(topics, index=self.df.index)
         return pd.Series(topics, index=ind)
 
+    @cached_property
+    def parent_index(self) -> dict[int, str]:
+        """
+        Property maps every topic (subtopic) id to its parent topic name,
+        built once from the topic hierarchy in a single vectorized pass.
+        The parent for a topic is the matching hierarchy row with the
+        shortest Topics list (closest alignment), ties broken by lowest
+        Parent_ID, then by row order.
+        :return: Dict of int (k: topic id), str (v: parent topic name).
+        """
+        rows = self.hierarchy[["Topics", "Parent_ID", "Parent_Name"]].copy()
+        # a smaller list implies closer alignment with fewer other subtopics
+        rows["n_topics"] = rows["Topics"].apply(len)
+        rows["row"] = np.arange(len(rows))
+        pairs = rows.explode("Topics").dropna(subset=["Topics"])
+        pairs = pairs.sort_values(by=["Topics", "n_topics", "Parent_ID",
+                                      "row"], kind="stable")
+        # the first row per topic is its minimal enclosing parent
+        first = pairs.drop_duplicates(subset="Topics", keep="first")
+        return dict(zip(first["Topics"].astype(int), first["Parent_Name"]))
+
     def assign_topic(self, t_id: int) -> None | str:
         """
         Method returns parent topic name for a given topic (subtopic) id,
         based on hierarchical matching rules found in the topic model.
-        :param t_id:
-        :return:
-        """
-        # select matching rows where t_id appears in Topics
-        condition = self.hierarchy['Topics'].apply(lambda x: t_id in x)
-        matching_rows = self.hierarchy.loc[condition]
-        # if no matching rows found, simply quit
-        if matching_rows.empty:
-            return None
-        # find the minimum list length among matching rows; this implies
-        # closer topic alignment (a larger list implies greater presence of
-        # other subtopics).
-        min_len = matching_rows['Topics'].apply(len).min()
-        # get all rows with the minimum length
-        smallest_rows = matching_rows[matching_rows
-                                      ['Topics'].apply(len) == min_len]
-
-        # if multiple rows tie, pick one deterministically by sorting and
-        # picking the first item
-        if len(smallest_rows) > 1:
-            smallest_rows = smallest_rows.sort_values(by='Parent_ID',
-                                                        ascending=True)
-        parent_name = smallest_rows.iloc[0]['Parent_Name']
-        return parent_name
+        :param t_id: Topic (subtopic) id.
+        :return: Parent topic name, or None if t_id is not in the hierarchy.
+        """
+        return self.parent_index.get(t_id)
 
+    def assign_topics(self, t_ids) -> dict[int, None | str]:
+        """
+        Method returns parent topic names for many topic (subtopic) ids at
+        once, using the precomputed parent index.
+        :param t_ids: Iterable of topic (subtopic) ids.
+        :return: Dict of int (k: topic id), str (v: parent topic name, or
+        None if not in the hierarchy).
+        """
+        index = self.parent_index
+        return {t_id: index.get(t_id) for t_id in t_ids}
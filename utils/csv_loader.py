@@ -1,22 +1,115 @@
 """
 Class defines CSVLoader, which loads a given CSV at fpath into a dataframe.
+Parquet and JSON Lines files are loaded through the same interface.
 """
+# == Standard Library imports ==
+import importlib.util
+import json
+from pathlib import Path
+from typing import Iterator
+
 # == Third party imports ==
 import pandas as pd
-from pathlib import Path
+
+# constant for supported file types
+SUPPORTED_TYPES = (".csv", ".parquet", ".jsonl")
+# constant for default number of rows per streamed chunk
+CHUNK_SIZE = 100_000
+# pyarrow is optional; when present it backs CSV parsing and string columns
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
 
 class CSVLoader:
     def __init__(self, fpath: str):
         self.filepath = Path(fpath)
+        self.suffix = self.filepath.suffix.lower()
 
-    def load(self) -> pd.DataFrame:
+    def _validate(self) -> None:
         """
-        Method validates the given filepath and loads a stored CSV at that
-        location as a dataframe.
-        :return: Dataframe object of loaded CSV.
+        Helper method validates that the given filepath exists and is of a
+        supported file type.
         """
         if not self.filepath.exists():
-            raise FileNotFoundError(f"CSV file not found: {self.filepath}")
-        if not self.filepath.suffix.lower() == ".csv":
+            raise FileNotFoundError(f"{self.suffix.lstrip('.').upper()} "
+                                    f"file not found: {self.filepath}")
+        if self.suffix not in SUPPORTED_TYPES:
             raise ValueError(f"Invalid file type: {self.filepath.suffix}")
-        return pd.read_csv(self.filepath)
\ No newline at end of file
+
+    def _string_dtype(self, columns: list[str] | None) -> dict | None:
+        """
+        Helper method returns the dtype mapping used for selected columns;
+        selected columns hold feedback text, so are read as strings.
+        :param columns: Selected column names, or None for all columns.
+        :return: Dict of column name to string dtype, or None.
+        """
+        if columns is None:
+            return None
+        dtype = "string[pyarrow]" if HAS_PYARROW else "string"
+        return {col: dtype for col in columns}
+
+    def get_columns(self) -> list[str]:
+        """
+        Method returns the column names of the file without loading its
+        rows.
+        :return: List of column names.
+        """
+        self._validate()
+        if self.suffix == ".parquet":
+            import pyarrow.parquet as pq
+            return pq.read_schema(self.filepath).names
+        if self.suffix == ".jsonl":
+            with open(self.filepath, encoding="utf-8") as f:
+                first = next((line for line in f if line.strip()), "{}")
+            return list(json.loads(first))
+        return list(pd.read_csv(self.filepath, nrows=0).columns)
+
+    def load(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        Method validates the given filepath and loads a stored CSV at that
+        location as a dataframe. If columns are given, only those columns
+        are read, as string dtype.
+        :param columns: Optional list of column names to read.
+        :return: Dataframe object of loaded CSV.
+        """
+        self._validate()
+        dtype = self._string_dtype(columns)
+        if self.suffix == ".parquet":
+            df = pd.read_parquet(self.filepath, columns=columns)
+            return df.astype(dtype) if dtype else df
+        if self.suffix == ".jsonl":
+            df = pd.read_json(self.filepath, lines=True, dtype=False)
+            return df[columns].astype(dtype) if columns else df
+        if columns is not None and HAS_PYARROW:
+            return pd.read_csv(self.filepath, usecols=columns, dtype=dtype,
+                               engine="pyarrow")
+        return pd.read_csv(self.filepath, usecols=columns, dtype=dtype)
+
+    def iter_chunks(self, columns: list[str] | None = None,
+                    chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Method streams the file as a generator of dataframes of at most
+        chunksize rows, so large files never need to be fully in memory.
+        :param columns: Optional list of column names to read.
+        :param chunksize: Number of rows per chunk.
+        :return: Generator of dataframe chunks.
+        """
+        self._validate()
+        dtype = self._string_dtype(columns)
+        if self.suffix == ".parquet":
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(self.filepath).iter_batches(
+                batch_size=chunksize, columns=columns)
+            for batch in batches:
+                df = batch.to_pandas()
+                yield df.astype(dtype) if dtype else df
+            return
+        if self.suffix == ".jsonl":
+            reader = pd.read_json(self.filepath, lines=True, dtype=False,
+                                  chunksize=chunksize)
+            with reader:
+                for df in reader:
+                    yield df[columns].astype(dtype) if columns else df
+            return
+        # pyarrow engine does not stream, so chunks use the C parser
+        with pd.read_csv(self.filepath, usecols=columns, dtype=dtype,
+                         chunksize=chunksize) as reader:
+            yield from reader
@@ -0,0 +1,232 @@
+"""
+Class defines Deduplicator, which collapses exact (after normalization) and,
+optionally, near-duplicate feedback (MinHash / LSH) before embedding and
+sentiment scoring, keeping multiplicity weights so results can be expanded
+back to every original row.
+"""
+# == Standard Library imports ==
+import string
+import zlib
+from pathlib import Path
+
+# == Third party imports ==
+import numpy as np
+
+# == Local imports ==
+from .cache_utils import normalize_text
+
+# constant for estimated Jaccard similarity at which texts are merged
+NEAR_DUP_THRESHOLD = 0.8
+# constant for number of words per shingle hashed by MinHash
+SHINGLE_WORDS = 3
+# constants for MinHash signature length and LSH bands; 8 bands of 8 rows
+# make texts at the threshold collide in at least one band ~90% of the time
+NUM_PERM = 64
+LSH_BANDS = 8
+# constant for shingles hashed per vectorized signature chunk
+SIGNATURE_CHUNK = 250_000
+# constant for seed of the MinHash permutations
+MINHASH_SEED = 42
+
+def dedup_key(text: str) -> str:
+    """
+    Helper method builds the key under which texts count as exact
+    duplicates: normalized whitespace and unicode form, case folded, with
+    surrounding punctuation removed (so "Great product!" matches "great
+    product").
+    :param text: Feedback string.
+    :return: Key string.
+    """
+    return normalize_text(text).casefold().strip(string.punctuation + " ")
+
+def _shingles(text: str) -> list[int]:
+    """
+    Helper method hashes the overlapping SHINGLE_WORDS-word runs of a text;
+    shorter texts form a single shingle.
+    :param text: Feedback string.
+    :return: List of 32-bit shingle hashes; empty for an empty text.
+    """
+    words = dedup_key(text).split()
+    if not words:
+        return []
+    n_runs = max(1, len(words) - SHINGLE_WORDS + 1)
+    return [zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode())
+            for i in range(n_runs)]
+
+def minhash_signatures(texts: list[str]) -> np.ndarray:
+    """
+    Helper method computes MinHash signatures, using NUM_PERM seeded
+    multiply-shift hash functions over each text's shingles.
+    :param texts: List of feedback strings.
+    :return: Array of shape (n, NUM_PERM), uint64; all-max rows for texts
+    without shingles.
+    """
+    rng = np.random.default_rng(MINHASH_SEED)
+    a = rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+    signatures = np.full((len(texts), NUM_PERM), np.iinfo(np.uint64).max,
+                         dtype=np.uint64)
+    start = 0
+    while start < len(texts):
+        # gather docs until the chunk holds SIGNATURE_CHUNK shingles
+        hashes, offsets, docs = [], [], []
+        end = start
+        while end < len(texts) and len(hashes) < SIGNATURE_CHUNK:
+            shingles = _shingles(texts[end])
+            if shingles:
+                offsets.append(len(hashes))
+                docs.append(end)
+                hashes.extend(shingles)
+            end += 1
+        if hashes:
+            x = np.asarray(hashes, dtype=np.uint64)
+            # multiply-shift hashing; uint64 products wrap by design
+            with np.errstate(over="ignore"):
+                permuted = (a[None, :] * x[:, None] + b[None, :]) >> \
+                    np.uint64(32)
+            signatures[docs] = np.minimum.reduceat(permuted, offsets, axis=0)
+        start = end
+    return signatures
+
+class Deduplicator:
+    """
+    Class for Deduplicator object, maps feedback rows onto unique texts.
+    The first occurrence of each group is kept as its representative, and
+    per-unique weights count the rows it stands for.
+    """
+    def __init__(self, texts: list[str], near: bool = False,
+                 threshold: float = NEAR_DUP_THRESHOLD):
+        self.near = near
+        self.threshold = threshold
+        # representative texts, and rows each stands for
+        self.unique: list[str] = []
+        self.weights = np.zeros(0, dtype=np.int64)
+        # unique index per original row
+        self.inverse = np.zeros(0, dtype=np.int64)
+        # exact-duplicate key to unique index, for appended rows
+        self._keys: dict[str, int] = {}
+        self.append(texts)
+        if near:
+            self._collapse_near()
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.inverse)
+
+    @property
+    def saved_share(self) -> float:
+        """
+        Property returns the share of rows that need no model work.
+        :return: 1 - unique / rows; 0 for no rows.
+        """
+        return 1 - len(self.unique) / self.n_rows if self.n_rows else 0.0
+
+    def append(self, texts: list[str]) -> list[str]:
+        """
+        Method adds rows, collapsing exact duplicates of earlier rows.
+        :param texts: List of feedback strings.
+        :return: Texts that are new unique entries, in order.
+        """
+        n_before = len(self.unique)
+        inverse = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            key = dedup_key(text)
+            idx = self._keys.get(key)
+            if idx is None:
+                idx = self._keys[key] = len(self.unique)
+                self.unique.append(text)
+            inverse[i] = idx
+        self.inverse = np.concatenate([self.inverse, inverse])
+        self.weights = np.bincount(self.inverse,
+                                   minlength=len(self.unique))
+        return self.unique[n_before:]
+
+    def _collapse_near(self) -> None:
+        """
+        Method merges unique texts whose estimated Jaccard similarity is at
+        least the threshold. Texts sharing an LSH band bucket are compared
+        with the bucket's first text, and merged groups are the connected
+        components of the accepted pairs.
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+        n_unique = len(self.unique)
+        if n_unique < 2:
+            return
+        signatures = minhash_signatures(self.unique)
+        has_shingles = signatures[:, 0] != np.iinfo(np.uint64).max
+        rows = NUM_PERM // LSH_BANDS
+        pairs = []
+        for band in range(LSH_BANDS):
+            cols = signatures[:, band * rows:(band + 1) * rows]
+            keys = np.ascontiguousarray(cols).view(
+                np.dtype((np.void, rows * 8))).ravel()
+            _, bucket = np.unique(keys, return_inverse=True)
+            order = np.argsort(bucket, kind="stable")
+            order = order[has_shingles[order]]
+            sorted_bucket = bucket[order]
+            # first member of each bucket, broadcast over the bucket
+            starts = np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]]
+            first = order[np.maximum.accumulate(
+                np.where(starts, np.arange(len(order)), 0))]
+            similar = (signatures[order] == signatures[first]).mean(
+                axis=1) >= self.threshold
+            keep = similar & (order != first)
+            pairs.append(np.stack([first[keep], order[keep]]))
+        pairs = np.concatenate(pairs, axis=1)
+        if not pairs.size:
+            return
+        graph = coo_matrix((np.ones(pairs.shape[1]), (pairs[0], pairs[1])),
+                           shape=(n_unique, n_unique))
+        _, labels = connected_components(graph, directed=False)
+        # keep the earliest text of each group, in first-occurrence order
+        representative = np.full(labels.max() + 1, n_unique)
+        np.minimum.at(representative, labels, np.arange(n_unique))
+        rank = np.empty(len(representative), dtype=np.int64)
+        rank[np.argsort(representative)] = np.arange(len(representative))
+        remap = rank[labels]
+        self.unique = [self.unique[i] for i in np.sort(representative)]
+        self.inverse = remap[self.inverse]
+        self.weights = np.bincount(self.inverse,
+                                   minlength=len(self.unique))
+        self._keys = {key: int(remap[idx])
+                      for key, idx in self._keys.items()}
+
+    def save(self, fpath: str | Path) -> None:
+        """
+        Method saves the row mapping and duplicate keys, so feedback can be
+        appended in a later process. The unique texts are not saved; they
+        are the sentences of the saved cluster.
+        :param fpath: Output .npz path.
+        """
+        np.savez(fpath, inverse=self.inverse,
+                 keys=np.array(list(self._keys), dtype=str),
+                 index=np.fromiter(self._keys.values(), dtype=np.int64,
+                                   count=len(self._keys)),
+                 near=self.near, threshold=self.threshold)
+
+    @classmethod
+    def load(cls, fpath: str | Path, unique: list[str]) -> "Deduplicator":
+        """
+        Method restores a deduplicator saved with save.
+        :param fpath: Path written by save.
+        :param unique: Unique texts, in order.
+        :return: Deduplicator object.
+        """
+        state = np.load(fpath)
+        dedup = cls([], near=bool(state["near"]),
+                    threshold=float(state["threshold"]))
+        dedup.unique = list(unique)
+        dedup.inverse = state["inverse"]
+        dedup.weights = np.bincount(dedup.inverse, minlength=len(unique))
+        dedup._keys = dict(zip(state["keys"].tolist(),
+                               state["index"].tolist()))
+        return dedup
+
+    def expand(self, values) -> np.ndarray:
+        """
+        Method expands per-unique values back to one value per row.
+        :param values: Sequence of one value per unique text.
+        :return: Array of one value per original row.
+        """
+        return np.asarray(values)[self.inverse]
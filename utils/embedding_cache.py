@@ -0,0 +1,260 @@
+"""
+Class defines EmbeddingCache, a persistent content-addressed store of
+sentence embeddings so only previously unseen texts are encoded.
+"""
+# == Standard Library imports ==
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+# == Third party imports ==
+import numpy as np
+
+# == Local imports ==
+from .cache_utils import content_hash, get_cache_dir, normalize_text
+
+# constant for default maximum number of cached embeddings (rows)
+EMB_MAX_ROWS = 1_000_000
+# constant for on-disk layout version, bumped when the format changes
+EMB_CACHE_VERSION = 2
+# file names within the cache directory
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.f32"
+KEYS_FILE = "keys.s32"
+STAMPS_FILE = "stamps.i64"
+# constant for index files of layout version 1, removed on invalidation
+LEGACY_FILES = ("keys.npy", "stamps.npy")
+# constants for the record types of the keys and stamps files
+KEY_DTYPE = np.dtype("S32")
+STAMP_DTYPE = np.dtype(np.int64)
+
+class EmbeddingCache:
+    """
+    Class for EmbeddingCache object, stores embeddings in a memory-mapped
+    float32 matrix keyed by a hash of (model name, normalized text), with a
+    hash -> row index. Least recently used rows are evicted once the store
+    exceeds its row limit, and the store is invalidated whenever the model
+    name or embedding dimension changes.
+    Vectors, keys and recency stamps are fixed-size records in raw files,
+    written in place at their row's offset, so a call only writes the rows
+    it adds or touches. The row count in the metadata file is written last
+    and marks the committed rows: anything past it, e.g. left by a crash
+    mid-append, is dropped on load.
+    """
+    def __init__(self, model_name: str, cache_dir: str | Path | None = None,
+                 max_rows: int = EMB_MAX_ROWS):
+        self.model_name = model_name
+        self.max_rows = max_rows
+        self.path = Path(cache_dir) if cache_dir else get_cache_dir(
+            "embeddings")
+        self.path.mkdir(parents=True, exist_ok=True)
+        # store is opened lazily, on first lookup
+        self.dim: int | None = None
+        self.clock = 0
+        self.index: dict[str, int] = {}
+        self.keys: list[str] = []
+        self.stamps: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._loaded = False
+
+    def _load(self) -> None:
+        """
+        Helper method reads cache metadata and index from disk, discarding
+        the store if it was written for a different model or format.
+        """
+        self._loaded = True
+        meta_path = self.path / META_FILE
+        if not meta_path.exists():
+            # clear any partial store left without metadata
+            self.invalidate()
+            return
+        meta = json.loads(meta_path.read_text())
+        if (meta.get("version") != EMB_CACHE_VERSION
+                or meta.get("model") != self.model_name):
+            self.invalidate()
+            return
+        rows, dim = meta["rows"], meta["dim"]
+        if not self._trim(rows, dim):
+            self.invalidate()
+            return
+        self.dim = dim
+        self.clock = meta["clock"]
+        self.keys = np.fromfile(self.path / KEYS_FILE, dtype=KEY_DTYPE,
+                                count=rows).astype(str).tolist()
+        self.stamps = np.fromfile(self.path / STAMPS_FILE,
+                                  dtype=STAMP_DTYPE, count=rows)
+        self.index = {k: row for row, k in enumerate(self.keys)}
+
+    def _trim(self, rows: int, dim: int | None) -> bool:
+        """
+        Helper method checks the data files hold the committed rows, and
+        truncates any uncommitted rows past them.
+        :param rows: Number of committed rows.
+        :param dim: Embedding dimension (None if no rows).
+        :return: False if a file is missing rows, i.e. the store is damaged.
+        """
+        sizes = {VECTORS_FILE: rows * (dim or 0) * 4,
+                 KEYS_FILE: rows * KEY_DTYPE.itemsize,
+                 STAMPS_FILE: rows * STAMP_DTYPE.itemsize}
+        for name, size in sizes.items():
+            path = self.path / name
+            actual = path.stat().st_size if path.exists() else 0
+            if actual < size:
+                return False
+            if actual > size:
+                os.truncate(path, size)
+        return True
+
+    def _save(self) -> None:
+        """
+        Helper method writes cache metadata, committing the rows written so
+        far. The file is replaced atomically.
+        """
+        meta = {
+            "version": EMB_CACHE_VERSION,
+            "model": self.model_name,
+            "dim": self.dim,
+            "rows": len(self.keys),
+            "clock": self.clock
+        }
+        tmp_path = self.path / (META_FILE + ".tmp")
+        tmp_path.write_text(json.dumps(meta))
+        tmp_path.replace(self.path / META_FILE)
+
+    def _write_rows(self, name: str, start: int, records: np.ndarray
+                    ) -> None:
+        """
+        Helper method writes records into a data file at the offset of row
+        start, dropping anything past them.
+        :param name: Data file name.
+        :param start: Row of the first record.
+        :param records: Array of records, one row each.
+        """
+        path = self.path / name
+        row_bytes = records.nbytes // len(records) if len(records) else 0
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.seek(start * row_bytes)
+            f.write(records.tobytes())
+            f.truncate()
+
+    def _write_stamps(self, rows: np.ndarray) -> None:
+        """
+        Helper method writes the recency stamps of the given rows in place.
+        :param rows: Array of row indices.
+        """
+        stamps = np.memmap(self.path / STAMPS_FILE, dtype=STAMP_DTYPE,
+                           mode="r+", shape=(len(self.keys),))
+        stamps[rows] = self.stamps[rows]
+        stamps.flush()
+
+    def _vectors(self) -> np.ndarray:
+        """
+        Helper method memory-maps the stored embedding matrix (read-only).
+        :return: Memory-mapped float32 array of shape (rows, dim).
+        """
+        if not self.keys:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.memmap(self.path / VECTORS_FILE, dtype=np.float32,
+                         mode="r", shape=(len(self.keys), self.dim))
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return len(self.keys)
+
+    def invalidate(self) -> None:
+        """
+        Method discards every cached embedding, e.g. after the sentence
+        transformer model changes.
+        """
+        # metadata first, so a partly cleared store is never loaded
+        for name in (META_FILE, VECTORS_FILE, KEYS_FILE, STAMPS_FILE,
+                     *LEGACY_FILES):
+            (self.path / name).unlink(missing_ok=True)
+        self.dim = None
+        self.clock = 0
+        self.index = {}
+        self.keys = []
+        self.stamps = np.zeros(0, dtype=np.int64)
+
+    def get_or_encode(self, texts: list[str],
+                      encode_fn: Callable[[list[str]], np.ndarray]
+                      ) -> np.ndarray:
+        """
+        Given texts and an encoding function, method returns an embedding
+        per text, encoding only texts not already present in the store and
+        persisting the new embeddings for later runs.
+        :param texts: List of text strings to embed.
+        :param encode_fn: Function encoding a list of strings into a 2D
+        array of embeddings.
+        :return: Float32 array of shape (len(texts), dim).
+        """
+        if not self._loaded:
+            self._load()
+        keys = [content_hash(self.model_name, normalize_text(t))
+                for t in texts]
+        # collect the first text for each unseen key, encoding each once
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self.index and key not in missing:
+                missing[key] = text
+        if missing:
+            self._append(list(missing), encode_fn(list(missing.values())))
+        # mark every requested row as most recently used
+        self.clock += 1
+        rows = np.fromiter((self.index[k] for k in keys), dtype=np.int64,
+                           count=len(keys))
+        self.stamps[rows] = self.clock
+        out = np.asarray(self._vectors()[rows], dtype=np.float32)
+        if len(self.keys) > self.max_rows:
+            self._evict()
+        elif len(rows):
+            self._write_stamps(rows)
+        self._save()
+        return out
+
+    def _append(self, keys: list[str], embeddings: np.ndarray) -> None:
+        """
+        Helper method appends newly encoded embeddings to the store, writing
+        each data file at the offset of the first new row; they become
+        visible to later loads once _save commits them.
+        :param keys: Content hashes for the new embeddings.
+        :param embeddings: 2D array of new embeddings, aligned with keys.
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} "
+                             f"does not match cached dimension {self.dim}")
+        start = len(self.keys)
+        stamps = np.zeros(len(keys), dtype=STAMP_DTYPE)
+        self._write_rows(VECTORS_FILE, start, embeddings)
+        self._write_rows(KEYS_FILE, start, np.array(keys, dtype=KEY_DTYPE))
+        self._write_rows(STAMPS_FILE, start, stamps)
+        for offset, key in enumerate(keys):
+            self.index[key] = start + offset
+        self.keys.extend(keys)
+        self.stamps = np.concatenate([self.stamps, stamps])
+
+    def _evict(self) -> None:
+        """
+        Helper method drops the least recently used rows so the store holds
+        at most max_rows embeddings, compacting every data file on disk.
+        The metadata is removed while the files are replaced, so a crash
+        part way through leaves an empty store rather than mismatched files.
+        """
+        # stable sort on recency keeps the newest max_rows rows
+        keep = np.sort(np.argsort(-self.stamps, kind="stable")[:self.max_rows])
+        vectors = np.array(self._vectors()[keep])
+        self.keys = [self.keys[i] for i in keep]
+        self.stamps = self.stamps[keep]
+        self.index = {k: row for row, k in enumerate(self.keys)}
+        (self.path / META_FILE).unlink(missing_ok=True)
+        for name, records in ((VECTORS_FILE, vectors),
+                              (KEYS_FILE, np.array(self.keys,
+                                                   dtype=KEY_DTYPE)),
+                              (STAMPS_FILE, self.stamps)):
+            tmp_path = self.path / (name + ".tmp")
+            records.tofile(tmp_path)
+            tmp_path.replace(self.path / name)
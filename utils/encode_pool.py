@@ -0,0 +1,138 @@
+"""
+Class defines EncodePool, which encodes sentences across a pool of worker
+processes, each holding its own sentence transformer and a pinned number
+of threads, so encoding large corpora uses every CPU core.
+"""
+# == Standard Library imports ==
+import multiprocessing
+import os
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Any, Callable
+
+# == Third party imports ==
+# torch is imported in the workers, when their model loads
+import numpy as np
+
+# constant for torch threads per worker; a few threads per model encode
+# faster than one, and far fewer models need loading than one per core
+ENCODE_WORKER_THREADS = 4
+# constant for sentences per chunk sent to a worker
+ENCODE_CHUNK_SIZE = 2_048
+# environment variables pinning the BLAS / OpenMP thread pools
+THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# model of this worker process, loaded once by _init_worker
+_MODEL = None
+
+def default_workers(threads: int = ENCODE_WORKER_THREADS) -> int:
+    """
+    Helper method picks the number of workers that fills every core with
+    threads-thread workers.
+    :param threads: Threads per worker.
+    :return: Number of workers, at least 1.
+    """
+    return max(1, (os.cpu_count() or 1) // threads)
+
+def _init_worker(loader: Callable[[], Any], threads: int) -> None:
+    """
+    Helper method pins the thread count of a worker process, then loads its
+    model. Runs once per worker, before any chunk.
+    :param loader: Callable that loads the sentence transformer.
+    :param threads: Threads the worker may use.
+    """
+    global _MODEL
+    for name in THREAD_ENV:
+        os.environ[name] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _MODEL = loader()
+
+def _encode_chunk(sentences: list[str]) -> np.ndarray:
+    """
+    Helper method encodes one chunk with this worker's model.
+    :param sentences: List of sentences.
+    :return: 2D float32 array of embeddings.
+    """
+    return np.asarray(_MODEL.encode(sentences, show_progress_bar=False),
+                      dtype=np.float32)
+
+class EncodePool:
+    """
+    Class for EncodePool object, shards sentences into chunks, encodes them
+    on a pool of worker processes and writes each chunk into one
+    preallocated embedding array as it completes. Use as a context manager
+    so the workers (and their models) are released when done; on an error
+    or interrupt, pending chunks are cancelled and the workers stopped.
+    If on_chunk is given, it is called with the size of each chunk as it
+    completes.
+    """
+    def __init__(self, loader: Callable[[], Any],
+                 n_workers: int | None = None,
+                 threads: int = ENCODE_WORKER_THREADS,
+                 chunk_size: int = ENCODE_CHUNK_SIZE,
+                 on_chunk: Callable[[int], None] | None = None):
+        self.loader = loader
+        self.n_workers = n_workers or default_workers(threads)
+        self.threads = threads
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "EncodePool":
+        # spawn, as forking a process with live torch threads can deadlock
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(self.loader, self.threads))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(cancel=exc_type is not None)
+
+    def close(self, cancel: bool = False) -> None:
+        """
+        Method shuts the pool down, waiting for the workers to exit.
+        :param cancel: If set, cancel pending chunks and stop workers that
+        are still encoding rather than let them finish.
+        """
+        if self.pool is None:
+            return None
+        if cancel:
+            # the executor cannot interrupt running chunks, so stop the
+            # worker processes directly
+            processes = list((self.pool._processes or {}).values())
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+        self.pool.shutdown(wait=True)
+        self.pool = None
+
+    def encode(self, sentences: list[str]) -> np.ndarray:
+        """
+        Method encodes sentences on the pool, in order.
+        :param sentences: List of sentences.
+        :return: 2D float32 array of embeddings, aligned with sentences.
+        """
+        if self.pool is None:
+            raise RuntimeError("EncodePool must be entered before encoding")
+        n = len(sentences)
+        futures = {
+            self.pool.submit(_encode_chunk,
+                             sentences[start:start + self.chunk_size]): start
+            for start in range(0, n, self.chunk_size)}
+        out = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+            for future in done:
+                chunk = future.result()
+                if out is None:
+                    out = np.empty((n, chunk.shape[1]), dtype=np.float32)
+                start = futures[future]
+                out[start:start + len(chunk)] = chunk
+                if self.on_chunk is not None:
+                    self.on_chunk(len(chunk))
+        return out if out is not None else np.empty((0, 0), np.float32)
@@ -0,0 +1,182 @@
+"""
+Class defines LLMPool, which runs replicas of the LLM in worker processes,
+each with its share of the cores, and feeds them prompts through a shared
+work queue so every replica stays busy until the queue is drained.
+"""
+# == Standard Library imports ==
+import multiprocessing
+import os
+import queue
+from typing import Any, Callable, Hashable
+
+# constant for seconds between checks that replicas are still alive
+POLL_S = 5.0
+# constant for seconds a replica gets to exit before it is stopped
+JOIN_TIMEOUT_S = 30.0
+# environment variables pinning the BLAS / OpenMP thread pools
+THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+def _generate(pipe: Any, batch: list[tuple[Hashable, list]],
+              gen_kwargs: dict) -> list[tuple[Hashable, str | None]]:
+    """
+    Helper method generates replies for a batch of jobs; a failing batch
+    falls back to one call per job, so an error only affects its own job.
+    :param pipe: Text generation pipeline.
+    :param batch: List of (job id, messages) tuples.
+    :param gen_kwargs: Generation settings.
+    :return: List of (job id, reply) tuples; reply is None on failure.
+    """
+    # imported here, as the summary module imports this one
+    from .summary import _read_output
+    try:
+        outputs = pipe([messages for _, messages in batch],
+                       batch_size=len(batch), **gen_kwargs)
+        return [(job_id, _read_output(output))
+                for (job_id, _), output in zip(batch, outputs)]
+    except Exception:
+        if len(batch) == 1:
+            return [(batch[0][0], None)]
+    return [reply for job in batch
+            for reply in _generate(pipe, [job], gen_kwargs)]
+
+def _replica(loader: Callable[[], Any], threads: int, gen_kwargs: dict,
+             batch_size: int, jobs: multiprocessing.Queue,
+             results: multiprocessing.Queue) -> None:
+    """
+    Helper method is the body of one replica process: it pins its thread
+    count, loads the model, then takes up to batch_size jobs at a time from
+    the work queue until it receives None.
+    :param loader: Callable that loads the text generation pipeline.
+    :param threads: Threads the replica may use.
+    :param gen_kwargs: Generation settings.
+    :param batch_size: Most jobs generated together.
+    :param jobs: Queue of (job id, messages) tuples, or None to exit.
+    :param results: Queue receiving (job id, reply, generated tokens)
+    tuples.
+    """
+    # imported here, as the summary module imports this one
+    from .summary import _reply_tokens
+    for name in THREAD_ENV:
+        os.environ[name] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    pipe = loader()
+    tokenizer = getattr(pipe, "tokenizer", None)
+    stop = False
+    while not stop:
+        job = jobs.get()
+        if job is None:
+            break
+        batch = [job]
+        # batch whatever else is already queued, without waiting for it
+        while len(batch) < batch_size:
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                stop = True
+                break
+            batch.append(job)
+        for job_id, reply in _generate(pipe, batch, gen_kwargs):
+            tokens = _reply_tokens(tokenizer, reply) if reply else 0
+            results.put((job_id, reply, tokens))
+
+class LLMPool:
+    """
+    Class for LLMPool object, a pool of LLM replica processes sharing one
+    work queue. Jobs carry an id and results are returned by id, so they
+    can be written back to their topic or subtopic in any completion order.
+    Use as a context manager, or call close, to stop the replicas.
+    """
+    def __init__(self, loader: Callable[[], Any], n_replicas: int,
+                 threads: int | None = None, gen_kwargs: dict | None = None,
+                 batch_size: int = 1):
+        self.loader = loader
+        self.n_replicas = n_replicas
+        # split the cores evenly unless a per-replica budget is given
+        self.threads = threads or max(1, (os.cpu_count() or 1) // n_replicas)
+        self.gen_kwargs = dict(gen_kwargs or {})
+        self.batch_size = batch_size
+        self.workers: list[multiprocessing.Process] = []
+        self.jobs = None
+        self.results = None
+
+    def start(self) -> "LLMPool":
+        """
+        Method starts the replica processes; each loads its model in the
+        background while jobs are queued.
+        :return: Self.
+        """
+        # spawn, as forking a process with live torch threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        self.jobs, self.results = context.Queue(), context.Queue()
+        self.workers = [
+            context.Process(target=_replica, name=f"llm-replica-{i}",
+                            args=(self.loader, self.threads, self.gen_kwargs,
+                                  self.batch_size, self.jobs, self.results),
+                            daemon=True)
+            for i in range(self.n_replicas)]
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def __enter__(self) -> "LLMPool":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(cancel=exc_type is not None)
+
+    def generate(self, jobs: dict[Hashable, list[dict]],
+                 on_reply: Callable[[Hashable, int], None] | None = None
+                 ) -> dict[Hashable, str | None]:
+        """
+        Method queues jobs for the replicas and waits for every reply.
+        :param jobs: Dict of job id to bundled chat messages, in the order
+        they should be taken up.
+        :param on_reply: Callable taking the job id and the number of tokens
+        generated, called as each reply arrives.
+        :return: Dict of job id to reply; None where generation failed.
+        """
+        if not self.workers:
+            self.start()
+        for job in jobs.items():
+            self.jobs.put(job)
+        replies = {}
+        try:
+            while len(replies) < len(jobs):
+                try:
+                    job_id, reply, tokens = self.results.get(
+                        timeout=POLL_S)
+                except queue.Empty:
+                    if not all(w.is_alive() for w in self.workers):
+                        raise RuntimeError("An LLM replica exited "
+                                           "unexpectedly")
+                    continue
+                replies[job_id] = reply
+                if on_reply is not None:
+                    on_reply(job_id, tokens)
+        except BaseException:
+            # queued jobs would otherwise outlive this call
+            self.close(cancel=True)
+            raise
+        return replies
+
+    def close(self, cancel: bool = False) -> None:
+        """
+        Method stops the replicas, letting them finish their current batch.
+        :param cancel: If set, stop them immediately instead.
+        """
+        if not cancel:
+            for _ in self.workers:
+                self.jobs.put(None)
+            for worker in self.workers:
+                worker.join(JOIN_TIMEOUT_S)
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.workers = []
@@ -0,0 +1,159 @@
+"""
+Class defines ModelRegistry, which loads models (embedding, sentiment,
+LLM) only when first needed, shares them process-wide across runs, and
+evicts least recently used models to stay within a RAM budget.
+"""
+# == Standard Library imports ==
+import gc
+import os
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable
+
+# == Local imports ==
+from .profiler import get_profiler
+
+# environment variable that sets the model RAM budget in megabytes
+BUDGET_ENV = "FSA_MODEL_BUDGET_MB"
+# constant for share of physical memory models may use by default
+BUDGET_SHARE = 0.6
+
+def _default_budget_mb() -> float:
+    """
+    Helper method resolves the model RAM budget, honouring the
+    FSA_MODEL_BUDGET_MB environment variable when set, otherwise a share of
+    physical memory (unlimited if that cannot be determined).
+    :return: Budget in megabytes.
+    """
+    if os.getenv(BUDGET_ENV):
+        return float(os.environ[BUDGET_ENV])
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return float("inf")
+    return BUDGET_SHARE * total / 1024 ** 2
+
+def model_size_mb(model: Any) -> float:
+    """
+    Helper method estimates the memory held by a model from its parameter
+    and buffer tensors, and the packed weights of dynamically quantized
+    layers. Pipelines are measured through their model; models holding no
+    torch tensors (e.g. ONNX Runtime sessions) may report a size_mb.
+    :param model: Torch module, object with a torch module as .model, or
+    object with a size_mb attribute.
+    :return: Size in megabytes; 0 if it holds no tensors.
+    """
+    if isinstance(getattr(model, "size_mb", None), (int, float)):
+        return float(model.size_mb)
+    module = model if hasattr(model, "parameters") else \
+        getattr(model, "model", None)
+    if not hasattr(module, "parameters"):
+        return 0.0
+    buffers = module.buffers() if hasattr(module, "buffers") else []
+    submodules = module.modules() if hasattr(module, "modules") else []
+    # quantized linear layers hold their weights outside the parameters,
+    # in a packed-params child that exposes them too, so count leaves only
+    packed = [t for m in submodules if hasattr(m, "_weight_bias")
+              and next(m.children(), None) is None
+              for t in m._weight_bias() if t is not None]
+    return sum(t.numel() * t.element_size()
+               for t in chain(module.parameters(), buffers, packed)
+               ) / 1024 ** 2
+
+class ModelRegistry:
+    """
+    Class for ModelRegistry object, caches loaded models by name in least
+    recently used order. Callers should fetch models from the registry on
+    use rather than hold them, so an evicted model is actually freed.
+    """
+    def __init__(self, budget_mb: float | None = None):
+        self.budget_mb = _default_budget_mb() if budget_mb is None \
+            else budget_mb
+        # loaded models, least recently used first
+        self.models: OrderedDict[str, Any] = OrderedDict()
+        # measured size per model name, kept after eviction for reloads
+        self.sizes: dict[str, float] = {}
+
+    def get(self, name: str, loader: Callable[[], Any],
+            size_mb: float = 0.0) -> Any:
+        """
+        Method returns the named model, loading it on first use. Before a
+        load, least recently used models are evicted to make room for the
+        expected size; after it, to bring the total back under budget.
+        :param name: Model name, used as the registry key.
+        :param loader: Callable that loads the model.
+        :param size_mb: Expected size, used until the model was measured.
+        :return: Loaded model.
+        """
+        if name in self.models:
+            self.models.move_to_end(name)
+            return self.models[name]
+        self._evict(self.sizes.get(name, size_mb))
+        with get_profiler().stage("model.load", items=1):
+            model = loader()
+        self.models[name] = model
+        self.sizes[name] = model_size_mb(model)
+        self._evict(0.0, keep=name)
+        return model
+
+    def loaded_mb(self) -> float:
+        """
+        Method returns the total measured size of loaded models.
+        :return: Size in megabytes.
+        """
+        return sum(self.sizes.get(name, 0.0) for name in self.models)
+
+    def _evict(self, needed_mb: float, keep: str | None = None) -> None:
+        """
+        Helper method unloads least recently used models until needed_mb
+        more fits within the budget.
+        :param needed_mb: Megabytes to make room for.
+        :param keep: Model name never to evict, i.e. the one just loaded.
+        """
+        evicted = False
+        for name in list(self.models):
+            if self.loaded_mb() + needed_mb <= self.budget_mb:
+                break
+            if name != keep:
+                self.models.pop(name)
+                evicted = True
+        if evicted:
+            # release the evicted weights before anything new is loaded
+            gc.collect()
+
+    def evict(self, name: str) -> None:
+        """
+        Method unloads the named model, if loaded.
+        :param name: Model name.
+        """
+        if self.models.pop(name, None) is not None:
+            gc.collect()
+
+    def clear(self) -> None:
+        """
+        Method unloads all models.
+        """
+        self.models.clear()
+        gc.collect()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.models
+
+# process-wide registry, shared by every Cluster, Sentiment and Summary
+_REGISTRY = ModelRegistry()
+
+def get_registry() -> ModelRegistry:
+    """
+    Helper method returns the process-wide model registry.
+    :return: ModelRegistry object.
+    """
+    return _REGISTRY
+
+def set_registry(registry: ModelRegistry) -> None:
+    """
+    Helper method installs a process-wide model registry, e.g. with a
+    different budget.
+    :param registry: ModelRegistry object.
+    """
+    global _REGISTRY
+    _REGISTRY = registry
@@ -0,0 +1,237 @@
+"""
+Class defines OnnxSentimentPipeline, which runs the sentiment classifier
+through ONNX Runtime rather than PyTorch. The classifier is exported to
+ONNX once and the graph cached on disk; later runs need neither torch nor
+transformers, only onnxruntime and tokenizers.
+"""
+# == Standard Library imports ==
+from __future__ import annotations
+
+import inspect
+import json
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+# == Third party imports ==
+# onnxruntime (optional), tokenizers, torch and transformers are imported
+# where used; only exporting needs torch, transformers and onnx
+import numpy as np
+
+# == Local imports ==
+from .cache_utils import get_cache_dir
+from .quantization import INT8_SUFFIX
+
+if TYPE_CHECKING:
+    from tokenizers import Tokenizer
+
+# constants for file names within an exported model directory
+ONNX_FILE = "model.onnx"
+ONNX_META_FILE = "onnx_meta.json"
+TOKENIZER_FILE = "tokenizer.json"
+# constant for ONNX opset the classifier is exported with
+ONNX_OPSET = 17
+# constant for maximum tokens per feedback string, as in the torch pipeline
+ONNX_MAX_LENGTH = 512
+# constant for default number of feedback strings per inference batch
+ONNX_BATCH_SIZE = 32
+# constant for model inputs passed to the graph, if the tokenizer has them
+ONNX_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+def onnx_model_dir(model_name: str, quantize: bool = False) -> Path:
+    """
+    Helper method resolves the cache directory of an exported model.
+    :param model_name: Huggingface model name.
+    :param quantize: Whether the graph is int8 quantized.
+    :return: Path of the model directory (may not exist yet).
+    """
+    name = model_name.replace("/", "--") + (INT8_SUFFIX if quantize else "")
+    return get_cache_dir("onnx") / name
+
+def export_onnx(model_name: str, model_dir: Path,
+                quantize: bool = False) -> Path:
+    """
+    Method exports a sequence classification model to ONNX, with dynamic
+    batch and sequence axes, alongside its tokenizer and labels. If
+    quantize is set, the graph's weights are dynamically quantized to int8.
+    The export is written to a temporary directory and moved into place
+    when complete, so an interrupted export is never loaded.
+    :param model_name: Huggingface model name.
+    :param model_dir: Directory to export into.
+    :param quantize: Whether to quantize the exported graph.
+    :return: Path of the model directory.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    tmp_dir = model_dir.with_name(model_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    inputs = [name for name in ONNX_INPUTS if name in sample]
+    # torch >= 2.5 exports through dynamo by default; keep the tracing
+    # exporter, which handles the dynamic axes below on every version
+    options = {"dynamo": False} if "dynamo" in inspect.signature(
+        torch.onnx.export).parameters else {}
+    graph_path = tmp_dir / ("fp32.onnx" if quantize else ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model, ({name: sample[name] for name in inputs},),
+            str(graph_path), input_names=inputs, output_names=["logits"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"}
+                             for name in inputs},
+                          "logits": {0: "batch"}},
+            opset_version=ONNX_OPSET, **options)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(graph_path), str(tmp_dir / ONNX_FILE),
+                         weight_type=QuantType.QInt8)
+        graph_path.unlink()
+    tokenizer.backend_tokenizer.save(str(tmp_dir / TOKENIZER_FILE))
+    meta = {
+        "model": model_name,
+        "inputs": inputs,
+        "labels": [model.config.id2label[i]
+                   for i in range(model.config.num_labels)],
+        "pad_id": tokenizer.pad_token_id,
+    }
+    (tmp_dir / ONNX_META_FILE).write_text(json.dumps(meta, indent=2))
+    shutil.rmtree(model_dir, ignore_errors=True)
+    tmp_dir.rename(model_dir)
+    return model_dir
+
+class OnnxTokenizer:
+    """
+    Class for OnnxTokenizer object, wraps a fast tokenizer so it is called
+    like a transformers tokenizer (for token lengths) and pads batches into
+    the int64 arrays the ONNX graph takes.
+    """
+    def __init__(self, tokenizer: Tokenizer, pad_id: int = 0,
+                 max_length: int = ONNX_MAX_LENGTH):
+        tokenizer.no_padding()
+        tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer = tokenizer
+        self.pad_id = pad_id or 0
+
+    def __call__(self, texts: list[str], **kwargs) -> dict[str, list]:
+        """
+        Method tokenizes texts, mirroring a transformers tokenizer call;
+        truncation is always on.
+        :param texts: List of text strings.
+        :return: Dict of input_ids, one list of token ids per text.
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        return {"input_ids": [e.ids for e in encodings]}
+
+    def pad_batch(self, texts: list[str]) -> dict[str, np.ndarray]:
+        """
+        Method tokenizes texts and pads them to the longest in the batch.
+        :param texts: List of text strings.
+        :return: Dict of input_ids, attention_mask and token_type_ids, each
+        an int64 array of shape (n, longest).
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        width = max((len(e.ids) for e in encodings), default=0)
+        batch = {name: np.zeros((len(encodings), width), dtype=np.int64)
+                 for name in ONNX_INPUTS}
+        batch["input_ids"].fill(self.pad_id)
+        for row, encoding in enumerate(encodings):
+            n = len(encoding.ids)
+            batch["input_ids"][row, :n] = encoding.ids
+            batch["attention_mask"][row, :n] = 1
+            batch["token_type_ids"][row, :n] = encoding.type_ids
+        return batch
+
+class OnnxSentimentPipeline:
+    """
+    Class for OnnxSentimentPipeline object, classifies feedback through an
+    ONNX Runtime session in padded batches. Called like a transformers
+    text-classification pipeline, returning the top label and its softmax
+    score per text.
+    """
+    def __init__(self, session: Any, tokenizer: OnnxTokenizer,
+                 labels: list[str], inputs: list[str],
+                 size_mb: float = 0.0):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.labels = labels
+        self.inputs = inputs
+        # memory held by the session, for the model registry's RAM budget;
+        # it holds no torch tensors, so the graph's file size stands in
+        self.size_mb = size_mb
+
+    @classmethod
+    def from_dir(cls, model_dir: str | Path,
+                 threads: int | None = None) -> "OnnxSentimentPipeline":
+        """
+        Method opens an exported model directory in ONNX Runtime.
+        :param model_dir: Directory written by export_onnx.
+        :param threads: Intra-op threads of the session; None lets ONNX
+        Runtime use every physical core.
+        :return: OnnxSentimentPipeline object.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The onnx sentiment backend needs "
+                              "onnxruntime: pip install onnxruntime") from e
+        from tokenizers import Tokenizer
+        model_dir = Path(model_dir)
+        meta = json.loads((model_dir / ONNX_META_FILE).read_text())
+        options = ort.SessionOptions()
+        options.graph_optimization_level = \
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        session = ort.InferenceSession(str(model_dir / ONNX_FILE), options,
+                                       providers=["CPUExecutionProvider"])
+        tokenizer = OnnxTokenizer(
+            Tokenizer.from_file(str(model_dir / TOKENIZER_FILE)),
+            pad_id=meta["pad_id"])
+        size_mb = (model_dir / ONNX_FILE).stat().st_size / 1024 ** 2
+        return cls(session, tokenizer, meta["labels"], meta["inputs"],
+                   size_mb=size_mb)
+
+    def __call__(self, texts: str | list[str],
+                 batch_size: int = ONNX_BATCH_SIZE, **kwargs
+                 ) -> list[dict[str, str | float]]:
+        """
+        Method classifies texts, batch by batch.
+        :param texts: Text string, or list of text strings.
+        :param batch_size: Number of texts per inference batch.
+        :return: List of dicts comprising label and score, aligned with
+        texts.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        results = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer.pad_batch(texts[start:start + batch_size])
+            logits = self.session.run(
+                ["logits"], {name: batch[name] for name in self.inputs})[0]
+            # softmax, shifted by the row maximum for stability
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = exp / exp.sum(axis=1, keepdims=True)
+            best = probs.argmax(axis=1)
+            results += [{"label": self.labels[i], "score": float(p[i])}
+                        for i, p in zip(best, probs)]
+        return results
+
+def get_onnx_sentiment_pipeline(model_name: str, quantize: bool = False,
+                                threads: int | None = None
+                                ) -> OnnxSentimentPipeline:
+    """
+    Helper method creates an ONNX Runtime sentiment pipeline, exporting
+    the model on first use and reusing the cached graph afterwards.
+    :param model_name: Huggingface model name.
+    :param quantize: Whether to use an int8 quantized graph.
+    :param threads: Intra-op threads of the session; None for the default.
+    :return: OnnxSentimentPipeline object.
+    """
+    model_dir = onnx_model_dir(model_name, quantize)
+    if not (model_dir / ONNX_META_FILE).is_file():
+        print(f"Exporting {model_name} to ONNX (first use only)...")
+        export_onnx(model_name, model_dir, quantize)
+    return OnnxSentimentPipeline.from_dir(model_dir, threads)
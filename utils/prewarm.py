@@ -0,0 +1,41 @@
+"""
+Module defines the optional background pre-warm, which imports the heavy
+ML libraries on a daemon thread once the interface is shown, so the first
+stage of a run does not wait on them.
+"""
+# == Standard Library imports ==
+import importlib
+import threading
+
+# constant for heavy modules imported by the pre-warm, slowest first
+PREWARM_MODULES = (
+    "bertopic",
+    "umap",
+    "hdbscan",
+    "sentence_transformers",
+    "transformers",
+    "torch",
+)
+
+def _import_all(modules: tuple[str, ...]) -> None:
+    """
+    Helper method imports each module, ignoring any that fail; the stage
+    that needs a module will raise the error itself.
+    :param modules: Module names to import.
+    """
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+
+def prewarm(modules: tuple[str, ...] = PREWARM_MODULES) -> threading.Thread:
+    """
+    Method starts importing the heavy ML libraries on a daemon thread.
+    :param modules: Module names to import.
+    :return: Started thread.
+    """
+    thread = threading.Thread(target=_import_all, args=(modules,),
+                              name="prewarm", daemon=True)
+    thread.start()
+    return thread
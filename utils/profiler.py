@@ -0,0 +1,171 @@
+"""
+Class defines Profiler, which records opt-in per-stage performance data
+(wall time, CPU time, items processed, LLM token counts, and the process
+peak RSS reached by the end of each stage) and can dump a cProfile or torch
+profiler trace for a chosen stage.
+"""
+# == Standard Library imports ==
+import cProfile
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator
+
+def _peak_rss_mb() -> float:
+    """
+    Helper method returns the process peak resident set size (high-water
+    mark since start, not per stage).
+    :return: Peak RSS in megabytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+class Profiler:
+    """
+    Class for Profiler object, aggregates performance records by stage
+    name. When disabled, stage() returns a no-op context so instrumented
+    code pays close to nothing.
+    """
+    def __init__(self, enabled: bool = False, trace_stage: str | None = None,
+                 trace_dir: str | Path | None = None,
+                 torch_trace: bool = False):
+        self.enabled = enabled
+        # stage to trace, and whether to use torch profiler over cProfile
+        self.trace_stage = trace_stage
+        self.trace_dir = Path(trace_dir) if trace_dir else Path.cwd()
+        self.torch_trace = torch_trace
+        self.stages: dict[str, dict] = {}
+
+    def stage(self, name: str, items: int | None = None):
+        """
+        Method returns a context manager timing the enclosed block as the
+        named stage. The yielded dict may be updated with "items",
+        "prompt_tokens" and "generated_tokens" before the block exits.
+        :param name: Stage name, e.g. "cluster.encode".
+        :param items: Number of items processed, if known up front.
+        :return: Context manager yielding a mutable record dict.
+        """
+        if not self.enabled:
+            return nullcontext({})
+        return self._record(name, items)
+
+    @contextmanager
+    def _record(self, name: str, items: int | None) -> Iterator[dict]:
+        record = {"items": items or 0, "prompt_tokens": 0,
+                  "generated_tokens": 0}
+        tracer = self._start_trace() if name == self.trace_stage else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.process_time() - cpu
+            if tracer is not None:
+                self._stop_trace(tracer, name)
+            self._merge(name, record)
+
+    def _merge(self, name: str, record: dict) -> None:
+        """
+        Helper method adds a finished record to the stage's running totals.
+        :param name: Stage name.
+        :param record: Finished record dict.
+        """
+        totals = self.stages.setdefault(name, {
+            "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "items": 0,
+            "prompt_tokens": 0, "generated_tokens": 0
+        })
+        totals["calls"] += 1
+        for key in ("wall_s", "cpu_s", "items", "prompt_tokens",
+                    "generated_tokens"):
+            totals[key] += record[key]
+        # the high-water mark cannot be reset per stage, so this is the
+        # process peak so far: a stage only owns it if it raised it
+        totals["process_peak_rss_mb"] = _peak_rss_mb()
+
+    def _start_trace(self):
+        """
+        Helper method starts a cProfile (or torch profiler) trace.
+        :return: Running profiler object.
+        """
+        if self.torch_trace:
+            from torch.profiler import profile, ProfilerActivity
+            tracer = profile(activities=[ProfilerActivity.CPU],
+                             record_shapes=True)
+            tracer.__enter__()
+            return tracer
+        tracer = cProfile.Profile()
+        tracer.enable()
+        return tracer
+
+    def _stop_trace(self, tracer, name: str) -> None:
+        """
+        Helper method stops a running trace and writes it to trace_dir.
+        :param tracer: Running profiler object.
+        :param name: Stage name, used for the trace file name.
+        """
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        if self.torch_trace:
+            tracer.__exit__(None, None, None)
+            tracer.export_chrome_trace(
+                str(self.trace_dir / f"{name}.trace.json"))
+            return
+        tracer.disable()
+        tracer.dump_stats(self.trace_dir / f"{name}.prof")
+
+    def report(self) -> dict[str, dict]:
+        """
+        Method returns aggregated stage records with derived throughput.
+        :return: Dict of str (k = stage name), dict (v = stage metrics).
+        """
+        out = {}
+        for name, totals in self.stages.items():
+            stage = dict(totals)
+            wall = stage["wall_s"]
+            stage["items_per_s"] = stage["items"] / wall if wall else None
+            stage["tokens_per_s"] = stage["generated_tokens"] / wall if \
+                wall and stage["generated_tokens"] else None
+            out[name] = stage
+        return out
+
+    def save(self, fpath: str | Path) -> None:
+        """
+        Method writes the performance report as JSON.
+        :param fpath: Output JSON path.
+        """
+        Path(fpath).write_text(json.dumps(self.report(), indent=2))
+
+# process-wide profiler used by instrumented stages; disabled by default
+_PROFILER = Profiler()
+
+def get_profiler() -> Profiler:
+    """
+    Helper method returns the process-wide profiler.
+    :return: Profiler object.
+    """
+    return _PROFILER
+
+def set_profiler(profiler: Profiler) -> None:
+    """
+    Helper method installs a process-wide profiler.
+    :param profiler: Profiler object.
+    """
+    global _PROFILER
+    _PROFILER = profiler
+
+@contextmanager
+def use_profiler(profiler: Profiler) -> Iterator[Profiler]:
+    """
+    Helper method installs a process-wide profiler for the duration of the
+    context only, then restores the one installed before.
+    :param profiler: Profiler object.
+    """
+    previous = get_profiler()
+    set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        set_profiler(previous)
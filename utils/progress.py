@@ -0,0 +1,271 @@
+"""
+Class defines ProgressReporter, which publishes live progress events
+(items done, throughput and ETA) from the pipeline stages to any number of
+listeners, e.g. the progress popup or a headless console printer.
+"""
+# == Standard Library imports ==
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, TextIO
+
+# constant for least seconds between two updates of a stage; the first and
+# final events of a stage are always sent
+PROGRESS_INTERVAL_S = 0.5
+
+def _format_seconds(seconds: float) -> str:
+    """
+    Helper method formats a duration for display.
+    :param seconds: Duration in seconds.
+    :return: Duration as e.g. "45s", "2m05s" or "1h02m".
+    """
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    Class for ProgressEvent object, a snapshot of one stage's progress.
+    A stage with no total (e.g. a UMAP fit) reports only its start and,
+    once finished, the items it processed.
+    """
+    stage: str
+    done: int
+    total: int | None
+    elapsed_s: float
+    unit: str = "rows"
+    tokens: int = 0
+    finished: bool = False
+
+    @property
+    def fraction(self) -> float | None:
+        """
+        Property returns the share of the stage completed.
+        :return: Fraction in [0, 1]; None if the total is unknown.
+        """
+        if self.total is None:
+            return 1.0 if self.finished else None
+        return min(1.0, self.done / self.total) if self.total else 1.0
+
+    @property
+    def rate(self) -> float | None:
+        """
+        Property returns the stage throughput so far.
+        :return: Items per second; None before any item is done.
+        """
+        if not self.done or not self.elapsed_s:
+            return None
+        return self.done / self.elapsed_s
+
+    @property
+    def tokens_per_s(self) -> float | None:
+        """
+        Property returns the generated tokens per second so far.
+        :return: Tokens per second; None if no tokens are counted.
+        """
+        if not self.tokens or not self.elapsed_s:
+            return None
+        return self.tokens / self.elapsed_s
+
+    @property
+    def eta_s(self) -> float | None:
+        """
+        Property estimates the seconds left, at the throughput so far.
+        :return: Seconds left; None if the total or rate is unknown.
+        """
+        if self.finished:
+            return 0.0
+        if self.total is None or self.rate is None:
+            return None
+        return max(0, self.total - self.done) / self.rate
+
+    def format(self) -> str:
+        """
+        Method describes the event in one line, e.g. "cluster.encode:
+        4,096/10,000 rows (41%), 512.0 rows/s, ETA 12s".
+        :return: Description string.
+        """
+        count = f"{self.done:,}" if self.total is None else \
+            f"{self.done:,}/{self.total:,}"
+        parts = [f"{self.stage}: {count} {self.unit}"]
+        if self.total:
+            parts[0] += f" ({self.fraction:.0%})"
+        if self.rate is not None:
+            parts.append(f"{self.rate:.1f} {self.unit}/s")
+        if self.tokens_per_s is not None:
+            parts.append(f"{self.tokens_per_s:.1f} tokens/s")
+        if self.finished:
+            parts.append(f"done in {_format_seconds(self.elapsed_s)}")
+        elif self.eta_s is not None:
+            parts.append(f"ETA {_format_seconds(self.eta_s)}")
+        return ", ".join(parts)
+
+class ProgressTask:
+    """
+    Class for ProgressTask object, tracks one run of a stage and sends its
+    events through the reporter: a start event, throttled updates as items
+    are done, and a final event. Use as a context manager.
+    """
+    def __init__(self, reporter: "ProgressReporter", stage: str,
+                 total: int | None = None, unit: str = "rows"):
+        self.reporter = reporter
+        self.stage = stage
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self.tokens = 0
+        self.start = time.perf_counter()
+        self.last_sent = float("-inf")
+
+    def __enter__(self) -> "ProgressTask":
+        self.start = time.perf_counter()
+        self._send()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._send(finished=True)
+
+    def advance(self, n: int = 1, tokens: int = 0) -> None:
+        """
+        Method records finished items, sending an update unless one was
+        sent within the reporter's interval.
+        :param n: Number of items finished.
+        :param tokens: Number of tokens generated for them.
+        """
+        self.done += n
+        self.tokens += tokens
+        if time.perf_counter() - self.last_sent >= self.reporter.interval_s:
+            self._send()
+
+    def _send(self, finished: bool = False) -> None:
+        """
+        Helper method sends the current state as an event.
+        :param finished: Whether the stage has ended.
+        """
+        now = time.perf_counter()
+        self.last_sent = now
+        self.reporter.emit(ProgressEvent(
+            stage=self.stage, done=self.done, total=self.total,
+            elapsed_s=now - self.start, unit=self.unit, tokens=self.tokens,
+            finished=finished))
+
+class ProgressReporter:
+    """
+    Class for ProgressReporter object, hands progress events to the
+    subscribed listeners. Listeners are called on the thread running the
+    stage, so GUI listeners should hand events over to their own thread.
+    With no listeners, stages skip any work done only to report progress.
+    """
+    def __init__(self, interval_s: float = PROGRESS_INTERVAL_S):
+        self.interval_s = interval_s
+        self.listeners: list[Callable[[ProgressEvent], None]] = []
+
+    @property
+    def active(self) -> bool:
+        """
+        Property returns whether anyone listens for events.
+        :return: True if at least one listener is subscribed.
+        """
+        return bool(self.listeners)
+
+    def subscribe(self, listener: Callable[[ProgressEvent], None]) -> None:
+        """
+        Method adds a listener for progress events.
+        :param listener: Callable taking a ProgressEvent.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ProgressEvent], None]) -> None:
+        """
+        Method removes a listener, if subscribed.
+        :param listener: Callable previously subscribed.
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    @contextmanager
+    def subscribed(self, listener: Callable[[ProgressEvent], None]
+                   ) -> Iterator[None]:
+        """
+        Method subscribes a listener for the duration of the context.
+        :param listener: Callable taking a ProgressEvent.
+        """
+        self.subscribe(listener)
+        try:
+            yield
+        finally:
+            self.unsubscribe(listener)
+
+    def task(self, stage: str, total: int | None = None,
+             unit: str = "rows") -> ProgressTask:
+        """
+        Method starts tracking a run of a stage.
+        :param stage: Stage name, e.g. "cluster.encode".
+        :param total: Number of items the run will process, if known.
+        :param unit: Name of the items, e.g. "rows" or "prompts".
+        :return: ProgressTask object, to use as a context manager.
+        """
+        return ProgressTask(self, stage, total, unit)
+
+    def emit(self, event: ProgressEvent) -> None:
+        """
+        Method hands an event to every listener.
+        :param event: ProgressEvent object.
+        """
+        for listener in list(self.listeners):
+            listener(event)
+
+def console_listener(stream: TextIO | None = None
+                     ) -> Callable[[ProgressEvent], None]:
+    """
+    Helper method builds a listener printing each event on its own line,
+    for headless runs.
+    :param stream: Stream to print to; defaults to stderr.
+    :return: Callable taking a ProgressEvent.
+    """
+    def listener(event: ProgressEvent) -> None:
+        print(event.format(), file=stream or sys.stderr, flush=True)
+    return listener
+
+# process-wide reporter used by instrumented stages; silent by default
+_PROGRESS = ProgressReporter()
+
+def get_progress() -> ProgressReporter:
+    """
+    Helper method returns the process-wide progress reporter.
+    :return: ProgressReporter object.
+    """
+    return _PROGRESS
+
+def set_progress(reporter: ProgressReporter) -> None:
+    """
+    Helper method installs a process-wide progress reporter.
+    :param reporter: ProgressReporter object.
+    """
+    global _PROGRESS
+    _PROGRESS = reporter
+
+@contextmanager
+def advancing(stage: str, total: int | None = None,
+              advance: Callable[..., None] | None = None,
+              unit: str = "rows") -> Iterator[Callable[..., None]]:
+    """
+    Helper method yields the callable advancing a stage's progress. If the
+    caller passes the advance of a task it already opened, e.g. one
+    spanning every chunk of a large input, that task is advanced;
+    otherwise a task is opened for the duration of the context.
+    :param stage: Stage name, used if a task is opened.
+    :param total: Number of items, used if a task is opened.
+    :param advance: Advance method of an open task, if any.
+    :param unit: Name of the items, used if a task is opened.
+    """
+    if advance is not None:
+        yield advance
+        return None
+    with get_progress().task(stage, total=total, unit=unit) as task:
+        yield task.advance
@@ -0,0 +1,156 @@
+"""
+Module defines the optional int8 inference mode: dynamic quantization of
+the linear layers of the embedding and sentiment models at load time, and
+a check measuring how far quantized output drifts from fp32 on a sample.
+"""
+# == Standard Library imports ==
+import time
+import warnings
+from typing import Any, Callable
+
+# == Third party imports ==
+# torch is imported where used, to keep startup fast
+import numpy as np
+
+# == Local imports ==
+from .model_registry import model_size_mb
+
+# constant for suffix marking quantized models in registry and cache keys
+INT8_SUFFIX = "-int8"
+# constant for rows checked against fp32 by default
+CHECK_SAMPLE_SIZE = 256
+# constant for rows of the untimed warm-up call before each timing
+WARMUP_ROWS = 8
+
+def model_key(name: str, quantize: bool) -> str:
+    """
+    Helper method builds the name a model is registered and cached under,
+    so quantized output never mixes with fp32 output.
+    :param name: Model name.
+    :param quantize: Whether the model is quantized.
+    :return: Model key.
+    """
+    return name + INT8_SUFFIX if quantize else name
+
+def quantize_model(model: Any) -> Any:
+    """
+    Method applies dynamic int8 quantization, in place, to every linear
+    layer of a model: weights are stored as int8 and activations quantized
+    on the fly, which speeds up CPU inference and shrinks the model.
+    :param model: Torch module, or object with a torch module as .model
+    (e.g. a transformers pipeline).
+    :return: The same model, quantized; unchanged if it holds no torch
+    module (e.g. an offline stub).
+    """
+    import torch
+    module = model if isinstance(model, torch.nn.Module) else \
+        getattr(model, "model", None)
+    if not isinstance(module, torch.nn.Module):
+        return model
+    with warnings.catch_warnings():
+        # eager-mode quantization is flagged for migration to torchao
+        warnings.simplefilter("ignore", (DeprecationWarning, UserWarning))
+        torch.ao.quantization.quantize_dynamic(
+            module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+def embedding_drift(reference: np.ndarray, candidate: np.ndarray
+                    ) -> dict[str, float]:
+    """
+    Helper method measures the cosine drift (1 - cosine similarity) between
+    matching rows of two embedding matrices.
+    :param reference: 2D array of fp32 embeddings.
+    :param candidate: 2D array of quantized embeddings, same shape.
+    :return: Dict of mean, 99th percentile and max drift.
+    """
+    reference = np.asarray(reference, dtype=np.float32)
+    candidate = np.asarray(candidate, dtype=np.float32)
+    norms = np.linalg.norm(reference, axis=1) * \
+        np.linalg.norm(candidate, axis=1)
+    cosine = (reference * candidate).sum(axis=1) / np.where(norms == 0, 1,
+                                                            norms)
+    drift = 1 - cosine
+    return {
+        "mean_cosine_drift": float(drift.mean()),
+        "p99_cosine_drift": float(np.percentile(drift, 99)),
+        "max_cosine_drift": float(drift.max()),
+    }
+
+def label_agreement(reference: list[str], candidate: list[str]) -> float:
+    """
+    Helper method measures the share of matching labels.
+    :param reference: List of fp32 labels.
+    :param candidate: List of quantized labels, same length.
+    :return: Agreement in [0, 1]; 1 for no labels.
+    """
+    if not reference:
+        return 1.0
+    return float(np.mean([a == b for a, b in zip(reference, candidate)]))
+
+def _timed(fn: Callable[[list[str]], Any], texts: list[str]
+           ) -> tuple[Any, float]:
+    """
+    Helper method calls fn on texts after an untimed warm-up call.
+    :param fn: Callable taking a list of texts.
+    :param texts: List of texts.
+    :return: Tuple of output and wall seconds.
+    """
+    fn(texts[:WARMUP_ROWS])
+    start = time.perf_counter()
+    output = fn(texts)
+    return output, time.perf_counter() - start
+
+def _compare(model: Any, run: Callable[[Any, list[str]], Any],
+             texts: list[str]) -> tuple[Any, Any, dict[str, float]]:
+    """
+    Helper method runs a model on texts in fp32, quantizes it in place (so
+    two copies are never held) and runs it again.
+    :param model: Freshly loaded fp32 model.
+    :param run: Callable producing output from model and texts.
+    :param texts: List of texts.
+    :return: Tuple of fp32 output, int8 output and timing / size metrics.
+    """
+    fp32_mb = model_size_mb(model)
+    reference, fp32_s = _timed(lambda t: run(model, t), texts)
+    quantize_model(model)
+    candidate, int8_s = _timed(lambda t: run(model, t), texts)
+    int8_mb = model_size_mb(model)
+    return reference, candidate, {
+        "fp32_s": fp32_s,
+        "int8_s": int8_s,
+        "speedup": fp32_s / int8_s if int8_s else float("nan"),
+        "fp32_mb": fp32_mb,
+        "int8_mb": int8_mb,
+        "memory_saving": 1 - int8_mb / fp32_mb if fp32_mb else 0.0,
+    }
+
+def check_quantization(texts: list[str],
+                       load_encoder: Callable[[], Any] | None = None,
+                       load_classifier: Callable[[], Any] | None = None
+                       ) -> dict[str, dict[str, float]]:
+    """
+    Method checks the quantized models against fp32 on a sample: embedding
+    cosine drift for the sentence transformer, label agreement for the
+    sentiment classifier, plus the speedup and memory saving of each.
+    Models are loaded fresh, bypassing the registry.
+    :param texts: Sample of non-empty feedback strings.
+    :param load_encoder: Loader of the fp32 sentence transformer; defaults
+    to the one Cluster uses.
+    :param load_classifier: Loader of the fp32 sentiment pipeline; defaults
+    to the one Sentiment uses.
+    :return: Dict of "embedding" and "sentiment" metric dicts.
+    """
+    if load_encoder is None:
+        from .cluster import get_sentence_transformer as load_encoder
+    from .sentiment import SMT_BATCH_SIZE
+    if load_classifier is None:
+        from .sentiment import get_sentiment_pipeline as load_classifier
+    reference, candidate, embedding = _compare(
+        load_encoder(), lambda m, t: m.encode(t), texts)
+    embedding.update(embedding_drift(reference, candidate))
+    reference, candidate, sentiment = _compare(
+        load_classifier(),
+        lambda m, t: [r["label"] for r in m(t, batch_size=SMT_BATCH_SIZE)],
+        texts)
+    sentiment["label_agreement"] = label_agreement(reference, candidate)
+    return {"embedding": embedding, "sentiment": sentiment}
@@ -0,0 +1,115 @@
+"""
+Module defines the dimensionality reducers available to Cluster: UMAP
+seeded for reproducible output, UMAP unseeded so it can run in parallel,
+and an incremental PCA fitted in streaming batches for the largest inputs.
+"""
+# == Standard Library imports ==
+from __future__ import annotations
+
+# == Third party imports ==
+# umap and sklearn are imported where used, to keep startup fast
+import numpy as np
+
+# constant for number of dimensions embeddings are reduced to
+N_COMPONENTS = 5
+# constant for seed of the reproducible UMAP reducer
+UMAP_SEED = 42
+# constant for rows per batch when fitting or applying the streaming PCA
+PCA_BATCH_SIZE = 10_000
+# constant for names of the available reducers, default first
+REDUCERS = ("umap", "umap_parallel", "pca")
+
+class StreamingPCA:
+    """
+    Class for StreamingPCA object, reduces embeddings with incremental PCA
+    fitted batch by batch, so memory stays bounded by the batch size rather
+    than the number of rows. Rows are L2-normalized first, to match the
+    cosine metric the UMAP reducers use.
+    """
+    def __init__(self, n_components: int = N_COMPONENTS,
+                 batch_size: int = PCA_BATCH_SIZE):
+        from sklearn.decomposition import IncrementalPCA
+        self.n_components = n_components
+        self.batch_size = batch_size
+        self.pca = IncrementalPCA(n_components=n_components)
+
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        """
+        Helper method L2-normalizes rows, leaving all-zero rows as they are.
+        :param embeddings: 2D array of embeddings.
+        :return: 2D float32 array of unit-length rows.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
+
+    def _batches(self, n_rows: int) -> list[slice]:
+        """
+        Helper method splits rows into batches of at least batch_size rows
+        (the last absorbs any remainder), as every partial fit needs at
+        least n_components rows.
+        :param n_rows: Number of rows.
+        :return: List of row slices.
+        """
+        n_batches = max(1, n_rows // self.batch_size)
+        bounds = np.linspace(0, n_rows, n_batches + 1).astype(int)
+        return [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def partial_fit(self, embeddings: np.ndarray, y=None) -> StreamingPCA:
+        """
+        Method updates the fit with one batch of embeddings.
+        :param embeddings: 2D array of embeddings.
+        :param y: Unused; kept for interface compatibility.
+        :return: Self.
+        """
+        self.pca.partial_fit(self._normalize(embeddings))
+        return self
+
+    def fit(self, embeddings: np.ndarray, y=None) -> StreamingPCA:
+        """
+        Method fits the reducer in streaming batches.
+        :param embeddings: 2D array (or memmap) of embeddings.
+        :param y: Unused; kept for interface compatibility.
+        :return: Self.
+        """
+        for batch in self._batches(len(embeddings)):
+            self.partial_fit(embeddings[batch])
+        return self
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Method reduces embeddings batch by batch.
+        :param embeddings: 2D array of embeddings.
+        :return: 2D float32 array of shape (n, n_components).
+        """
+        reduced = np.empty((len(embeddings), self.n_components),
+                           dtype=np.float32)
+        for batch in self._batches(len(embeddings)):
+            reduced[batch] = self.pca.transform(
+                self._normalize(embeddings[batch]))
+        return reduced
+
+    def fit_transform(self, embeddings: np.ndarray, y=None) -> np.ndarray:
+        return self.fit(embeddings).transform(embeddings)
+
+def get_reducer(name: str = "umap"):
+    """
+    Helper method creates an unfitted reducer by name. "umap" is seeded,
+    which makes it reproducible but forces single-threaded execution;
+    "umap_parallel" is unseeded and uses every core; "pca" is a streaming
+    incremental PCA, the fastest and lightest but least able to separate
+    non-linear clusters.
+    :param name: One of REDUCERS.
+    :return: Reducer with fit / transform methods.
+    """
+    if name == "pca":
+        return StreamingPCA()
+    if name not in REDUCERS:
+        raise ValueError(f"Unknown reducer: {name}")
+    from umap import UMAP
+    if name == "umap_parallel":
+        return UMAP(n_components=N_COMPONENTS, min_dist=0.0,
+                    metric="cosine", n_jobs=-1)
+    return UMAP(n_components=N_COMPONENTS, min_dist=0.0, metric="cosine",
+                random_state=UMAP_SEED)
@@ -0,0 +1,165 @@
+"""
+Class defines ResponseCache, a persistent SQLite-backed store of LLM
+responses keyed by model, generation settings and prompt messages.
+"""
+# == Standard Library imports ==
+import json
+import sqlite3
+from pathlib import Path
+
+# == Local imports ==
+from .cache_utils import content_hash, get_cache_dir
+
+# constant for default maximum number of cached responses
+LLM_CACHE_SIZE = 50_000
+# constant for share of the size cap freed beyond it when evicting, so
+# eviction runs once per that many inserts rather than on every insert
+EVICT_SLACK = 0.1
+# file name of the SQLite database within the cache directory
+DB_FILE = "responses.sqlite3"
+
+class ResponseCache:
+    """
+    Class for ResponseCache object, maps a hash of (model name, generation
+    settings, bundled messages) to generated text. Tracks hit and miss
+    counts, and evicts least recently used responses beyond a size cap.
+    The recency clock and row count are read once and then kept in memory;
+    the row count is re-read before evicting, as other processes may share
+    the database.
+    """
+    def __init__(self, model_name: str, gen_kwargs: dict | None = None,
+                 cache_dir: str | Path | None = None,
+                 max_entries: int = LLM_CACHE_SIZE):
+        self.model_name = model_name
+        # settings are serialized once so key order never changes the hash
+        self.settings = json.dumps(gen_kwargs or {}, sort_keys=True,
+                                   default=str)
+        self.max_entries = max_entries
+        path = Path(cache_dir) if cache_dir else get_cache_dir("responses")
+        path.mkdir(parents=True, exist_ok=True)
+        self.db_path = path / DB_FILE
+        self.hits = 0
+        self.misses = 0
+        # connection is opened lazily, on the thread that first uses it
+        self._conn: sqlite3.Connection | None = None
+        # next recency stamp and number of stored responses, once read
+        self._stamp = 0
+        self._rows = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Helper method opens the SQLite database, creating the responses
+        table and its recency index on first use, and reads the clock and
+        row count.
+        :return: SQLite connection object.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path,
+                                         check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                    "last_used INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_last_used "
+                    "ON responses (last_used)"
+                )
+            (self._stamp,) = self._conn.execute(
+                "SELECT COALESCE(MAX(last_used), 0) FROM responses"
+            ).fetchone()
+            (self._rows,) = self._conn.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()
+        return self._conn
+
+    def _clock(self) -> int:
+        """
+        Helper method returns the next recency stamp for LRU ordering.
+        :return: Integer greater than every stamp issued so far.
+        """
+        self._stamp += 1
+        return self._stamp
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Helper method deletes the least recently used responses once the
+        cache exceeds its size cap, freeing EVICT_SLACK of the cap beyond it.
+        :param conn: SQLite connection object, within a transaction.
+        """
+        (self._rows,) = conn.execute(
+            "SELECT COUNT(*) FROM responses").fetchone()
+        excess = self._rows - self.max_entries
+        if excess <= 0:
+            return None
+        excess += int(self.max_entries * EVICT_SLACK)
+        conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM "
+            "responses ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self._rows = max(0, self._rows - excess)
+
+    def key(self, messages: list[dict]) -> str:
+        """
+        Method builds the cache key for a set of bundled prompt messages.
+        :param messages: Messages, as built by _bundle_messages.
+        :return: Hash of model name, generation settings and messages.
+        """
+        return content_hash(self.model_name, self.settings,
+                            json.dumps(messages, sort_keys=True))
+
+    def get(self, messages: list[dict]) -> str | None:
+        """
+        Method looks up a cached response for the given messages, marking it
+        as recently used.
+        :param messages: Messages, as built by _bundle_messages.
+        :return: Cached response string, or None on a miss.
+        """
+        key = self.key(messages)
+        conn = self._connect()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with conn:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?",
+                         (self._clock(), key))
+        return row[0]
+
+    def put(self, messages: list[dict], response: str) -> None:
+        """
+        Method stores a generated response, evicting the least recently
+        used responses if the cache exceeds its size cap.
+        :param messages: Messages, as built by _bundle_messages.
+        :param response: Generated response string.
+        """
+        key = self.key(messages)
+        conn = self._connect()
+        with conn:
+            exists = conn.execute("SELECT 1 FROM responses WHERE key = ?",
+                                  (key,)).fetchone() is not None
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, last_used) "
+                "VALUES (?, ?, ?)", (key, response, self._clock())
+            )
+            if not exists:
+                self._rows += 1
+            if self._rows > self.max_entries:
+                self._evict(conn)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Method reports cache hit and miss counts for this process.
+        :return: Dict of str (k = hits / misses), int (v = count).
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """
+        Method closes the SQLite connection, if open.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
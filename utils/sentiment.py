@@ -2,21 +2,45 @@
 Class defines Sentiment, which assesses the sentiment of given
 feedback strings.
 """
-# == Third party imports ==
-from transformers import (
-    AutoModelForSequenceClassification,
-    AutoTokenizer,
-    pipeline
-)
+# == Standard Library imports ==
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Iterable
+
+# == Local imports ==
+from .model_registry import get_registry
+from .onnx_backend import get_onnx_sentiment_pipeline
+from .profiler import get_profiler
+from .progress import advancing
+from .quantization import model_key, quantize_model
+from .sentiment_cache import SentimentCache
+
+if TYPE_CHECKING:
+    from transformers import pipeline
 
 # constant for specified sentiment analysis model
 SMT_MODEL = "tabularisai/multilingual-sentiment-analysis"
+# constant for default number of feedback strings per padded mini-batch
+SMT_BATCH_SIZE = 32
+# constant for expected sentiment model size (MB), before it is measured
+SMT_MODEL_MB = 550
+# constant for sentiment inference backends, default first
+SMT_BACKENDS = ("torch", "onnx")
+# constant for suffix of the onnx backend's model key; torch keeps the bare
+# model name, so its existing cache entries stay valid
+ONNX_SUFFIX = "-onnx"
 
 def get_sentiment_pipeline() -> pipeline:
     """
     Helper method creates a sentiment analysis pipeline.
     :return: Huggingface transformer pipeline object.
     """
+    # imported here, as transformers (and torch) are slow to import
+    from transformers import (
+        AutoModelForSequenceClassification,
+        AutoTokenizer,
+        pipeline
+    )
     sentiment_pipeline = pipeline(
         task="text-classification",
         model=AutoModelForSequenceClassification.from_pretrained(SMT_MODEL),
@@ -26,15 +50,78 @@ def get_sentiment_pipeline() -> pipeline:
     )
     return sentiment_pipeline
 
+def get_quantized_sentiment_pipeline() -> pipeline:
+    """
+    Helper method creates the sentiment analysis pipeline with its linear
+    layers dynamically quantized to int8, for faster CPU classification.
+    :return: Huggingface transformer pipeline object.
+    """
+    return quantize_model(get_sentiment_pipeline())
+
+def _neutral() -> dict[str, str | float]:
+    """
+    Helper method returns the sentiment result used for empty feedback.
+    :return: Dict comprising NEUTRAL label and zero score.
+    """
+    return {
+        "label": "NEUTRAL",
+        "score": 0.0
+    }
+
 class Sentiment:
     """
     Class for Sentiment object, handles sentiment analysis of given feedback
     strings and produces an associated label (neutral, positive, negative)
     and score.
     """
-    def __init__(self):
-        # instantiate sentiment analysis pipeline
-        self.smt_pipe = get_sentiment_pipeline()
+    def __init__(self, use_cache: bool = True, quantize: bool = False,
+                 backend: str = "torch", threads: int | None = None):
+        if backend not in SMT_BACKENDS:
+            raise ValueError(f"Unknown sentiment backend: {backend}")
+        # sentiment analysis pipeline, loaded from the registry on first
+        # use, with int8 linear layers if quantized; the onnx backend runs
+        # an exported graph in ONNX Runtime with the given intra-op threads
+        self.quantize = quantize
+        self.backend = backend
+        self.threads = threads
+        self._smt_pipe = None
+        # persistent result store, so previously scored feedback is skipped;
+        # keyed per backend and precision, as their scores differ slightly
+        self.cache = SentimentCache(self.model_key) if use_cache else None
+
+    @property
+    def model_key(self) -> str:
+        """
+        Property returns the name the configured model is registered and
+        cached under, distinct per backend and precision.
+        :return: Model key.
+        """
+        key = model_key(SMT_MODEL, self.quantize)
+        return key + ONNX_SUFFIX if self.backend == "onnx" else key
+
+    @property
+    def smt_pipe(self) -> pipeline:
+        """
+        Property returns the sentiment pipeline, shared process-wide via the
+        model registry and loaded on first use, unless one was set.
+        :return: Huggingface transformer pipeline object, or an
+        OnnxSentimentPipeline for the onnx backend.
+        """
+        if self._smt_pipe is not None:
+            return self._smt_pipe
+        if self.backend == "onnx":
+            return get_registry().get(
+                self.model_key,
+                lambda: get_onnx_sentiment_pipeline(
+                    SMT_MODEL, self.quantize, self.threads),
+                SMT_MODEL_MB)
+        loader = get_quantized_sentiment_pipeline if self.quantize else \
+            get_sentiment_pipeline
+        return get_registry().get(self.model_key, loader, SMT_MODEL_MB)
+
+    @smt_pipe.setter
+    def smt_pipe(self, smt_pipe: pipeline) -> None:
+        self._smt_pipe = smt_pipe
 
     def get_feedback_sentiment(self, feedback: str) -> dict[str, str]:
         """
@@ -44,12 +131,85 @@ class Sentiment:
         :return: Dict comprising sentiment label, score, strs.
         """
         if not feedback.strip():
-            return {
-                "label": "NEUTRAL",
-                "score": 0.0
-            }
+            return _neutral()
         result = self.smt_pipe(feedback)[0]
         return {
             "label": result["label"],
             "score": result["score"]
-        }
\ No newline at end of file
+        }
+
+    def _token_lengths(self, feedback: list[str]) -> list[int]:
+        """
+        Helper method measures the token length of each feedback string,
+        used to bucket similarly sized inputs so padding is minimized.
+        Falls back to a whitespace word count if the pipeline exposes no
+        tokenizer.
+        :param feedback: List of non-empty feedback strings.
+        :return: List of token lengths, aligned with feedback.
+        """
+        tokenizer = getattr(self.smt_pipe, "tokenizer", None)
+        if tokenizer is None:
+            return [len(fb.split()) for fb in feedback]
+        encoded = tokenizer(feedback, truncation=True, max_length=512)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def get_batch_sentiment(self, feedback: Iterable[str],
+                            batch_size: int = SMT_BATCH_SIZE,
+                            advance: Callable[..., None] | None = None
+                            ) -> list[dict[str, str]]:
+        """
+        Given many feedback strings, method scores them through the
+        sentiment analysis pipeline in padded mini-batches. Inputs are
+        sorted by token length so each batch holds similarly sized strings,
+        and results are returned in the original order. Strings found in
+        the sentiment cache are not re-scored.
+        :param feedback: List or iterable of feedback strings.
+        :param batch_size: Number of feedback strings per mini-batch.
+        :param advance: Advance method of the caller's progress task, which
+        then counts every string, cached or not; by default a task is
+        opened for the strings scored.
+        :return: List of dicts comprising sentiment label, score, aligned
+        with feedback.
+        """
+        feedback = list(feedback)
+        results: list[dict | None] = [None] * len(feedback)
+        # empty strings short-circuit to NEUTRAL without reaching the model
+        pending = []
+        for i, fb in enumerate(feedback):
+            if fb.strip():
+                pending.append(i)
+            else:
+                results[i] = _neutral()
+        # reuse previously scored results, in one bulk cache lookup
+        if pending and self.cache is not None:
+            cached = self.cache.get_many([feedback[i] for i in pending])
+            for i, result in zip(pending, cached):
+                results[i] = result
+            pending = [i for i in pending if results[i] is None]
+        if advance is not None:
+            advance(len(feedback) - len(pending))
+        if not pending:
+            return results
+        with get_profiler().stage("sentiment.classify",
+                                  items=len(pending)), \
+                advancing("sentiment.classify", len(pending),
+                          advance) as advance:
+            # sort by token length so padding within each batch stays small
+            lengths = self._token_lengths([feedback[i] for i in pending])
+            order = [i for _, i in sorted(zip(lengths, pending))]
+            for start in range(0, len(order), batch_size):
+                idx = order[start:start + batch_size]
+                output = self.smt_pipe([feedback[i] for i in idx],
+                                       batch_size=len(idx))
+                # write each result back to its original position
+                for i, result in zip(idx, output):
+                    results[i] = {
+                        "label": result["label"],
+                        "score": result["score"]
+                    }
+                advance(len(idx))
+        # persist newly scored results, in one bulk cache insert
+        if self.cache is not None:
+            self.cache.put_many([feedback[i] for i in pending],
+                                [results[i] for i in pending])
+        return results
@@ -0,0 +1,130 @@
+"""
+Class defines SentimentCache, a persistent SQLite-backed store of
+sentiment results keyed by model name and text hash.
+"""
+# == Standard Library imports ==
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+# == Local imports ==
+from .cache_utils import content_hash, get_cache_dir, normalize_text
+
+# constant for number of results held in the in-process LRU front
+SMT_LRU_SIZE = 100_000
+# constant for number of keys bound per SELECT statement
+SQL_CHUNK_SIZE = 900
+# file name of the SQLite database within the cache directory
+DB_FILE = "sentiment.sqlite3"
+
+class SentimentCache:
+    """
+    Class for SentimentCache object, maps (model name, text hash) to a
+    sentiment label and score. Lookups check an in-process LRU first and
+    fall through to SQLite, with bulk lookups and inserts so a batch of
+    feedback pays a single transaction.
+    """
+    def __init__(self, model_name: str, cache_dir: str | Path | None = None,
+                 lru_size: int = SMT_LRU_SIZE):
+        self.model_name = model_name
+        self.lru_size = lru_size
+        path = Path(cache_dir) if cache_dir else get_cache_dir("sentiment")
+        path.mkdir(parents=True, exist_ok=True)
+        self.db_path = path / DB_FILE
+        self._lru: OrderedDict[str, dict] = OrderedDict()
+        # connection is opened lazily, on the thread that first uses it
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Helper method opens the SQLite database, creating the results table
+        on first use.
+        :return: SQLite connection object.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path,
+                                         check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "model TEXT NOT NULL, hash TEXT NOT NULL, "
+                "label TEXT NOT NULL, score REAL NOT NULL, "
+                "PRIMARY KEY (model, hash)) WITHOUT ROWID"
+            )
+        return self._conn
+
+    def _key(self, text: str) -> str:
+        """
+        Helper method builds the cache key for a feedback string.
+        :param text: Feedback string.
+        :return: Hash of the normalized text.
+        """
+        return content_hash(normalize_text(text))
+
+    def _remember(self, key: str, result: dict) -> None:
+        """
+        Helper method places a result at the front of the in-process LRU,
+        dropping the least recently used entry when full.
+        """
+        self._lru[key] = result
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: list[str]) -> list[dict | None]:
+        """
+        Method looks up cached sentiment results for many texts at once.
+        :param texts: List of feedback strings.
+        :return: List of dicts comprising label, score (None where the text
+        has not been scored before), aligned with texts.
+        """
+        keys = [self._key(t) for t in texts]
+        found: dict[str, dict] = {}
+        missing = []
+        for key in keys:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                found[key] = self._lru[key]
+            elif key not in found:
+                missing.append(key)
+        missing = list(dict.fromkeys(missing))
+        conn = self._connect()
+        # fall through to SQLite for keys absent from the LRU
+        for start in range(0, len(missing), SQL_CHUNK_SIZE):
+            chunk = missing[start:start + SQL_CHUNK_SIZE]
+            rows = conn.execute(
+                f"SELECT hash, label, score FROM sentiment WHERE model = ? "
+                f"AND hash IN ({', '.join('?' * len(chunk))})",
+                [self.model_name, *chunk]
+            ).fetchall()
+            for key, label, score in rows:
+                found[key] = {"label": label, "score": score}
+                self._remember(key, found[key])
+        return [found.get(key) for key in keys]
+
+    def put_many(self, texts: list[str], results: list[dict]) -> None:
+        """
+        Method stores sentiment results for many texts in one transaction.
+        :param texts: List of feedback strings.
+        :param results: List of dicts comprising label, score, aligned with
+        texts.
+        """
+        rows = []
+        for text, result in zip(texts, results):
+            key = self._key(text)
+            self._remember(key, result)
+            rows.append((self.model_name, key, result["label"],
+                         float(result["score"])))
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentiment (model, hash, label, score) "
+                "VALUES (?, ?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        """
+        Method closes the SQLite connection, if open.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -4,34 +4,77 @@ pipeline.
 """
 
 # == Standard Library imports ==
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING, Callable
 
-# == Third party imports ==
-from dotenv import load_dotenv
-from torch import bfloat16
-from transformers import pipeline
+# == Local imports ==
+from .llm_pool import LLMPool
+from .model_registry import get_registry
+from .profiler import get_profiler
+from .progress import get_progress
+from .response_cache import ResponseCache
 
-# hide api key
-load_dotenv()
-ACCESS_TOKEN = os.getenv("HF_API_KEY")
+if TYPE_CHECKING:
+    from transformers import pipeline
 
 # constant for specified LLM
 THEME_MODEL = "google/gemma-3-4b-it"
+# constant for generation settings passed to the LLM pipeline
+GEN_KWARGS = {}
+# constant for text returned when generation fails; never cached
+SUMMARY_ERROR = "Error generating summary"
+# constant for default number of prompts generated per padded batch
+LLM_BATCH_SIZE = 4
+# constant for expected LLM size (MB, bf16), before it is measured
+THEME_MODEL_MB = 8_600
 
 def get_topic_pipeline() -> pipeline:
     """
     Helper method creates a topic summarization pipeline.
     :return: Huggingface transformer pipeline object.
     """
+    # imported here, as transformers (and torch) are slow to import
+    from dotenv import load_dotenv
+    from torch import bfloat16
+    from transformers import pipeline
+    # hide api key
+    load_dotenv()
     topic_pipeline = pipeline(
         task="text-generation",
         model=THEME_MODEL,
         device="cpu",
         dtype=bfloat16,
-        token=ACCESS_TOKEN
+        token=os.getenv("HF_API_KEY")
     )
+    # decoder-only models must be left padded for batched generation
+    tokenizer = topic_pipeline.tokenizer
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
     return topic_pipeline
 
+def _read_output(output: list[dict]) -> str:
+    """
+    Helper method reads the generated reply from a text generation pipeline
+    result for a single chat prompt.
+    :param output: Pipeline result for one prompt.
+    :return: Generated reply string, whitespace stripped.
+    """
+    return output[0]["generated_text"][-1]["content"].strip()
+
+def _reply_tokens(tokenizer, reply: str) -> int:
+    """
+    Helper method counts the tokens of a generated reply.
+    :param tokenizer: Tokenizer of the LLM, or None.
+    :param reply: Generated reply string.
+    :return: Number of tokens; 0 without a tokenizer.
+    """
+    if tokenizer is None:
+        return 0
+    return len(tokenizer(reply, add_special_tokens=False)["input_ids"])
+
 def _bundle_messages(prompt: str) -> list[dict[str, list]]:
     """
     Helper method bundles a given prompt string into the expected message
@@ -58,23 +101,200 @@ class Summary:
     of deterministic, truncated topic modelling string output into
     human-readable product.
     """
-    def __init__(self):
-        # instantiate topic summarization pipeline
-        self.t_pipe = get_topic_pipeline()
+    def __init__(self, use_cache: bool = True,
+                 gen_kwargs: dict | None = None, replicas: int = 1,
+                 threads: int | None = None):
+        # topic summarization pipeline, loaded from the registry on first use
+        self._t_pipe = None
+        # if more than 1, prompts are generated on a pool of LLM replica
+        # processes (started on first use), each with threads threads
+        self.replicas = replicas
+        self.threads = threads
+        self._pool: LLMPool | None = None
+        self.gen_kwargs = dict(GEN_KWARGS if gen_kwargs is None
+                               else gen_kwargs)
+        # persistent response store, so identical prompts are not regenerated
+        self.cache = ResponseCache(THEME_MODEL, self.gen_kwargs) if \
+            use_cache else None
+
+    @property
+    def t_pipe(self) -> pipeline:
+        """
+        Property returns the topic summarization pipeline, shared
+        process-wide via the model registry and loaded on first use, unless
+        one was set.
+        :return: Huggingface transformer pipeline object.
+        """
+        if self._t_pipe is not None:
+            return self._t_pipe
+        return get_registry().get(THEME_MODEL, get_topic_pipeline,
+                                  THEME_MODEL_MB)
+
+    @t_pipe.setter
+    def t_pipe(self, t_pipe: pipeline) -> None:
+        self._t_pipe = t_pipe
+
+    @property
+    def pool(self) -> LLMPool:
+        """
+        Property returns the pool of LLM replicas, starting it on first use.
+        Replicas load their own model, outside the model registry.
+        :return: LLMPool object.
+        """
+        if self._pool is None:
+            self._pool = LLMPool(get_topic_pipeline, self.replicas,
+                                 self.threads, self.gen_kwargs,
+                                 LLM_BATCH_SIZE).start()
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Method stops the LLM replicas, if started, releasing their memory.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _count_tokens(self, record: dict, messages: list[list[dict]],
+                      outputs: list) -> None:
+        """
+        Helper method adds prompt and generated token counts to a profiler
+        record; skipped entirely unless profiling is enabled.
+        :param record: Profiler stage record dict.
+        :param messages: Bundled messages for each prompt.
+        :param outputs: Pipeline results, aligned with messages.
+        """
+        if not get_profiler().enabled:
+            return None
+        tokenizer = self.t_pipe.tokenizer
+        for msgs, output in zip(messages, outputs):
+            prompt_ids = tokenizer.apply_chat_template(
+                msgs, tokenize=True, add_generation_prompt=True)
+            if hasattr(prompt_ids, "keys"):
+                prompt_ids = prompt_ids["input_ids"]
+            record["prompt_tokens"] += len(prompt_ids)
+            try:
+                text = _read_output(output)
+            except Exception:
+                continue
+            record["generated_tokens"] += _reply_tokens(tokenizer, text)
 
     def get_output(self, name: str, prompt: str) -> str:
         """
         Given a name string and a prompt, method bundles prompt for
-        processing by LLM into a summary result.
+        processing by LLM into a summary result. Previously generated
+        responses for an identical prompt are returned from the cache.
         :param name: The truncated 'name' of the topic / subtopic.
         :param prompt: The prompt for LLM to perform an action.
         :return: Summary result from LLM text generation.
         """
+        messages = _bundle_messages(prompt)
+        if self.cache is not None:
+            cached = self.cache.get(messages)
+            if cached is not None:
+                return cached
         try:
-            output = self.t_pipe(_bundle_messages(prompt))
-            gen_text = output[0]["generated_text"][-1]["content"]
-            summary = gen_text.strip()
+            with get_profiler().stage("summary.generate", items=1) as record:
+                output = self.t_pipe(messages, **self.gen_kwargs)
+                self._count_tokens(record, [messages], [output])
+            summary = _read_output(output)
         except Exception as e:
             print(f"Summary generation failed for '{name}': {e}")
-            summary = "Error generating summary"
-        return summary
\ No newline at end of file
+            return SUMMARY_ERROR
+        if self.cache is not None:
+            self.cache.put(messages, summary)
+        return summary
+
+    def get_outputs(self, items: list[tuple[str, str]],
+                    batch_size: int = LLM_BATCH_SIZE) -> list[str]:
+        """
+        Given many (name, prompt) pairs, method runs the prompts through the
+        LLM in left-padded batches of similar length. Cached responses are
+        reused, and a failing batch falls back to one call per prompt so an
+        error only affects the prompt that caused it. Prompts done and
+        tokens generated are reported as progress.
+        :param items: List of (name, prompt) tuples.
+        :param batch_size: Number of prompts generated per batch.
+        :return: List of summary results, aligned with items.
+        """
+        messages = [_bundle_messages(prompt) for _, prompt in items]
+        results: list[str | None] = [None] * len(items)
+        if self.cache is not None:
+            for i, msgs in enumerate(messages):
+                results[i] = self.cache.get(msgs)
+        pending = [i for i, result in enumerate(results) if result is None]
+        # sort longest prompt first so each batch holds similar lengths
+        pending.sort(key=lambda i: len(items[i][1]), reverse=True)
+        if not pending:
+            return results
+        progress = get_progress()
+        with progress.task("summary.generate", total=len(pending),
+                           unit="prompts") as task:
+            if self.replicas > 1 and len(pending) > 1:
+                self._generate_on_pool(items, messages, pending, results,
+                                       task.advance)
+                return results
+            for start in range(0, len(pending), batch_size):
+                idx = pending[start:start + batch_size]
+                batch = [messages[i] for i in idx]
+                try:
+                    with get_profiler().stage("summary.generate",
+                                              items=len(idx)) as record:
+                        outputs = self.t_pipe(batch, batch_size=len(idx),
+                                              **self.gen_kwargs)
+                        self._count_tokens(record, batch, outputs)
+                except Exception as e:
+                    print(f"Batched generation failed, retrying singly: {e}")
+                    for i in idx:
+                        results[i] = self.get_output(*items[i])
+                        task.advance()
+                    continue
+                for i, output in zip(idx, outputs):
+                    try:
+                        results[i] = _read_output(output)
+                    except Exception as e:
+                        print(f"Summary generation failed for "
+                              f"'{items[i][0]}': {e}")
+                        results[i] = SUMMARY_ERROR
+                        continue
+                    if self.cache is not None:
+                        self.cache.put(messages[i], results[i])
+                # tokenize replies only if someone is listening
+                tokens = sum(
+                    _reply_tokens(getattr(self.t_pipe, "tokenizer", None),
+                                  results[i])
+                    for i in idx if results[i] != SUMMARY_ERROR
+                ) if progress.active else 0
+                task.advance(len(idx), tokens)
+        return results
+
+    def _generate_on_pool(self, items: list[tuple[str, str]],
+                          messages: list[list[dict]], pending: list[int],
+                          results: list[str | None],
+                          on_reply: Callable[[int, int], None] | None = None
+                          ) -> None:
+        """
+        Helper method generates the pending prompts on the LLM replicas,
+        queued longest first and identified by position, and writes each
+        reply back to its position in results. Token counts are not
+        profiled, as the tokenizer lives in the replicas.
+        :param items: List of (name, prompt) tuples.
+        :param messages: Bundled messages, aligned with items.
+        :param pending: Positions of the prompts to generate, in order.
+        :param results: List of results, aligned with items; updated.
+        :param on_reply: Callable taking 1 and the tokens generated, per
+        reply received.
+        """
+        with get_profiler().stage("summary.generate", items=len(pending)):
+            replies = self.pool.generate(
+                {i: messages[i] for i in pending},
+                None if on_reply is None else
+                lambda _, tokens: on_reply(1, tokens))
+        for i in pending:
+            if replies[i] is None:
+                print(f"Summary generation failed for '{items[i][0]}'")
+                results[i] = SUMMARY_ERROR
+                continue
+            results[i] = replies[i]
+            if self.cache is not None:
+                self.cache.put(messages[i], results[i])